@@ -1,9 +1,44 @@
 """message_processor.py"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Sequence
 
 
+class MessageContext(NamedTuple):
+    """
+    Contexto inmutable de un mensaje procesado.
+    
+    Attributes:
+        event_data: Mensaje procesado (equivale al resultado de process).
+        fields: Campos de control del mensaje, de solo lectura (app consumer, servicio, tipo de trama, ...).
+    """
+    event_data: Any
+    fields: Mapping[str, Any]
+
+class ProcessingResult(NamedTuple):
+    """
+    Resultado de procesar y extraer un mensaje con process_and_extract.
+    
+    Attributes:
+        context: Contexto del mensaje procesado.
+        data: Información extraída (equivale al resultado de extract).
+    """
+    context: MessageContext
+    data: Any
+
+class BatchItemResult(NamedTuple):
+    """
+    Resultado de un mensaje dentro de un lote.
+    
+    Attributes:
+        index: Posición del mensaje en el lote.
+        result: Resultado del mensaje, o None si falló.
+        error: Excepción del mensaje, o None si se procesó correctamente.
+    """
+    index: int
+    result: Optional[ProcessingResult] = None
+    error: Optional[Exception] = None
+
 class MessageProcessor(ABC):
     """Interface base para procesadores de mensajes."""
     
@@ -15,4 +50,111 @@ class MessageProcessor(ABC):
     @abstractmethod
     def extract(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Extrae información específica del mensaje procesado."""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def process_and_extract(self, message: Any) -> ProcessingResult:
+        """
+        Procesa el mensaje y extrae su información sin guardar estado en el procesador.
+        
+        A diferencia de process y extract, no depende de la última llamada a process,
+        por lo que una misma instancia se puede compartir entre hilos o tareas asyncio.
+        """
+        pass
+    
+    def process_batch(self, messages: Iterable[Any]) -> List[BatchItemResult]:
+        """
+        Procesa y extrae un lote de mensajes, con el resultado o el error de cada uno.
+        
+        Un mensaje con error no interrumpe el lote. Por defecto procesa cada mensaje con
+        process_and_extract; los procesadores lo especializan para resolver la
+        parametrización una sola vez por grupo de mensajes.
+        
+        Args:
+            messages: Mensajes a procesar.
+        Returns:
+            List[BatchItemResult]: Un resultado por mensaje, en el orden del lote.
+        """
+        results = []
+        
+        for index, message in enumerate(messages):
+            try:
+                results.append(BatchItemResult(index, self.process_and_extract(message)))
+            except Exception as e:
+                results.append(BatchItemResult(index, error=e))
+        
+        return results
+    
+    @abstractmethod
+    def extract_batch(self, contexts: Sequence[MessageContext]) -> List[BatchItemResult]:
+        """
+        Extrae la información de un lote de mensajes ya procesados.
+        
+        Args:
+            contexts: Contextos de los mensajes (ProcessingResult.context).
+        Returns:
+            List[BatchItemResult]: Un resultado por contexto, en el orden recibido.
+        """
+        pass
+    
+    def _run_batch(
+        self,
+        messages: Iterable[Any],
+        process_context: Callable[[Any], MessageContext]
+    ) -> List[BatchItemResult]:
+        """
+        Procesa un lote en dos etapas: cada mensaje con process_context y luego
+        los contextos válidos juntos con extract_batch.
+        """
+        results: List[Optional[BatchItemResult]] = []
+        positions, contexts = [], []
+        
+        for index, message in enumerate(messages):
+            try:
+                contexts.append(process_context(message))
+                positions.append(index)
+                results.append(None)
+            except Exception as e:
+                results.append(BatchItemResult(index, error=e))
+        
+        for index, item in zip(positions, self.extract_batch(contexts)):
+            results[index] = item._replace(index=index)
+        
+        return results
+    
+    @staticmethod
+    def _extract_grouped(
+        contexts: Sequence[MessageContext],
+        key: Callable[[MessageContext], Hashable],
+        resolve: Callable[[Hashable], Any],
+        extract: Callable[[MessageContext, Any], Any]
+    ) -> List[BatchItemResult]:
+        """
+        Agrupa los contextos por clave y extrae cada grupo con la parametrización resuelta una sola vez.
+        
+        Args:
+            contexts: Contextos de los mensajes.
+            key: Clave de agrupación del contexto (p. ej. app consumer y servicio).
+            resolve: Resuelve la parametrización del grupo; no debe lanzar excepciones.
+            extract: Extrae los datos de un contexto con la parametrización de su grupo.
+        Returns:
+            List[BatchItemResult]: Un resultado por contexto, en el orden recibido.
+        """
+        groups: Dict[Hashable, List[int]] = {}
+        
+        for index, context in enumerate(contexts):
+            groups.setdefault(key(context), []).append(index)
+        
+        results: List[Optional[BatchItemResult]] = [None] * len(contexts)
+        
+        for group_key, indices in groups.items():
+            resolved = resolve(group_key)
+            
+            for index in indices:
+                context = contexts[index]
+                try:
+                    results[index] = BatchItemResult(index, ProcessingResult(context, extract(context, resolved)))
+                except Exception as e:
+                    results[index] = BatchItemResult(index, error=e)
+        
+        return results
@@ -0,0 +1,206 @@
+"""handlers/sqs.py"""
+
+import json
+import xml.parsers.expat
+
+from pydantic import ValidationError
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from xml.etree.ElementTree import ParseError
+
+from ..core.factory.processor_factory import MessageProcessorFactory
+from ..core.interfaces.message_processor import MessageProcessor, ProcessingResult
+from ..processors.mbaas.utils.exceptions import MbaasProcessorError
+from ..processors.stratus.utils.exceptions import StratusProcessorError, NoS3FileLoadedError
+from ..processors.workflow.utils.exceptions import MbaasWorkflowProcessorError
+from ..utils.log import logger
+from ..utils.s3_config import from_s3_get_file_cached
+
+
+# Errores deterministas: el mensaje falla igual en cada reintento (estructura inválida,
+# servicio o campaña sin parametrizar, ...), por lo que no se devuelve a la cola.
+POISON_ERRORS: Tuple[Type[BaseException], ...] = (
+    MbaasProcessorError,
+    StratusProcessorError,
+    MbaasWorkflowProcessorError,
+    json.JSONDecodeError,
+    ValidationError,
+    ParseError,
+    xml.parsers.expat.ExpatError,
+)
+
+# Errores de configuración o del entorno: no dependen del mensaje, por lo que el mensaje
+# se reintenta aunque su tipo sea subclase de un error de POISON_ERRORS.
+ENVIRONMENT_ERRORS: Tuple[Type[BaseException], ...] = (
+    NoS3FileLoadedError,
+    NotImplementedError,
+)
+
+def is_poison_error(error: BaseException, poison_errors: Tuple[Type[BaseException], ...] = POISON_ERRORS) -> bool:
+    """
+    Indica si un error es definitivo para el mensaje (poison) o si el mensaje se debe reintentar.
+
+    Args:
+        error (BaseException): Error del mensaje.
+        poison_errors (Tuple[Type[BaseException], ...], optional): Errores definitivos. Defaults to POISON_ERRORS.
+
+    Returns:
+        bool: True si reintentar el mensaje no cambia el resultado.
+    """
+    return isinstance(error, poison_errors) and not isinstance(error, ENVIRONMENT_ERRORS)
+
+class SqsBatchHandler:
+    """
+    Punto de entrada Lambda para eventos SQS con respuesta parcial de lotes.
+
+    Procesa los registros del evento con un procesador creado por MessageProcessorFactory y
+    retorna en batchItemFailures solo los registros con errores reintentables, por lo que un
+    mensaje con error no obliga a reintentar el lote completo. Los errores definitivos
+    (POISON_ERRORS) se registran en el log y el mensaje se elimina de la cola.
+
+    Requiere habilitar ReportBatchItemFailures en el event source mapping de la Lambda.
+
+    Ejemplo:
+        handler = SqsBatchHandler("mbaas", on_result=publish)
+    """
+
+    def __init__(
+        self,
+        processor_type: str,
+        s3_config: Optional[Any] = None,
+        on_result: Optional[Callable[[Dict[str, Any], ProcessingResult], None]] = None,
+        config_loader: Callable[[], Any] = from_s3_get_file_cached,
+        factory: Optional[MessageProcessorFactory] = None,
+        poison_errors: Tuple[Type[BaseException], ...] = POISON_ERRORS,
+        **processor_kwargs
+    ):
+        """
+        Args:
+            processor_type: Tipo de procesador (mbaas, stratus, scalable_stratus, workflow).
+            s3_config: Parametrización fija del procesador. Si es None, se obtiene con
+                config_loader en cada invocación y el procesador se recrea solo cuando el
+                cargador retorna otra parametrización (otro objeto).
+            on_result: Recibe cada registro procesado con su resultado (por ejemplo, para
+                publicarlo). Si lanza una excepción, el registro se clasifica como los errores
+                del procesador.
+            config_loader: Función que carga la parametrización. Defaults to from_s3_get_file_cached
+                (caché en memoria y en disco con TTL y revalidación por ETag).
+            factory: Factory de procesadores. Defaults to MessageProcessorFactory().
+            poison_errors: Errores definitivos que no se reintentan.
+            **processor_kwargs: Argumentos adicionales del procesador (xml_mode, validation_mode, ...).
+        """
+        self._processor_type = processor_type
+        self._static_config = s3_config
+        self._s3_config = None
+        self._on_result = on_result
+        self._config_loader = config_loader
+        self._factory = factory or MessageProcessorFactory()
+        self._poison_errors = poison_errors
+        self._processor_kwargs = processor_kwargs
+        self._processor: Optional[MessageProcessor] = None
+
+    @property
+    def processor(self) -> MessageProcessor:
+        """
+        Procesador del handler para la parametrización vigente.
+
+        Con config_loader la parametrización se consulta en cada acceso (el cargador con caché
+        retorna el mismo objeto mientras S3 no cambie) y el procesador se recrea solo si
+        cambió el objeto retornado.
+
+        Si la recarga falla y ya existe un procesador, se sigue usando el vigente.
+
+        Raises:
+            ValueError: Si la parametrización está vacía. No se guarda en caché, por lo que
+                la siguiente invocación la vuelve a cargar.
+        """
+        if self._static_config is not None:
+            s3_config = self._static_config
+        else:
+            try:
+                s3_config = self._config_loader()
+            except Exception as e:
+                if self._processor is None:
+                    raise
+                logger.warning(f"No se pudo recargar la parametrización; se usa la vigente: {e!r}")
+                return self._processor
+        
+        if self._processor is None or s3_config is not self._s3_config:
+            if not s3_config:
+                raise ValueError(f"La parametrización del procesador '{self._processor_type}' está vacía.")
+            
+            self._s3_config = s3_config
+            self._processor = self._factory.create_processor(
+                self._processor_type, s3_config=self._s3_config, **self._processor_kwargs
+            )
+        
+        return self._processor
+
+    def _is_retryable(self, record: Dict[str, Any], error: BaseException) -> bool:
+        """
+        Clasifica el error de un registro y lo registra en el log.
+        """
+        message_id = record.get('messageId')
+        
+        if is_poison_error(error, self._poison_errors):
+            logger.error(f"Mensaje {message_id} descartado por error definitivo: {error!r}")
+            return False
+        
+        logger.warning(f"Mensaje {message_id} se reintentará por error: {error!r}")
+        return True
+
+    def handle(self, event: Dict[str, Any]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Procesa los registros de un evento SQS.
+
+        En colas FIFO, después de un error reintentable en un MessageGroupId, los registros
+        siguientes del mismo grupo también se reportan como fallidos (sin llamar a on_result)
+        para conservar el orden de entrega del grupo.
+
+        Args:
+            event (Dict[str, Any]): Evento SQS de la Lambda.
+
+        Raises:
+            Exception: Si no se puede cargar la parametrización y aún no hay un procesador;
+                la invocación falla y SQS reintenta el lote completo.
+
+        Returns:
+            Dict[str, List[Dict[str, str]]]: Respuesta con los registros a reintentar
+                ({'batchItemFailures': [{'itemIdentifier': messageId}, ...]}).
+        """
+        # Un error de parametrización no es de los mensajes: se propaga antes de procesarlos
+        processor = self.processor
+        
+        records = event.get('Records', [])
+        failures = []
+        blocked_groups = set()
+        
+        items = processor.process_batch([record.get('body') for record in records])
+        
+        for record, item in zip(records, items):
+            group_id = record.get('attributes', {}).get('MessageGroupId')
+            retry = group_id is not None and group_id in blocked_groups
+            
+            if not retry:
+                error = item.error
+                
+                if error is None and self._on_result is not None:
+                    try:
+                        self._on_result(record, item.result)
+                    except Exception as e:
+                        error = e
+                
+                retry = error is not None and self._is_retryable(record, error)
+            
+            if retry:
+                failures.append({'itemIdentifier': record['messageId']})
+                
+                if group_id is not None:
+                    blocked_groups.add(group_id)
+        
+        return {'batchItemFailures': failures}
+
+    def __call__(self, event: Dict[str, Any], context: Any = None) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Firma de handler Lambda (event, context).
+        """
+        return self.handle(event)
@@ -0,0 +1,29 @@
+"""mbaas/config.py"""
+
+from enum import Enum
+
+
+class XmlMode(str, Enum):
+    """
+    Modos de conversión de los mensajes XML (requestService, responseService).
+    """
+    # Convierte el XML completo a diccionario
+    FULL = "full"
+    # Convierte solo los elementos de los paths configurados para el servicio
+    TARGETED = "targeted"
+    # Como TARGETED, pero recorriendo el XML en streaming (iterparse) para acotar la memoria
+    STREAMING = "streaming"
+    # Vista perezosa sobre el árbol lxml: cada elemento se convierte solo al consultarse
+    LAZY = "lazy"
+
+# Modos que convierten solo los paths configurados para el servicio
+SELECTIVE_XML_MODES = (XmlMode.TARGETED, XmlMode.STREAMING)
+
+# Ruta del evento donde se encuentran los mensajes XML
+MESSAGES_PATH = ('jsonPayload', 'dataObject', 'messages')
+
+# Mensajes XML del evento y su tipo de servicio
+XML_MESSAGES = {
+    'requestService': 'request_service',
+    'responseService': 'response_service'
+}
@@ -6,13 +6,18 @@ import xml.parsers.expat
 
 from xml.etree.ElementTree import ParseError
 from pydantic import ValidationError
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
 
-from ...core.interfaces.message_processor import MessageProcessor
+from ...core.interfaces.message_processor import MessageProcessor, MessageContext, ProcessingResult, BatchItemResult
 from ...utils.log import logger
-from ...utils.xml import xml_to_dict_lxml
-from .utils.models import EventEntry
-from .utils.jmespath import extract_from_message_selected_fields
+from ...utils.services import build_service_index
+from ...utils.validation import ValidationMode, load_event
+from ...utils.xml import xml_to_dict_lxml, xml_to_lazy_dict, materialize
+from .config import XmlMode, SELECTIVE_XML_MODES
+from .utils.models import EventEntry, MinimalEventEntry
+from .utils.jmespath import ExtractionPlan
+from .utils.xpath import XmlSelection, compile_xml_selections, xml_to_selected_dict, stream_selected_dict
 from .utils.exceptions import (
     NoMinimumDataError, 
     InvalidEventDataError, 
@@ -27,75 +32,201 @@ class MbaasProcessor(MessageProcessor):
     Procesador de tramas Mbaaas que transforma y extrae datos de XML a JSON.
     """
     
-    def __init__(self, s3_config: Dict[str, Any]):
+    def __init__(
+        self,
+        s3_config: Dict[str, Any],
+        xml_mode: XmlMode = XmlMode.FULL,
+        validation_mode: ValidationMode = ValidationMode.FULL
+    ):
         """
         Inicializa el procesador de servicios.
         
         Args:
             s3_config: Diccionario con la parametrización de servicios y variables.
+            xml_mode: Modo de conversión de los mensajes XML. En los modos TARGETED y STREAMING
+                solo se convierten los elementos de los paths configurados para el servicio, por
+                lo que el evento procesado contiene los mensajes XML parciales. En el modo LAZY
+                los mensajes del evento procesado son vistas de solo lectura (XmlElementView)
+                que se convierten a medida que se consultan; extract retorna diccionarios nativos.
+            validation_mode: Modo de validación del evento. En los modos MINIMAL y NONE el
+                procesador trabaja sobre el evento decodificado (sin model_dump), por lo que
+                conserva los campos fuera del modelo y los valores sin coerción de tipos.
             
         Attributes:
             _s3_config: Parametrización de servicios.
             _list_app_consumers: Lista de IDs de consumidores de aplicaciones.
             _event_data: Datos del evento procesado.
             _namespaces: Diccionario de namespaces XML.
+            _plans: Planes de extracción compilados por app consumer e id_service.
+            _xml_selections: Paths XPath por app consumer e id_service (modos TARGETED y STREAMING).
+            _validation_mode: Modo de validación del evento.
         """
         self._s3_config = s3_config
         self._list_app_consumers = jmespath.search('[*].id', self._s3_config)
+        self._app_consumer_id = None
         self._session_id = None
         self._tidnid = None
         self._id_service = None
+        self._xml_request = None
+        self._xml_response = None
         self._event_data: Optional[Dict[str, Any]] = None
+        
+        service_index = build_service_index(self._s3_config)
+        self._plans: Dict[str, Dict[str, ExtractionPlan]] = {
+            app_consumer_id: {id_service: ExtractionPlan(paths) for id_service, paths in services.items()}
+            for app_consumer_id, services in service_index.items()
+        }
+        self._xml_mode = XmlMode(xml_mode)
+        self._validation_mode = ValidationMode(validation_mode)
+        self._xml_selections: Dict[str, Dict[str, Dict[str, XmlSelection]]] = {}
+        
+        if self._xml_mode in SELECTIVE_XML_MODES:
+            self._xml_selections = {
+                app_consumer_id: {id_service: compile_xml_selections(paths) for id_service, paths in services.items()}
+                for app_consumer_id, services in service_index.items()
+            }
 
-    def _validate_and_extract_fields(self, event: Dict[str, Any]) -> None:
+    def _search_fields(self, event: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
         """
-        Valida y extrae los campos necesarios del evento.
+        Busca en el evento los campos de control del mensaje.
         
         Args:
             event: Evento a procesar.
             
+        Returns:
+            Tuple: (app_consumer_id, id_service, session_id, tidnid).
+        """
+        return (
+            jmespath.search('jsonPayload.dataObject.consumer.appConsumer.id', event),
+            jmespath.search('jsonPayload.dataObject.messages.idService', event),
+            jmespath.search('jsonPayload.dataObject.consumer.appConsumer.sessionId', event),
+            jmespath.search("(jsonPayload.dataObject.documento || jsonPayload.dataObject.client.documentClient) | join('-', [tipo || type, numero || number])", event)
+        )
+
+    def _check_minimum_data(self, app_consumer_id: Any, id_service: Any, session_id: Any) -> None:
+        """
+        Valida que el evento tenga los datos mínimos para la extracción.
+        
         Raises:
-            AttributeError: Si faltan campos requeridos.
+            NoMinimumDataError: Si faltan campos requeridos.
         """
         try:
-            self._app_consumer_id = jmespath.search('jsonPayload.dataObject.consumer.appConsumer.id', event)
-            self._id_service = jmespath.search('jsonPayload.dataObject.messages.idService', event)
-            self._session_id = jmespath.search('jsonPayload.dataObject.consumer.appConsumer.sessionId', event)
-            self._tidnid = jmespath.search("(jsonPayload.dataObject.documento || jsonPayload.dataObject.client.documentClient) | join('-', [tipo || type, numero || number])", event)
-            
-            if not all([self._list_app_consumers, self._app_consumer_id, self._id_service, self._session_id]):
+            if not all([self._list_app_consumers, app_consumer_id, id_service, session_id]):
                 raise NoMinimumDataError(
                         self._list_app_consumers, 
-                        self._app_consumer_id, 
-                        self._id_service, 
-                        self._session_id
+                        app_consumer_id, 
+                        id_service, 
+                        session_id
                     )
                 
         except NoMinimumDataError as e:
             logger.error(f"Datos mínumos no encontrados: {str(e)}")
             raise
 
-    def _extract_xml_messages(self, event: Dict[str, Any]) -> None:
+    def _validate_and_extract_fields(self, event: Dict[str, Any]) -> None:
         """
-        Extrae y valida los mensajes XML del evento.
+        Valida y extrae los campos necesarios del evento.
+        
+        Args:
+            event: Evento a procesar.
+            
+        Raises:
+            AttributeError: Si faltan campos requeridos.
+        """
+        self._app_consumer_id, self._id_service, self._session_id, self._tidnid = self._search_fields(event)
+        self._check_minimum_data(self._app_consumer_id, self._id_service, self._session_id)
+
+    def _search_xml_messages(self, event: Dict[str, Any]) -> Tuple[Any, Any]:
+        """
+        Busca y valida los mensajes XML del evento.
         
         Args:
             event: Evento que contiene los mensajes XML.
             
+        Returns:
+            Tuple: (requestService, responseService).
+            
         Raises:
             ParseError: Si los mensajes XML son inválidos.
         """
         try:
-            self._xml_request = jmespath.search('jsonPayload.dataObject.messages.requestService', event)
-            self._xml_response = jmespath.search('jsonPayload.dataObject.messages.responseService', event)
+            xml_request = jmespath.search('jsonPayload.dataObject.messages.requestService', event)
+            xml_response = jmespath.search('jsonPayload.dataObject.messages.responseService', event)
             
-            if not any([self._xml_request, self._xml_response]):
+            if not any([xml_request, xml_response]):
                 raise ParseError("Mensajes XML (requestService, responseService) no pueden ser nulos.")
             
+            return xml_request, xml_response
+            
         except ParseError as e:
             logger.error(f"Error en mensajes XML: {str(e)}")
             raise
 
+    def _extract_xml_messages(self, event: Dict[str, Any]) -> None:
+        """
+        Extrae y valida los mensajes XML del evento.
+        
+        Args:
+            event: Evento que contiene los mensajes XML.
+            
+        Raises:
+            ParseError: Si los mensajes XML son inválidos.
+        """
+        self._xml_request, self._xml_response = self._search_xml_messages(event)
+
+    def _convert_xml_messages(
+        self,
+        event: Dict[str, Any],
+        app_consumer_id: Any,
+        id_service: Any,
+        xml_request: Any,
+        xml_response: Any
+    ) -> None:
+        """
+        Transforma a JSON los mensajes XML del evento según el modo de conversión.
+        
+        En los modos TARGETED y STREAMING solo se convierten los elementos de los paths
+        configurados para el servicio; si el servicio no está configurado, los mensajes
+        se convierten completos.
+        
+        Args:
+            event: Evento donde se reemplazan los mensajes XML.
+            app_consumer_id: App consumer del evento.
+            id_service: Servicio del evento.
+            xml_request: Mensaje XML requestService.
+            xml_response: Mensaje XML responseService.
+        """
+        messages = event['jsonPayload']['dataObject']['messages']
+        
+        if self._xml_mode in SELECTIVE_XML_MODES:
+            selections = self._xml_selections.get(app_consumer_id, {}).get(id_service, {})
+            convert = stream_selected_dict if self._xml_mode == XmlMode.STREAMING else xml_to_selected_dict
+            
+            messages['requestService'] = convert(xml_request, 'request_service', selections.get('requestService'))
+            messages['responseService'] = convert(xml_response, 'response_service', selections.get('responseService'))
+        else:
+            convert = xml_to_lazy_dict if self._xml_mode == XmlMode.LAZY else xml_to_dict_lxml
+            
+            messages['requestService'] = convert(xml_request, 'request_service')
+            messages['responseService'] = convert(xml_response, 'response_service')
+
+    def _load_event(self, message: str) -> Dict[str, Any]:
+        """
+        Decodifica y valida el mensaje según el modo de validación.
+        
+        Raises:
+            ValidationError: Si el mensaje no cumple con el modelo pydantic.
+            json.JSONDecodeError: Si el mensaje no es un JSON válido.
+        """
+        try:
+            return load_event(message, EventEntry, MinimalEventEntry, self._validation_mode)
+        except ValidationError as e:
+            logger.error(f"Error de validación: {e}")
+            raise
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decodificando JSON: {e}")
+            raise
+
     def process(self, message: str) -> Dict[str, Any]:
         """
         Procesa un mensaje, validando su estructura y transformando XML a JSON.
@@ -112,7 +243,7 @@ class MbaasProcessor(MessageProcessor):
         """
         try:
             # Validar estructura del mensaje
-            self._event_data = EventEntry(**json.loads(message)).model_dump()
+            self._event_data = self._load_event(message)
             
             # Extraer y validar campos
             self._validate_and_extract_fields(self._event_data)
@@ -121,23 +252,58 @@ class MbaasProcessor(MessageProcessor):
             self._extract_xml_messages(self._event_data)
             
             # Transformar XML a JSON
-            self._event_data['jsonPayload']['dataObject']['messages']['requestService'] = \
-                xml_to_dict_lxml(self._xml_request, 'request_service')
-                
-            self._event_data['jsonPayload']['dataObject']['messages']['responseService'] = \
-                xml_to_dict_lxml(self._xml_response, 'response_service')
+            self._convert_xml_messages(
+                self._event_data, self._app_consumer_id, self._id_service, self._xml_request, self._xml_response
+            )
             
             return self._event_data
             
-        except ValidationError as e:
-            logger.error(f"Error de validación: {e}")
-            raise
         except xml.parsers.expat.ExpatError as e:
             logger.error(f"Error en procesamiento XML: {e}")
             raise
-        except json.JSONDecodeError as e:
-            logger.error(f"Error decodificando JSON: {e}")
-            raise
+
+    def _extract_data(
+        self,
+        event_data: Optional[Dict[str, Any]],
+        app_consumer_id: Any,
+        id_service: Any,
+        session_id: Any,
+        plan: Optional[ExtractionPlan] = None
+    ) -> Dict[str, Any]:
+        """
+        Extrae las variables configuradas para el app consumer y servicio del evento.
+        
+        Args:
+            event_data: Datos procesados para extraer variables.
+            app_consumer_id: App consumer del evento.
+            id_service: Servicio del evento.
+            session_id: Sesión del evento.
+            plan: Plan de extracción ya resuelto para el app consumer y servicio (extracción por lotes).
+            
+        Returns:
+            Dict[str, Any]: Datos extraídos según parametrización.
+        """
+        if not event_data:
+            raise InvalidEventDataError
+        
+        if plan is None:
+            services = self._plans.get(app_consumer_id)
+            
+            if services is None:
+                raise AppConsumerNotFoundError(app_consumer_id=app_consumer_id, session_id=session_id)
+            
+            plan = services.get(id_service)
+            
+            if plan is None:
+                raise ServiceNotFoundError(id_service=id_service, app_consumer_id=app_consumer_id, session_id=session_id)
+
+        if not plan.paths:
+            raise NoVariablesConfiguredError(id_service=id_service, app_consumer_id=app_consumer_id)
+            
+        if self._xml_mode == XmlMode.LAZY:
+            return {path: materialize(value) for path, value in plan.extract(event_data)}
+            
+        return dict(plan.extract(event_data))
 
     def extract(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -149,22 +315,89 @@ class MbaasProcessor(MessageProcessor):
         Returns:
             Dict[str, Any]: Datos extraídos según parametrización.
         """
-        event_data = data or self._event_data
+        return self._extract_data(data or self._event_data, self._app_consumer_id, self._id_service, self._session_id)
+
+    def _process_context(self, message: str) -> MessageContext:
+        """
+        Procesa un mensaje sin guardar estado en el procesador.
         
-        if not event_data:
-            raise InvalidEventDataError
+        Args:
+            message: Mensaje a procesar en formato string.
             
-        if self._app_consumer_id not in self._list_app_consumers:
-            raise AppConsumerNotFoundError(app_consumer_id=self._app_consumer_id, session_id=self._session_id)
+        Returns:
+            MessageContext: Evento procesado y campos app_consumer_id, id_service, session_id y tidnid.
+        """
+        event_data = self._load_event(message)
+        
+        app_consumer_id, id_service, session_id, tidnid = self._search_fields(event_data)
+        self._check_minimum_data(app_consumer_id, id_service, session_id)
+        
+        xml_request, xml_response = self._search_xml_messages(event_data)
+        self._convert_xml_messages(event_data, app_consumer_id, id_service, xml_request, xml_response)
         
-        services = jmespath.search(f"[?id=='{self._app_consumer_id}'].services[].id_service", self._s3_config)
+        return MessageContext(event_data, MappingProxyType({
+            'app_consumer_id': app_consumer_id,
+            'id_service': id_service,
+            'session_id': session_id,
+            'tidnid': tidnid
+        }))
+
+    def process_and_extract(self, message: str) -> ProcessingResult:
+        """
+        Procesa un mensaje y extrae las variables configuradas sin guardar estado en el procesador.
+        
+        Equivale a process seguido de extract, pero el estado del mensaje se retorna en un
+        contexto inmutable, por lo que una misma instancia se puede compartir entre hilos.
+        
+        Args:
+            message: Mensaje a procesar en formato string.
+            
+        Returns:
+            ProcessingResult: Contexto del mensaje (evento procesado y campos app_consumer_id,
+                id_service, session_id y tidnid) y datos extraídos.
+        """
+        context = self._process_context(message)
+        fields = context.fields
         
-        if self._id_service not in services:
-            raise ServiceNotFoundError(id_service=self._id_service, app_consumer_id=self._app_consumer_id, session_id=self._session_id)
+        return ProcessingResult(context, self._extract_data(
+            context.event_data, fields['app_consumer_id'], fields['id_service'], fields['session_id']
+        ))
 
-        paths = jmespath.search(f"[?id=='{self._app_consumer_id}'][].services[?id_service=='{self._id_service}'][].paths[]", self._s3_config)
+    def process_batch(self, messages: Iterable[str]) -> List[BatchItemResult]:
+        """
+        Procesa y extrae un lote de mensajes sin guardar estado en el procesador.
+        
+        Los mensajes se agrupan por (app_consumer_id, id_service) para resolver el plan de
+        extracción una sola vez por grupo. Un mensaje con error no interrumpe el lote.
+        
+        Args:
+            messages: Mensajes a procesar en formato string.
+            
+        Returns:
+            List[BatchItemResult]: Resultado o error de cada mensaje, en el orden del lote.
+        """
+        return self._run_batch(messages, self._process_context)
 
-        if not paths:
-            raise NoVariablesConfiguredError(id_service=self._id_service, app_consumer_id=self._app_consumer_id)
+    def extract_batch(self, contexts: Sequence[MessageContext]) -> List[BatchItemResult]:
+        """
+        Extrae las variables configuradas de un lote de mensajes procesados, agrupados por
+        (app_consumer_id, id_service).
+        
+        Args:
+            contexts: Contextos de los mensajes (ProcessingResult.context).
             
-        return dict(extract_from_message_selected_fields(paths=paths, event=event_data))
+        Returns:
+            List[BatchItemResult]: Resultado o error de cada contexto, en el orden recibido.
+        """
+        return self._extract_grouped(
+            contexts,
+            key=lambda context: (context.fields['app_consumer_id'], context.fields['id_service']),
+            resolve=lambda key: self._plans.get(key[0], {}).get(key[1]),
+            extract=lambda context, plan: self._extract_data(
+                context.event_data,
+                context.fields['app_consumer_id'],
+                context.fields['id_service'],
+                context.fields['session_id'],
+                plan
+            )
+        )
@@ -1,7 +1,10 @@
 """mbaas/utils/jmespath.py"""
 
 import jmespath
+import threading
 
+from collections import OrderedDict
+from collections.abc import Mapping
 from typing import List, Dict, Any, Tuple, Optional, Generator
 
 
@@ -28,7 +31,7 @@ class PathAnalyzer:
         
         # Buscar el primer elemento de la lista que contenga la clave
         for item in current_event:
-            if isinstance(item, dict) and key in item:
+            if isinstance(item, Mapping) and key in item:
                 return item[key], type(item[key]).__name__, list_projection_key
         
         # No se encontró la clave en ningún elemento
@@ -94,7 +97,7 @@ def get_type_at_each_level(event: dict = None, query: str = None) -> dict:
             if current_event is None:
                 break
                 
-        elif isinstance(current_event, dict):
+        elif isinstance(current_event, Mapping):
             current_event, type_name = analyzer._handle_dict_navigation(current_event, key)
             type_at_levels[key_id] = type_name
             
@@ -214,7 +217,7 @@ class ManualIndexingNavigator:
     @staticmethod
     def _can_navigate_dict(current: Any, part: str) -> bool:
         """Verifica si podemos navegar a través de un diccionario."""
-        return isinstance(current, dict) and part in current
+        return isinstance(current, Mapping) and part in current
     
     @staticmethod
     def _can_navigate_list(current: Any) -> bool:
@@ -229,7 +232,7 @@ class ManualIndexingNavigator:
         
         first_element = current[0]
         return (first_element is not None and 
-                isinstance(first_element, dict) and 
+                isinstance(first_element, Mapping) and 
                 part in first_element)
     
     @staticmethod
@@ -424,6 +427,268 @@ def extract_from_message_selected_fields(paths: List[list], event: dict) -> Gene
     except Exception as e:
         raise RuntimeError(f"Error al intentar extraer las variables: {e}")
 
+def shape_fingerprint(event: Any, query: str) -> str:
+    """
+    Calcula la huella estructural de la ruta que recorre un query sobre el evento.
+    
+    La huella registra, por cada nivel del query, el tipo de estructura encontrada:
+    'D' diccionario con la clave, 'd' diccionario sin la clave, 'F' lista cuyo primer
+    elemento tiene la clave, 'L' lista donde otro elemento tiene la clave, 'l' lista sin
+    la clave, 'e' lista vacía y 'x' valor no navegable. Dos eventos con la misma huella
+    producen los mismos queries reescritos por el análisis de estructura y la indexación manual.
+
+    Args:
+        event (Any): Estructura JSON a analizar.
+        query (str): Ruta JMESPath separada por puntos.
+
+    Returns:
+        str: Huella estructural de la ruta.
+    """
+    steps = []
+    current = event
+    
+    for key in query.split('.'):
+        if isinstance(current, Mapping):
+            if key not in current:
+                steps.append('d')
+                break
+            current = current[key]
+            steps.append('D')
+        elif isinstance(current, list):
+            if not current:
+                steps.append('e')
+                break
+            
+            first = current[0]
+            if isinstance(first, Mapping) and key in first:
+                current = first[key]
+                steps.append('F')
+                continue
+            
+            item = next((item for item in current if isinstance(item, Mapping) and key in item), None)
+            if item is None:
+                steps.append('l')
+                break
+            current = item[key]
+            steps.append('L')
+        else:
+            steps.append('x')
+            break
+    
+    return ''.join(steps)
+
+def compile_query(query: str) -> Optional[jmespath.parser.ParsedResult]:
+    """
+    Compila un query JMESPath.
+
+    Args:
+        query (str): Query JMESPath.
+
+    Returns:
+        Optional[ParsedResult]: Expresión compilada o None si el query no es válido.
+    """
+    try:
+        return jmespath.compile(query)
+    except jmespath.exceptions.ParseError:
+        return None
+
+class QueryRewriteCache:
+    """
+    Caché LRU acotada y segura entre hilos de queries reescritos.
+    
+    La llave es (query, huella estructural) y el valor son los queries reescritos y
+    compilados por el análisis de estructura y la indexación manual. Al superar el
+    tamaño máximo se descarta la forma usada hace más tiempo.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        """
+        Args:
+            maxsize (int): Número máximo de entradas.
+        """
+        if maxsize <= 0:
+            raise ValueError("El tamaño máximo de la caché debe ser mayor a cero.")
+        
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._entries
+    
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[Optional[jmespath.parser.ParsedResult], ...]]:
+        """
+        Obtiene los queries reescritos de una llave y la marca como usada recientemente.
+        
+        Returns:
+            Queries reescritos o None si la llave no está en la caché.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            
+            if value is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Tuple[str, str], value: Tuple[Optional[jmespath.parser.ParsedResult], ...]) -> None:
+        """Registra los queries reescritos de una llave, descartando la entrada menos reciente si está llena."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Vacía la caché y reinicia sus contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Caché compartida por todos los planes de extracción
+REWRITE_CACHE = QueryRewriteCache()
+
+class CompiledPath:
+    """
+    Ruta configurada con su expresión precompilada.
+    """
+    __slots__ = ('query', 'expression')
+    
+    def __init__(self, query: str):
+        self.query = query
+        self.expression = compile_query(query)
+
+class ExtractionPlan:
+    """
+    Plan de extracción precompilado para las rutas de un servicio (app consumer, id_service).
+    
+    Cada ruta se compila una sola vez y la extracción directa es una única búsqueda
+    compilada. Cuando la extracción directa no resuelve la ruta, los queries reescritos
+    por el análisis de estructura y la indexación manual dependen solo de la forma del
+    evento: se calculan la primera vez que aparece una forma y se reutilizan compilados
+    (vía QueryRewriteCache) para los eventos siguientes con la misma forma, conservando
+    el orden de la cascada.
+    """
+    
+    def __init__(self, paths: List[list], cache: Optional[QueryRewriteCache] = None):
+        """
+        Args:
+            paths (List[list]): Lista con los queries a extraer y si están habilitados.
+            cache (QueryRewriteCache): Caché de queries reescritos. Por defecto la caché compartida.
+        """
+        self.paths = [CompiledPath(path) for path, _ in paths or []]
+        self.cache = cache if cache is not None else REWRITE_CACHE
+    
+    @staticmethod
+    def _search(expression: Optional[jmespath.parser.ParsedResult], event: Any) -> Optional[Any]:
+        """Ejecuta una expresión compilada ignorando errores de tipo."""
+        if expression is None:
+            return None
+        try:
+            return expression.search(event)
+        except jmespath.exceptions.JMESPathTypeError:
+            return None
+    
+    @staticmethod
+    def _rewrite_with_structure_analysis(query: str, event: dict) -> Optional[jmespath.parser.ParsedResult]:
+        """Estrategia 2: query reescrito a partir del análisis de estructura."""
+        try:
+            type_at_levels = get_type_at_each_level(event=event, query=query)
+            new_query = construct_jmespath_query(type_at_levels=type_at_levels)
+            
+            return compile_query(new_query) if new_query else None
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _rewrite_with_manual_indexing(query: str, event: dict) -> Optional[jmespath.parser.ParsedResult]:
+        """Estrategia 3: query reescrito con índices explícitos en las listas."""
+        if not query or not event:
+            return None
+        try:
+            modified_parts = ManualIndexingNavigator().navigate_query_path(query.split('.'), event)
+            
+            return compile_query('.'.join(modified_parts)) if modified_parts else None
+        except Exception:
+            return None
+    
+    def extract_single_field(self, path: CompiledPath, event: dict) -> Any:
+        """
+        Extrae una ruta con la cascada de estrategias usando expresiones compiladas.
+        
+        Args:
+            path: Ruta compilada.
+            event: Estructura JSON donde buscar.
+            
+        Returns:
+            Valor extraído o None si no se encontró
+        """
+        # Estrategia 1: extracción directa
+        result = self._search(path.expression, event)
+        if result is not None:
+            return result
+        
+        key = (path.query, shape_fingerprint(event, path.query))
+        rewrites = self.cache.get(key)
+        
+        if rewrites is None:
+            rewrites = (
+                self._rewrite_with_structure_analysis(path.query, event),
+                self._rewrite_with_manual_indexing(path.query, event)
+            )
+            self.cache.put(key, rewrites)
+        
+        # Estrategias 2 y 3 con los queries reescritos para la forma del evento
+        for expression in rewrites:
+            try:
+                result = self._search(expression, event)
+            except Exception:
+                result = None
+            if result is not None:
+                return result
+        
+        return None
+    
+    def extract(self, event: dict) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Extrae los campos del evento con el plan compilado.
+        
+        Mantiene el contrato de extract_from_message_selected_fields.
+
+        Args:
+            event (dict): Estructura JSON para extraer los valores.
+
+        Yields:
+            tuple: Tupla con el query original y el valor extraído.
+        """
+        if not self.paths or not event:
+            return
+        
+        try:
+            for path in self.paths:
+                result = self.extract_single_field(path, event)
+                
+                # Si hay campos vacíos continuar con la siguiente consulta jmespath
+                if result == {}:
+                    continue
+                
+                yield (path.query, result)
+        
+        except KeyError as e:
+            raise KeyError(f"No se encontró el campo en el evento: {e}")
+        except Exception as e:
+            raise RuntimeError(f"Error al intentar extraer las variables: {e}")
+
 def _is_variable_enabled(enabled: str) -> bool:
     """
     Función auxiliar para verificar si una variable está habilitada.
@@ -85,3 +85,25 @@ class EventEntry(BaseModel):
     receiveTimestamp: str
     insertId: str
     timestamp: str
+
+class MinimalAppConsumer(BaseModel):
+    id: str
+    sessionId: str
+
+class MinimalConsumer(BaseModel):
+    appConsumer: MinimalAppConsumer
+
+class MinimalDataObject(BaseModel):
+    documento: Documento
+    messages: Messages
+    consumer: MinimalConsumer
+
+class MinimalJsonPayload(BaseModel):
+    dataObject: MinimalDataObject
+
+class MinimalEventEntry(BaseModel):
+    """
+    Modelo de validación mínima de la trama mbaas: solo los campos que requiere el procesador
+    (documento, app consumer, sesión, servicio y mensajes XML).
+    """
+    jsonPayload: MinimalJsonPayload
@@ -0,0 +1,415 @@
+"""mbaas/utils/xpath.py"""
+
+import re
+
+from lxml import etree
+from typing import Any, Dict, List, Optional, Tuple
+
+from ....utils.log import logger
+from ....utils.xml import (
+    is_valid_xml, parse_xml_root, get_local_name, lxml_element_to_dict, xml_to_dict_lxml,
+    iterparse_xml, xml_to_dict_iterparse, is_malformed, _release
+)
+from ..config import MESSAGES_PATH, XML_MESSAGES
+
+
+# Paso de un path que se puede traducir directamente a XPath
+SIMPLE_STEP = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+def _local_name_step(name: str) -> str:
+    """
+    Paso XPath que selecciona los elementos hijos con el nombre local indicado.
+
+    Equivale a get_local_name: coincide el nombre local exacto o un tag con prefijo
+    sin declarar ('soap:Envelope'), que lxml conserva como parte del nombre.
+    """
+    return (
+        f"*[local-name()='{name}' or "
+        f"substring(local-name(), string-length(local-name()) - {len(name)}) = ':{name}']"
+    )
+
+class XmlPath:
+    """
+    Path configurado dentro de un mensaje XML, compilado a XPath.
+    """
+    __slots__ = ('steps', 'elements', 'repeated')
+
+    def __init__(self, steps: Tuple[str, ...], repeated: bool = False):
+        """
+        Args:
+            steps: Pasos del path a partir del elemento raíz del XML (incluido).
+            repeated: Si el path completo repite nombres de pasos.
+        """
+        self.steps = steps
+        self.elements = etree.XPath('/' + '/'.join(_local_name_step(step) for step in steps))
+        self.repeated = repeated
+
+class XmlSelection:
+    """
+    Paths XPath de un mensaje XML (requestService o responseService).
+
+    Si 'full' es True algún path no se puede traducir a XPath y el mensaje
+    se convierte completo.
+    """
+    __slots__ = ('full', 'paths')
+
+    def __init__(self):
+        self.full = False
+        self.paths: List[XmlPath] = []
+
+def _mark_full(selections: Dict[str, XmlSelection]) -> None:
+    """Marca todos los mensajes para conversión completa."""
+    for selection in selections.values():
+        selection.full = True
+
+def compile_xml_selections(paths: List[list]) -> Dict[str, XmlSelection]:
+    """
+    Traduce los paths configurados de un servicio a XPath por mensaje XML.
+
+    Los paths fuera de los mensajes XML no se traducen. Un path que no es una
+    secuencia simple de nombres, o que selecciona el mensaje completo, obliga a
+    convertir el mensaje (o ambos, si no se puede determinar cuál) completo.
+
+    Args:
+        paths (List[list]): Lista con los queries a extraer y si están habilitados.
+
+    Returns:
+        Dict[str, XmlSelection]: Selección por mensaje ('requestService', 'responseService').
+    """
+    selections = {message: XmlSelection() for message in XML_MESSAGES}
+    prefix = len(MESSAGES_PATH)
+
+    for path, _ in paths or []:
+        steps = path.split('.') if isinstance(path, str) else []
+
+        # Pasos hasta 'messages': el path puede no llegar a los mensajes XML
+        for position, step in enumerate(steps[:prefix + 1]):
+            if not SIMPLE_STEP.match(step):
+                _mark_full(selections)
+                break
+            if position < prefix and step != MESSAGES_PATH[position]:
+                break
+        else:
+            if len(steps) <= prefix:
+                # Path que selecciona todos los mensajes
+                _mark_full(selections)
+                continue
+
+            selection = selections.get(steps[prefix])
+            if selection is None:
+                continue
+
+            xml_steps = tuple(steps[prefix + 1:])
+
+            if not xml_steps or not all(SIMPLE_STEP.match(step) for step in xml_steps):
+                selection.full = True
+            else:
+                selection.paths.append(XmlPath(xml_steps, repeated=len(set(steps)) != len(steps)))
+
+    return selections
+
+def _is_unique_chain(element: Any) -> bool:
+    """
+    Verifica que el diccionario del XML lleve al elemento sin pasar por listas.
+
+    Cada elemento del camino debe ser el único hijo con su nombre local y no
+    coincidir con un atributo de su padre (ambos casos generan listas en
+    lxml_element_to_dict).
+    """
+    parent = element.getparent()
+
+    while parent is not None:
+        name = get_local_name(element.tag)
+
+        if any(get_local_name(attr_name) == name for attr_name in parent.attrib):
+            return False
+        if sum(1 for child in parent if get_local_name(child.tag) == name) > 1:
+            return False
+
+        element, parent = parent, parent.getparent()
+
+    return True
+
+def _is_text_leaf(element: Any) -> bool:
+    """Elemento hoja con texto: en el diccionario es solo su texto."""
+    return bool(element.text and element.text.strip()) and len(element) == 0
+
+def _resolve_deepest(root: Any, steps: Tuple[str, ...]) -> Optional[Tuple[int, Any]]:
+    """
+    Recorre el path sobre el XML hasta el último paso que existe en el diccionario.
+
+    Cuando el path no existe completo, la extracción por análisis de estructura
+    retorna el valor del nivel más profundo encontrado; este recorrido obtiene ese
+    mismo nivel y su valor.
+
+    Returns:
+        Optional[Tuple[int, Any]]: Número de pasos encontrados y su valor, o None si el
+            camino pasa por elementos repetidos o no coincide con la raíz.
+    """
+    if get_local_name(root.tag) != steps[0]:
+        return None
+
+    element = root
+
+    for depth, step in enumerate(steps[1:], start=1):
+        if _is_text_leaf(element):
+            return depth, element.text.strip()
+
+        children = [child for child in element if get_local_name(child.tag) == step]
+        attribute = any(get_local_name(attr_name) == step for attr_name in element.attrib)
+
+        if len(children) > 1 or (children and attribute):
+            return None
+
+        if children:
+            element = children[0]
+            continue
+
+        if attribute:
+            value = None
+            for attr_name, attr_value in element.attrib.items():
+                if get_local_name(attr_name) == step:
+                    value = attr_value
+            return depth + 1, value
+
+        return depth, lxml_element_to_dict(element)
+
+    return len(steps), lxml_element_to_dict(element)
+
+def select_xml_paths(root: Any, selection: XmlSelection) -> Optional[Dict[str, Any]]:
+    """
+    Construye el diccionario del XML con solo los elementos de los paths seleccionados.
+
+    Para cada path el valor en el diccionario parcial es el mismo que en el diccionario
+    completo (xml_to_dict_lxml); si el path no existe completo se incluye el nivel más
+    profundo que sí existe. Si algún path pasa por elementos repetidos (listas en el
+    diccionario), la selección no es equivalente y se retorna None.
+
+    Args:
+        root: Elemento raíz del XML.
+        selection (XmlSelection): Paths compilados del mensaje.
+
+    Returns:
+        Optional[Dict[str, Any]]: Diccionario parcial del XML o None si se debe convertir completo.
+    """
+    result: Dict[str, Any] = {}
+
+    for path in selection.paths:
+        elements = path.elements(root)
+
+        if len(elements) > 1:
+            return None
+
+        if elements and _is_unique_chain(elements[0]):
+            depth, value = len(path.steps), lxml_element_to_dict(elements[0])
+        elif path.repeated:
+            # El análisis de estructura usa llaves únicas por nivel cuando el path
+            # repite nombres; solo el diccionario completo es equivalente
+            return None
+        else:
+            resolved = _resolve_deepest(root, path.steps)
+            if resolved is None:
+                return None
+            depth, value = resolved
+
+        node = result
+        for step in path.steps[:depth - 1]:
+            node = node.setdefault(step, {})
+        node[path.steps[depth - 1]] = value
+
+    return result
+
+def xml_to_selected_dict(xml_string: str, type_service: str, selection: Optional[XmlSelection]) -> Optional[dict]:
+    """
+    Convierte a diccionario solo los elementos del XML que usan los paths configurados.
+
+    Si no hay selección, algún path no se puede traducir a XPath o pasa por elementos
+    repetidos, se convierte el XML completo con xml_to_dict_lxml.
+
+    Args:
+        xml_string (str): XML del mensaje.
+        type_service (str): Si es request_service o response_service.
+        selection (XmlSelection): Paths compilados del mensaje.
+
+    Returns:
+        Optional[dict]: Diccionario (parcial o completo) del XML o None si el XML no es válido.
+    """
+    if selection is None or selection.full:
+        return xml_to_dict_lxml(xml_string, type_service)
+
+    try:
+        if not is_valid_xml(xml_string, type_service):
+            return None
+
+        root = parse_xml_root(xml_string)
+        result = select_xml_paths(root, selection)
+
+        if result is None:
+            return {get_local_name(root.tag): lxml_element_to_dict(root)}
+
+        return result
+    except Exception as e:
+        logger.error(f"Error al intentar parsear XML: {str(e)}")
+        raise
+
+class _StreamFrame:
+    """
+    Elemento abierto durante el recorrido en streaming que está en el camino de algún path.
+    """
+    __slots__ = ('paths', 'children', 'count', 'attributes')
+
+    def __init__(self, paths: List[int], attributes: Dict[str, str]):
+        # Índices de los paths cuyo prefijo coincide con el camino hasta este elemento
+        self.paths = paths
+        # Número de hijos por nombre local (solo los nombres del siguiente paso de algún path)
+        self.children: Dict[str, int] = {}
+        # Número total de hijos (elementos, comentarios e instrucciones de procesamiento)
+        self.count = 0
+        # Atributos por nombre local (el último gana, como en lxml_element_to_dict)
+        self.attributes = attributes
+
+def _set_path_value(result: Dict[str, Any], steps: Tuple[str, ...], value: Any) -> None:
+    """Ubica el valor de un path en el diccionario parcial."""
+    node = result
+    for step in steps[:-1]:
+        node = node.setdefault(step, {})
+    node[steps[-1]] = value
+
+def _stream_paths(xml_string: str, paths: List[XmlPath], stop_early: bool) -> Optional[Dict[str, Any]]:
+    """
+    Recorre el XML con iterparse convirtiendo solo los elementos de los paths.
+
+    Returns:
+        Optional[Dict[str, Any]]: Diccionario parcial o None si algún path no es
+            equivalente al diccionario completo (no existe, pasa por elementos
+            repetidos) o el XML está mal formado.
+    """
+    values: Dict[int, Any] = {}
+    matches = [0] * len(paths)
+    # Pila de frames; None para los elementos fuera del camino de los paths
+    stack: List[Optional[_StreamFrame]] = []
+    # Profundidad de la pila donde inicia el elemento que se está capturando
+    capture_depth: Optional[int] = None
+    context = iterparse_xml(xml_string)
+
+    try:
+        for event, element in context:
+            parent = stack[-1] if stack else None
+
+            if event in ('comment', 'pi'):
+                if parent is not None:
+                    parent.count += 1
+                continue
+
+            if event == 'start':
+                depth = len(stack)
+                name = get_local_name(element.tag)
+
+                if parent is not None:
+                    parent.count += 1
+                    if name in parent.children:
+                        parent.children[name] += 1
+
+                candidates = range(len(paths)) if depth == 0 else (parent.paths if parent is not None else ())
+                on_path = [i for i in candidates if len(paths[i].steps) > depth and paths[i].steps[depth] == name]
+
+                if not on_path:
+                    stack.append(None)
+                    continue
+
+                frame = _StreamFrame(on_path, {})
+                for attr_name, attr_value in element.attrib.items():
+                    frame.attributes[get_local_name(attr_name)] = attr_value
+
+                for i in on_path:
+                    steps = paths[i].steps
+                    if len(steps) == depth + 1:
+                        matches[i] += 1
+                        if capture_depth is None:
+                            capture_depth = depth
+                    else:
+                        frame.children.setdefault(steps[depth + 1], 0)
+
+                stack.append(frame)
+                continue
+
+            # event == 'end'
+            frame = stack.pop()
+            depth = len(stack)
+
+            if frame is not None:
+                is_text_leaf = bool(element.text and element.text.strip()) and frame.count == 0
+
+                for i in frame.paths:
+                    steps = paths[i].steps
+
+                    if len(steps) == depth + 1:
+                        values[i] = lxml_element_to_dict(element)
+                        continue
+
+                    step = steps[depth + 1]
+                    count = frame.children[step]
+
+                    if count > 1 or (count and step in frame.attributes):
+                        # El hijo es una lista en el diccionario
+                        return None
+                    if len(steps) == depth + 2 and not count and not is_text_leaf and step in frame.attributes:
+                        matches[i] += 1
+                        values[i] = frame.attributes[step]
+
+            if capture_depth is not None and depth <= capture_depth:
+                capture_depth = None
+            if capture_depth is None:
+                _release(element)
+
+            if stop_early and len(values) == len(paths):
+                break
+    except etree.XMLSyntaxError:
+        return None
+
+    if is_malformed(context) or any(count != 1 for count in matches) or len(values) != len(paths):
+        return None
+
+    result: Dict[str, Any] = {}
+    for i, path in enumerate(paths):
+        _set_path_value(result, path.steps, values[i])
+
+    return result
+
+def stream_selected_dict(xml_string: str, type_service: str, selection: Optional[XmlSelection],
+                         stop_early: bool = False) -> Optional[dict]:
+    """
+    Convierte en streaming (iterparse) solo los elementos del XML que usan los paths configurados.
+
+    Los elementos fuera de los paths se liberan apenas se consumen, de modo que la
+    memoria depende del tamaño de los elementos seleccionados y no del mensaje. El
+    resultado es el mismo que xml_to_selected_dict; si algún path no existe o pasa por
+    elementos repetidos, el XML se convierte completo con xml_to_dict_iterparse.
+
+    Args:
+        xml_string (str): XML del mensaje.
+        type_service (str): Si es request_service o response_service.
+        selection (XmlSelection): Paths compilados del mensaje.
+        stop_early (bool): Si es True, el recorrido se detiene cuando todos los paths tienen
+            valor, sin verificar el resto del documento: se usa la primera ocurrencia de cada
+            path aunque más adelante haya elementos repetidos.
+
+    Returns:
+        Optional[dict]: Diccionario (parcial o completo) del XML o None si el XML no es válido.
+    """
+    if selection is None or selection.full or not selection.paths:
+        return xml_to_dict_iterparse(xml_string, type_service)
+
+    try:
+        if not is_valid_xml(xml_string, type_service):
+            return None
+
+        result = _stream_paths(xml_string, selection.paths, stop_early)
+    except Exception as e:
+        logger.error(f"Error al intentar parsear XML: {str(e)}")
+        raise
+
+    if result is None:
+        return xml_to_dict_iterparse(xml_string, type_service)
+
+    return result
@@ -0,0 +1,213 @@
+"""stratus/batch.py"""
+
+import numpy as np
+
+from typing import Dict, Iterable, List, Optional, Union
+
+from ...utils.log import logger
+from .config import StratusConfig, MessageType, FieldType
+from .utils.exceptions import MessageLengthError
+
+
+def build_record_dtype(message_type: MessageType) -> np.dtype:
+    """
+    Construye el dtype estructurado de ancho fijo de una trama.
+
+    Cada campo de la tabla de cortes se expone como una columna de bytes (S<longitud>)
+    ubicada en su posición dentro del registro, por lo que un buffer de tramas
+    concatenadas se puede ver como arreglo estructurado sin copiar datos.
+
+    Args:
+        message_type (MessageType): Tipo de mensaje (ACF o AFD).
+
+    Returns:
+        np.dtype: dtype estructurado con una columna por campo.
+    """
+    layout = StratusConfig.get_field_layout(message_type)
+
+    return np.dtype({
+        'names': [field.name for field in layout],
+        'formats': [f'S{field.end - field.start}' for field in layout],
+        'offsets': [field.start for field in layout],
+        'itemsize': StratusConfig.MESSAGE_LENGHTS[message_type]
+    })
+
+# dtypes compilados una única vez por tipo de trama
+RECORD_DTYPES: Dict[MessageType, np.dtype] = {
+    message_type: build_record_dtype(message_type) for message_type in StratusConfig.MESSAGE_LENGHTS
+}
+
+class StratusColumnStore:
+    """
+    Almacén columnar de tramas Stratus de un mismo tipo respaldado por NumPy.
+    """
+
+    def __init__(self, message_type: MessageType, records: np.ndarray,
+                 indices: Optional[np.ndarray] = None, encoding: str = 'latin-1'):
+        """
+        Args:
+            message_type: Tipo de mensaje de las tramas.
+            records: Arreglo estructurado con dtype RECORD_DTYPES[message_type].
+            indices: Posición de cada trama en la entrada original.
+            encoding: Codificación usada para convertir los valores a str.
+        """
+        self.message_type = message_type
+        self.records = records
+        self.indices = indices if indices is not None else np.arange(len(records))
+        self.encoding = encoding
+        self._field_types = {field.name: field.field_type for field in StratusConfig.get_field_layout(message_type)}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def field_names(self) -> List[str]:
+        """Nombres de las columnas en el orden de la trama."""
+        return list(self.records.dtype.names)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Obtiene una columna como bytes sin espacios ASCII a los extremos.
+
+        Se recorta como bytes.strip, por lo que, a diferencia de str.strip, se conservan
+        otros espacios de la codificación (por ejemplo, b'\\xa0' en latin-1).
+
+        Args:
+            name: Nombre del campo.
+
+        Returns:
+            np.ndarray: Columna de bytes de ancho fijo.
+        """
+        return np.char.strip(self.records[name])
+
+    def numeric(self, name: str, fill_value: int = -1) -> np.ndarray:
+        """
+        Convierte una columna numérica a enteros.
+
+        Args:
+            name: Nombre del campo.
+            fill_value: Valor para las filas vacías o no numéricas.
+
+        Returns:
+            np.ndarray: Columna int64.
+        """
+        values = self.column(name)
+        valid = np.char.isdigit(values)
+        result = np.full(len(values), fill_value, dtype=np.int64)
+        result[valid] = values[valid].astype(np.int64)
+
+        return result
+
+    def columns(self, typed: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Obtiene todas las columnas del almacén.
+
+        Args:
+            typed: Si es True, los campos FieldType.NUMERIC se convierten a int64.
+
+        Returns:
+            Dict[str, np.ndarray]: Columnas indexadas por nombre de campo.
+        """
+        return {
+            name: self.numeric(name) if typed and self._field_types[name] == FieldType.NUMERIC else self.column(name)
+            for name in self.field_names
+        }
+
+    def to_records(self) -> List[Dict[str, str]]:
+        """
+        Materializa las tramas como diccionarios equivalentes a StratusProcessor.process.
+
+        Los valores se decodifican y luego se recortan con str.strip, igual que
+        StratusConfig.extract_record.
+
+        Returns:
+            List[Dict[str, str]]: Un diccionario por trama.
+        """
+        names = self.field_names
+        decoded = [
+            [value.strip() for value in np.char.decode(self.records[name], self.encoding).tolist()]
+            for name in names
+        ]
+
+        return [dict(zip(names, row)) for row in zip(*decoded)]
+
+class StratusBatchDecoder:
+    """
+    Decodificador por lotes de tramas Stratus de ancho fijo.
+    """
+
+    def __init__(self, encoding: str = 'latin-1'):
+        """
+        Args:
+            encoding: Codificación de las tramas recibidas como str. Por defecto latin-1,
+                que conserva la correspondencia de un byte por carácter.
+        """
+        self._encoding = encoding
+
+    def decode_buffer(self, buffer: Union[bytes, bytearray, memoryview], message_type: MessageType) -> StratusColumnStore:
+        """
+        Decodifica un buffer de tramas concatenadas del mismo tipo sin copiar datos.
+
+        Args:
+            buffer: Tramas de ancho fijo concatenadas.
+            message_type: Tipo de mensaje de las tramas.
+
+        Raises:
+            MessageLengthError: Si el buffer no es múltiplo de la longitud de la trama.
+
+        Returns:
+            StratusColumnStore: Almacén columnar de las tramas.
+        """
+        if len(buffer) % StratusConfig.MESSAGE_LENGHTS[message_type]:
+            raise MessageLengthError(buffer)
+
+        records = np.frombuffer(buffer, dtype=RECORD_DTYPES[message_type])
+
+        return StratusColumnStore(message_type, records, encoding=self._encoding)
+
+    def decode_frames(self, frames: Iterable[Union[str, bytes]]) -> Dict[MessageType, StratusColumnStore]:
+        """
+        Decodifica una lista de tramas agrupándolas por tipo de mensaje.
+
+        Las tramas con longitud inválida o que no se pueden codificar se descartan y se
+        registran en el log.
+
+        Args:
+            frames: Tramas individuales (str o bytes).
+
+        Returns:
+            Dict[MessageType, StratusColumnStore]: Un almacén por tipo de trama presente.
+        """
+        grouped: Dict[MessageType, List[bytes]] = {}
+        positions: Dict[MessageType, List[int]] = {}
+        rejected = 0
+
+        for index, frame in enumerate(frames):
+            if isinstance(frame, str):
+                try:
+                    frame = frame.encode(self._encoding)
+                except UnicodeEncodeError:
+                    rejected += 1
+                    continue
+
+            message_type = StratusConfig.validate_message_length(frame)
+
+            if not message_type:
+                rejected += 1
+                continue
+
+            grouped.setdefault(message_type, []).append(frame)
+            positions.setdefault(message_type, []).append(index)
+
+        if rejected:
+            logger.warning(f"Se descartaron {rejected} tramas con longitud o codificación inválida.")
+
+        return {
+            message_type: StratusColumnStore(
+                message_type,
+                np.frombuffer(b''.join(group), dtype=RECORD_DTYPES[message_type]),
+                indices=np.asarray(positions[message_type]),
+                encoding=self._encoding
+            )
+            for message_type, group in grouped.items()
+        }
@@ -2,7 +2,7 @@
 
 from enum import Enum
 from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 
 class FieldType(str, Enum):
@@ -22,6 +22,15 @@ class FieldDefinition(BaseModel):
     field_type: FieldType
     description: Optional[str] = None
 
+class FieldSlice(NamedTuple):
+    """
+    Corte precompilado de un campo: posiciones de inicio y fin (base 0) en la trama.
+    """
+    name: str
+    start: int
+    end: int
+    field_type: FieldType
+
 class MessageType(str, Enum):
     """
     Tipos de mensajes Stratus.
@@ -62,6 +71,27 @@ class StratusConfig:
             description=description
         )
     
+    @staticmethod
+    def compile_field_layout(fields: List[FieldDefinition]) -> Tuple[FieldSlice, ...]:
+        """
+        Compila las definiciones de campos en una tabla inmutable de cortes.
+
+        Args:
+            fields (List[FieldDefinition]): Definiciones de campos de la trama.
+
+        Returns:
+            Tuple[FieldSlice, ...]: Cortes (nombre, inicio, fin, tipo) en el orden de la trama.
+        """
+        return tuple(
+            FieldSlice(
+                name=field.name,
+                start=field.position - 1,
+                end=field.position - 1 + field.length,
+                field_type=field.field_type
+            )
+            for field in fields
+        )
+    
     # Diccionario de campos de la trama ACF
     ACF_FIELDS: List[FieldDefinition] = [
         create_field_definition("ByteI", 5, 1, FieldType.ALPHANUMERIC),
@@ -1226,6 +1256,18 @@ class StratusConfig:
         )
     ]
     
+    # Tablas de cortes compiladas una única vez al importar el módulo
+    FIELD_LAYOUTS: Dict[MessageType, Tuple[FieldSlice, ...]] = {
+        MessageType.ACF: compile_field_layout(ACF_FIELDS),
+        MessageType.AFD: compile_field_layout(AFD_FIELDS)
+    }
+    
+    # Índice de definiciones por nombre para búsquedas O(1)
+    FIELD_INDEX: Dict[MessageType, Dict[str, FieldDefinition]] = {
+        MessageType.ACF: {field.name: field for field in ACF_FIELDS},
+        MessageType.AFD: {field.name: field for field in AFD_FIELDS}
+    }
+    
     @classmethod
     def get_field_definition(cls, field_name: str, message_type: MessageType = MessageType.ACF) -> Optional[FieldDefinition]:
         """
@@ -1238,12 +1280,9 @@ class StratusConfig:
         Returns:
             FieldDefinition si existe, None si no se encuentra
         """
-        fields = cls.ACF_FIELDS if message_type == MessageType.ACF else cls.AFD_FIELDS
+        fields = cls.FIELD_INDEX[MessageType.ACF if message_type == MessageType.ACF else MessageType.AFD]
         
-        for field in fields:
-            if field.name == field_name:
-                return field
-        return None
+        return fields.get(field_name)
     
     @classmethod
     def extract_field(cls, message: str, field_name: str, message_type: MessageType = MessageType.ACF) -> Optional[str]:
@@ -1279,8 +1318,19 @@ class StratusConfig:
         Returns:
             MessageType: El tipo de mensaje detectado o None si no es válido
         """
-        message_lenght = len(message)
+        return cls.get_message_type_for_length(len(message))
+    
+    @classmethod
+    def get_message_type_for_length(cls, message_lenght: int) -> Optional[MessageType]:
+        """
+        Obtiene el tipo de mensaje correspondiente a una longitud de trama.
         
+        Args:
+            message_lenght: Longitud de la trama
+            
+        Returns:
+            MessageType: El tipo de mensaje o None si la longitud no es válida
+        """
         if message_lenght == cls.MESSAGE_LENGHTS[MessageType.ACF]:
             return MessageType.ACF
         elif message_lenght == cls.MESSAGE_LENGHTS[MessageType.AFD]:
@@ -1300,3 +1350,52 @@ class StratusConfig:
             List[FieldDefinition]: Lista de definiciones de campos
         """
         return cls.ACF_FIELDS if message_type == MessageType.ACF else cls.AFD_FIELDS
+
+    
+    @classmethod
+    def get_field_layout(cls, message_type: MessageType) -> Tuple[FieldSlice, ...]:
+        """
+        Obtiene la tabla de cortes precompilada del tipo de mensaje.
+
+        Args:
+            message_type (MessageType): Tipo de mensaje
+
+        Returns:
+            Tuple[FieldSlice, ...]: Cortes de los campos de la trama
+        """
+        return cls.FIELD_LAYOUTS[MessageType.ACF if message_type == MessageType.ACF else MessageType.AFD]
+    
+    @classmethod
+    def project_field_layout(cls, message_type: MessageType, field_names: Iterable[str]) -> Tuple[FieldSlice, ...]:
+        """
+        Obtiene una tabla de cortes restringida a los campos indicados.
+
+        Args:
+            message_type (MessageType): Tipo de mensaje
+            field_names (Iterable[str]): Nombres de los campos requeridos
+
+        Returns:
+            Tuple[FieldSlice, ...]: Cortes de los campos requeridos en el orden de la trama
+        """
+        required = set(field_names)
+        
+        return tuple(field for field in cls.get_field_layout(message_type) if field.name in required)
+    
+    @classmethod
+    def extract_record(cls, message: str, message_type: MessageType = MessageType.ACF,
+                       layout: Optional[Tuple[FieldSlice, ...]] = None) -> Dict[str, str]:
+        """
+        Extrae los campos del mensaje en una sola pasada sobre la tabla de cortes.
+        
+        Args:
+            message: Mensaje completo (940 o 1003 caracteres)
+            message_type: Tipo de mensaje (ACF o AFD)
+            layout: Tabla de cortes a aplicar. Por defecto, todos los campos del tipo de mensaje
+            
+        Returns:
+            Dict[str, str]: Valores de los campos indexados por nombre
+        """
+        if layout is None:
+            layout = cls.get_field_layout(message_type)
+        
+        return {name: message[start:end].strip() for name, start, end, _ in layout}
@@ -1,13 +1,14 @@
 """stratus/processor.py"""
 
 from pydantic import ValidationError
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
 
-from ...core.interfaces.message_processor import MessageProcessor
+from ...core.interfaces.message_processor import MessageProcessor, MessageContext, ProcessingResult, BatchItemResult
 from ...utils.log import logger
-from .config import StratusConfig, MessageType
+from .config import StratusConfig, MessageType, FieldSlice
 from .utils.exceptions import MessageLengthError, InvalidEventDataError, UnsupportedMessageTypeError
-from .utils.message import extract_from_message_selected_fields
+from .utils.message import extract_from_message_selected_fields, get_selected_fields
 
 
 class StratusProcessor(MessageProcessor):
@@ -15,35 +16,59 @@ class StratusProcessor(MessageProcessor):
     Procesador de tramas Stratus que transforma y extrae datos de mensajes texto plano.
     """
     
-    def __init__(self, s3_config: Dict[str, Any]):
+    def __init__(self, s3_config: Dict[str, Any], projection: bool = False):
+        """
+        Inicializa el procesador de tramas.
+        
+        Args:
+            s3_config: Parametrización con los campos seleccionados por tipo de trama.
+            projection: Si es True, solo se extraen de la trama los campos seleccionados
+                en la parametrización, resueltos una única vez al construir el procesador.
+        """
         self._s3_config = s3_config
+        self._projection = projection
         self._event_data: Optional[Dict[str, Any]] = None
         self._message_type: Optional[MessageType] = None
+        self._selected_fields: Dict[MessageType, List[str]] = {}
+        self._layouts: Dict[MessageType, Tuple[FieldSlice, ...]] = {}
         
-    def _validate_and_extract_fields(self, event: str) -> None:
+        if self._projection:
+            self._compile_projection()
+    
+    def _compile_projection(self) -> None:
         """
-        Valida el tipo de trama (ACF/AFD) y extrae los campos.
+        Resuelve los campos seleccionados por tipo de trama y sus tablas de cortes.
+        """
+        for message_type in (MessageType.ACF, MessageType.AFD):
+            selected = get_selected_fields(self._s3_config, message_type)
+            self._selected_fields[message_type] = selected
+            self._layouts[message_type] = StratusConfig.project_field_layout(message_type, selected)
+        
+    def _parse_message(self, event: str) -> Tuple[MessageType, Dict[str, Any]]:
+        """
+        Valida el tipo de trama (ACF/AFD) y extrae sus campos.
 
         Args:
             event (str): Evento a procesar.
+
+        Returns:
+            Tuple[MessageType, Dict[str, Any]]: Tipo de trama y campos extraídos.
         """
         try:
             # Determinar tipo de mensaje según longitud
-            self._message_type = StratusConfig.validate_message_length(event)
+            message_type = StratusConfig.validate_message_length(event)
             
-            if not self._message_type:
-                raise MessageLengthError(len(event))
+            if not message_type:
+                raise MessageLengthError(event)
             
             # Verificar si el tipo de mensaje está soportado en la configuración actual
-            if self._message_type not in [MessageType.ACF, MessageType.AFD]:
+            if message_type not in [MessageType.ACF, MessageType.AFD]:
                 raise UnsupportedMessageTypeError
             
-            # Obtener los campos correspondientes al tipo de mensaje
-            fields = StratusConfig.get_fields_for_message_type(self._message_type)
-            
-            # Extraer los campos del mensaje
-            self._event_data = {field.name: StratusConfig.extract_field(event, field.name, self._message_type) 
-                                for field in fields}
+            # Extraer los campos del mensaje en una sola pasada sobre la tabla de cortes
+            return message_type, StratusConfig.extract_record(
+                event, message_type, layout=self._layouts.get(message_type)
+            )
             
         except MessageLengthError as e:
             logger.error(f"Error de longitud de mensaje: {str(e)}")
@@ -52,6 +77,15 @@ class StratusProcessor(MessageProcessor):
             logger.error(f"Tipo de mensaje no soportado: {str(e)}")
             raise
 
+    def _validate_and_extract_fields(self, event: str) -> None:
+        """
+        Valida el tipo de trama (ACF/AFD) y extrae los campos.
+
+        Args:
+            event (str): Evento a procesar.
+        """
+        self._message_type, self._event_data = self._parse_message(event)
+
     def process(self, message: str) -> Dict[str, Any]:
         """
         Procesa un mensaje, validando su estructura y construyendo un JSON.
@@ -67,27 +101,124 @@ class StratusProcessor(MessageProcessor):
 
         return self._event_data
 
-    def extract(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _extract_data(
+        self,
+        event_data: Optional[Dict[str, Any]],
+        message_type: Optional[MessageType],
+        selected_fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
-        Extrae variables seleccionadas según la parametrización.
+        Extrae las variables seleccionadas para el tipo de trama.
         
         Args:
-            data: Datos procesados para extraer variables.
+            event_data: Datos procesados para extraer variables.
+            message_type: Tipo de trama de los datos.
+            selected_fields: Campos seleccionados ya resueltos para el tipo de trama (extracción por lotes).
             
         Returns:
             Dict[str, Any]: Datos extraídos según parametrización.
         """
         try:
-            event_data = data or self._event_data
-            
-            if not event_data:
+            if event_data is None:
                 raise InvalidEventDataError
             
+            if selected_fields is not None:
+                return {field: event_data[field] for field in selected_fields}
+            
+            if self._projection:
+                return {field: event_data[field] for field in self._selected_fields.get(message_type, [])}
+            
             return dict(extract_from_message_selected_fields(
                 s3_config=self._s3_config, 
                 message=event_data,
-                message_type=self._message_type
+                message_type=message_type
             ))
         except InvalidEventDataError as e:
             logger.error(f"Datos inválidos: {str(e)}")
             raise
+
+    def extract(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Extrae variables seleccionadas según la parametrización.
+        
+        Args:
+            data: Datos procesados para extraer variables.
+            
+        Returns:
+            Dict[str, Any]: Datos extraídos según parametrización.
+        """
+        return self._extract_data(data or self._event_data, self._message_type)
+
+    def process_and_extract(self, message: str) -> ProcessingResult:
+        """
+        Procesa una trama y extrae los campos seleccionados sin guardar estado en el procesador.
+
+        Args:
+            message (str): Trama a procesar.
+
+        Returns:
+            ProcessingResult: Contexto de la trama (campos extraídos y message_type) y datos seleccionados.
+        """
+        context = self._process_context(message)
+        
+        return ProcessingResult(context, self._extract_data(context.event_data, context.fields['message_type']))
+
+    def _process_context(self, message: str) -> MessageContext:
+        """
+        Procesa una trama sin guardar estado en el procesador.
+
+        Args:
+            message (str): Trama a procesar.
+
+        Returns:
+            MessageContext: Campos extraídos de la trama y su message_type.
+        """
+        message_type, event_data = self._parse_message(message)
+        
+        return MessageContext(event_data, MappingProxyType({'message_type': message_type}))
+
+    def _resolve_selected_fields(self, message_type: MessageType) -> Optional[List[str]]:
+        """
+        Resuelve los campos seleccionados para un tipo de trama, o None si no hay parametrización cargada.
+        """
+        if self._projection:
+            return self._selected_fields.get(message_type, [])
+        
+        if not self._s3_config:
+            return None
+        
+        return get_selected_fields(self._s3_config, message_type)
+
+    def process_batch(self, messages: Iterable[str]) -> List[BatchItemResult]:
+        """
+        Procesa y extrae un lote de tramas sin guardar estado en el procesador.
+        
+        Las tramas se agrupan por tipo (ACF/AFD) para resolver los campos seleccionados
+        una sola vez por grupo. Una trama con error no interrumpe el lote.
+
+        Args:
+            messages (Iterable[str]): Tramas a procesar.
+
+        Returns:
+            List[BatchItemResult]: Resultado o error de cada trama, en el orden del lote.
+        """
+        return self._run_batch(messages, self._process_context)
+
+    def extract_batch(self, contexts: Sequence[MessageContext]) -> List[BatchItemResult]:
+        """
+        Extrae los campos seleccionados de un lote de tramas procesadas, agrupadas por tipo de trama.
+
+        Args:
+            contexts (Sequence[MessageContext]): Contextos de las tramas (ProcessingResult.context).
+
+        Returns:
+            List[BatchItemResult]: Resultado o error de cada contexto, en el orden recibido.
+        """
+        return self._extract_grouped(
+            contexts,
+            key=lambda context: context.fields['message_type'],
+            resolve=self._resolve_selected_fields,
+            extract=lambda context, selected_fields: self._extract_data(
+                context.event_data, context.fields['message_type'], selected_fields
+            )
+        )
@@ -0,0 +1,171 @@
+"""stratus/reader.py"""
+
+import mmap
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional
+
+from ...utils.log import logger
+from .config import StratusConfig, MessageType, FieldSlice
+from .utils.exceptions import MessageLengthError
+
+
+# Cortes indexados por nombre para el acceso perezoso a los campos
+FIELD_SLICES: Dict[MessageType, Dict[str, FieldSlice]] = {
+    message_type: {field.name: field for field in StratusConfig.get_field_layout(message_type)}
+    for message_type in StratusConfig.MESSAGE_LENGHTS
+}
+
+class StratusRecordView(Mapping):
+    """
+    Vista perezosa de una trama dentro de un buffer compartido.
+
+    Los campos se cortan y decodifican al accederlos; la trama completa nunca
+    se copia a un str de Python.
+    """
+    __slots__ = ('_buffer', '_offset', '_message_type', '_slices', '_encoding')
+
+    def __init__(self, buffer, offset: int, message_type: MessageType, encoding: str = 'latin-1'):
+        self._buffer = buffer
+        self._offset = offset
+        self._message_type = message_type
+        self._slices = FIELD_SLICES[message_type]
+        self._encoding = encoding
+
+    @property
+    def message_type(self) -> MessageType:
+        """Tipo de mensaje de la trama."""
+        return self._message_type
+
+    def __getitem__(self, name: str) -> str:
+        field = self._slices[name]
+
+        return self._buffer[self._offset + field.start:self._offset + field.end].decode(self._encoding).strip()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slices)
+
+    def __len__(self) -> int:
+        return len(self._slices)
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Materializa la trama como el diccionario que retorna StratusProcessor.process.
+        """
+        return dict(self.items())
+
+class StratusFileReader:
+    """
+    Lector de archivos planos de tramas Stratus respaldado por mmap.
+
+    Soporta tramas delimitadas por salto de línea (LF o CRLF) y tramas empaquetadas
+    de longitud fija. El tipo de cada trama (ACF/AFD) se detecta por su longitud.
+    """
+
+    def __init__(self, path: str, message_type: Optional[MessageType] = None,
+                 encoding: str = 'latin-1', skip_invalid: bool = True):
+        """
+        Args:
+            path: Ruta del archivo.
+            message_type: Tipo de trama de un archivo empaquetado. Solo es necesario cuando
+                el tamaño del archivo es múltiplo de ambas longitudes.
+            encoding: Codificación de las tramas.
+            skip_invalid: Si es True, las líneas con longitud inválida se descartan;
+                de lo contrario se lanza MessageLengthError.
+        """
+        self._path = path
+        self._message_type = message_type
+        self._encoding = encoding
+        self._skip_invalid = skip_invalid
+        self._file = None
+        self._buffer: Optional[mmap.mmap] = None
+
+    def __enter__(self) -> 'StratusFileReader':
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Abre el archivo y lo mapea en memoria (solo lectura)."""
+        self._file = open(self._path, 'rb')
+
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Archivo vacío: no se puede mapear
+            self._buffer = None
+
+    def close(self) -> None:
+        """Libera el mapeo y el archivo. Las vistas generadas dejan de ser válidas."""
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self) -> Iterator[StratusRecordView]:
+        if self._file is None:
+            raise ValueError("El archivo no está abierto.")
+
+        if self._buffer is None:
+            return iter(())
+
+        max_length = max(StratusConfig.MESSAGE_LENGHTS.values())
+
+        if self._buffer.find(b'\n', 0, max_length + 2) != -1:
+            return self._iter_delimited()
+
+        return self._iter_packed()
+
+    def _iter_delimited(self) -> Iterator[StratusRecordView]:
+        """Recorre tramas delimitadas por salto de línea."""
+        buffer = self._buffer
+        size = len(buffer)
+        start = 0
+        line_number = 0
+
+        while start < size:
+            end = buffer.find(b'\n', start)
+            if end == -1:
+                end = size
+            line_number += 1
+
+            stop = end - 1 if end > start and buffer[end - 1] == 13 else end
+
+            if stop > start:
+                message_type = StratusConfig.get_message_type_for_length(stop - start)
+
+                if message_type:
+                    yield StratusRecordView(buffer, start, message_type, self._encoding)
+                elif self._skip_invalid:
+                    logger.warning(f"Línea {line_number} descartada: longitud {stop - start} inválida.")
+                else:
+                    raise MessageLengthError(buffer[start:stop])
+
+            start = end + 1
+
+    def _iter_packed(self) -> Iterator[StratusRecordView]:
+        """Recorre tramas de longitud fija sin delimitador."""
+        buffer = self._buffer
+        size = len(buffer)
+        message_type = self._message_type
+
+        if message_type is None:
+            candidates = [m for m, length in StratusConfig.MESSAGE_LENGHTS.items() if size % length == 0]
+
+            if not candidates:
+                raise MessageLengthError(buffer)
+            if len(candidates) > 1:
+                raise ValueError("No es posible determinar el tipo de trama del archivo empaquetado; indique message_type.")
+
+            message_type = candidates[0]
+        elif size % StratusConfig.MESSAGE_LENGHTS[message_type]:
+            raise MessageLengthError(buffer)
+
+        length = StratusConfig.MESSAGE_LENGHTS[message_type]
+
+        for offset in range(0, size, length):
+            yield StratusRecordView(buffer, offset, message_type, self._encoding)
@@ -1,15 +1,15 @@
 """stratus/scalable_processor.py"""
 
-import jq
-
 from pydantic import ValidationError
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterable, Mapping, Optional, Sequence, Tuple
 
-from ...core.interfaces.message_processor import MessageProcessor
+from ...core.interfaces.message_processor import MessageProcessor, MessageContext, ProcessingResult, BatchItemResult
 from ...utils.log import logger
 from .config import StratusConfig
 from .utils.exceptions import MessageLengthError, InvalidEventDataError, NoCampaignsFoundError
 from .utils.message import extract_from_scalable_messages_selected_fields
+from .utils.rules import CampaignRuleIndex
 
 
 class ScalableStratusProcessor(MessageProcessor):
@@ -20,55 +20,59 @@ class ScalableStratusProcessor(MessageProcessor):
     def __init__(self, s3_config: Dict[str, Any]):
         self._s3_config = s3_config
         self._event_data: Optional[Dict[str, Any]] = None
+        self._campaign_index = CampaignRuleIndex(s3_config)
         
-    def _validate_and_extract_fields(self, event: str) -> None:
+    def _parse_message(self, event: str) -> Dict[str, Any]:
         """
-        Valida el tipo de trama (ACF/AFD) y extrae los campos.
+        Valida la longitud de la trama (ACF/AFD) y extrae sus campos.
 
         Args:
             event (str): Evento a procesar.
+
+        Returns:
+            Dict[str, Any]: Campos extraídos de la trama.
         """
         try:
             if not StratusConfig.validate_message_length(event):
-                raise MessageLengthError(len(event))
+                raise MessageLengthError(event)
             
-            self._event_data = {field.name: StratusConfig.extract_field(event, field.name) 
-                                for field in StratusConfig.ACF_FIELDS}
+            return StratusConfig.extract_record(event)
             
         except MessageLengthError as e:
             logger.error(f"Error de longitud de mensaje: {str(e)}")
             raise
         
-    def _get_campaigns(self, s3_file: Dict, motivo_concepto: str, canal: str, codigo_trx: str) -> List[Dict[str, Any]]:
+    def _validate_and_extract_fields(self, event: str) -> None:
+        """
+        Valida el tipo de trama (ACF/AFD) y extrae los campos.
+
+        Args:
+            event (str): Evento a procesar.
+        """
+        self._event_data = self._parse_message(event)
+        
+    def _get_campaigns(self, motivo_concepto: str, canal: str, codigo_trx: str) -> List[Mapping]:
         """
         Devuelve las campañas elegibles según la condición (motivo_concepto, canal, codigo_trx).
 
         Args:
-            s3_file (dict): Archivo de parametrización.
             motivo_concepto (str): Motivo concepto.
             canal (str): Canal.
             codigo_trx (str): Código transacción.
 
         Returns:
-            List[Dict]: Lista con las campañas elegibles.
-        """
-        jq_query = f'''
-            .campaign[] as $campaign |
-            $campaign.rules[] |
-            select(
-                .config.motivo_concepto == "{motivo_concepto}" and 
-                .config.canal == "{canal}" and 
-                .config.codigo_trx == "{codigo_trx}"
-            ) | 
-            {{
-                id_campaign: $campaign.id_campaign,
-                id_rule: .id_rule,
-                variables: .variables
-            }}
-        '''
-        result = jq.compile(jq_query).input(s3_file).all()
-            
-        return result
+            List[Mapping]: Lista con las campañas elegibles (de solo lectura, compartidas entre mensajes).
+        """
+        return self._campaign_index.match(motivo_concepto, canal, codigo_trx)
+    
+    @staticmethod
+    def _rule_key(event_data: Optional[Dict[str, Any]]) -> Tuple[Any, Any, Any]:
+        """
+        Devuelve la condición de las reglas de campaña (motivo_concepto, canal, codigo_trx) de la trama.
+        """
+        event_data = event_data or {}
+        
+        return event_data.get('MotivoConcepto'), event_data.get('CodigoCanal'), event_data.get('CodigoTransaccionB24')
     
     def process(self, message: str) -> Dict[str, Any]:
         """
@@ -85,27 +89,27 @@ class ScalableStratusProcessor(MessageProcessor):
 
         return self._event_data
 
-    def extract(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _extract_data(
+        self,
+        event_data: Optional[Dict[str, Any]],
+        campaigns: Optional[List[Mapping]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Extrae variables seleccionadas según la parametrización.
+        Extrae las variables de las campañas elegibles para la trama.
         
         Args:
-            data: Datos procesados para extraer variables.
+            event_data: Datos procesados para extraer variables.
+            campaigns: Campañas elegibles ya resueltas para la trama (extracción por lotes).
             
         Returns:
-            Dict[str, Any]: Datos extraídos según parametrización.
+            List[Dict[str, Any]]: Datos extraídos por campaña elegible.
         """
         try:
-            event_data = data or self._event_data
-            
             if not event_data:
                 raise InvalidEventDataError
             
-            motivo_concepto = event_data.get('MotivoConcepto')
-            canal = event_data.get('CodigoCanal')
-            codig_trx = event_data.get('CodigoTransaccionB24')
-            
-            campaigns = self._get_campaigns(self._s3_config, motivo_concepto, canal, codig_trx)
+            if campaigns is None:
+                campaigns = self._get_campaigns(*self._rule_key(event_data))
             
             if not campaigns:
                 raise NoCampaignsFoundError
@@ -119,3 +123,75 @@ class ScalableStratusProcessor(MessageProcessor):
         except NoCampaignsFoundError as e:
             logger.error(f"No se encontraron campañas configuradas: {str(e)}")
             raise
+
+    def extract(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Extrae variables seleccionadas según la parametrización.
+        
+        Args:
+            data: Datos procesados para extraer variables.
+            
+        Returns:
+            Dict[str, Any]: Datos extraídos según parametrización.
+        """
+        return self._extract_data(data or self._event_data)
+
+    def process_and_extract(self, message: str) -> ProcessingResult:
+        """
+        Procesa una trama y extrae las variables de sus campañas sin guardar estado en el procesador.
+
+        Args:
+            message (str): Trama a procesar.
+
+        Returns:
+            ProcessingResult: Contexto de la trama (campos extraídos) y datos por campaña elegible.
+        """
+        context = self._process_context(message)
+        
+        return ProcessingResult(context, self._extract_data(context.event_data))
+
+    def _process_context(self, message: str) -> MessageContext:
+        """
+        Procesa una trama sin guardar estado en el procesador.
+
+        Args:
+            message (str): Trama a procesar.
+
+        Returns:
+            MessageContext: Campos extraídos de la trama.
+        """
+        return MessageContext(self._parse_message(message), MappingProxyType({}))
+
+    def process_batch(self, messages: Iterable[str]) -> List[BatchItemResult]:
+        """
+        Procesa y extrae un lote de tramas sin guardar estado en el procesador.
+        
+        Las tramas se agrupan por la condición de las reglas (motivo_concepto, canal, codigo_trx)
+        para buscar las campañas elegibles una sola vez por grupo. Una trama con error no
+        interrumpe el lote.
+
+        Args:
+            messages (Iterable[str]): Tramas a procesar.
+
+        Returns:
+            List[BatchItemResult]: Resultado o error de cada trama, en el orden del lote.
+        """
+        return self._run_batch(messages, self._process_context)
+
+    def extract_batch(self, contexts: Sequence[MessageContext]) -> List[BatchItemResult]:
+        """
+        Extrae las variables de las campañas elegibles de un lote de tramas procesadas,
+        agrupadas por la condición de las reglas.
+
+        Args:
+            contexts (Sequence[MessageContext]): Contextos de las tramas (ProcessingResult.context).
+
+        Returns:
+            List[BatchItemResult]: Resultado o error de cada contexto, en el orden recibido.
+        """
+        return self._extract_grouped(
+            contexts,
+            key=lambda context: self._rule_key(context.event_data),
+            resolve=lambda key: self._get_campaigns(*key),
+            extract=lambda context, campaigns: self._extract_data(context.event_data, campaigns)
+        )
@@ -2,11 +2,30 @@
 
 import jmespath
 
+from collections.abc import Mapping
+from typing import Any, Dict, List
+
 from .exceptions import NoS3FileLoadedError
 from ..config import MessageType
 from ....utils.log import logger
 
 
+def get_selected_fields(s3_config: dict, message_type: MessageType) -> List[str]:
+    """
+    Obtiene los nombres de los campos marcados como "true" en el archivo de parametrización.
+
+    Args:
+        s3_config (dict): Archivo de parametrización.
+        message_type (MessageType): Tipo de mensaje (ACF o AFD).
+
+    Returns:
+        List[str]: Nombres de los campos seleccionados en el orden de la parametrización.
+    """
+    message_type = getattr(message_type, 'value', message_type)
+    filtered_config = jmespath.search(f"[?type == '{message_type}'].fields | [0]", s3_config) or {}
+    
+    return [field for field, value in filtered_config.items() if value.lower() == "true"]
+
 def extract_from_message_selected_fields(s3_config: dict, message: str, message_type: MessageType):
     """
     Extrae las variables seleccionadas del archivo de parametrización.
@@ -23,31 +42,28 @@ def extract_from_message_selected_fields(s3_config: dict, message: str, message_
         if not s3_config:
             raise NoS3FileLoadedError
         
-        filtered_config = jmespath.search(f"[?type == '{message_type}'].fields | [0]", s3_config)
-        for field, value in filtered_config.items():
-            is_priority = value.lower() == "true"
-            
-            if is_priority:
-                yield(field, message[field])
+        for field in get_selected_fields(s3_config, message_type):
+            yield(field, message[field])
     except NoS3FileLoadedError as e:
         logger.error(f"Archivo de parametrización no cargado: {str(e)}")
         raise
 
-def extract_from_scalable_messages_selected_fields(campaign: dict, message: str):
+def extract_from_scalable_messages_selected_fields(campaign: Mapping, message: Mapping) -> Dict[str, Any]:
     """
     Extrae las variables seleccionadas del archivo de parametrización.
 
     Args:
-        campaign (dict): Configuración de la campaña.
-        message (str): Diccionario con los campos seleccionados.
+        campaign (Mapping): Configuración de la campaña, compartida entre mensajes (no se modifica).
+        message (Mapping): Diccionario con los campos seleccionados.
+
+    Returns:
+        Dict[str, Any]: Copia superficial de la campaña con los datos extraídos del mensaje en 'data'.
     """
     try:
         if not campaign.get('variables'):
             logger.warning(f"No existen variables parametrizadas para extraer de la campaña {campaign.get('id_campaign')}.")
         
-        campaign['data'] = {field: message[field] for field in campaign['variables']}
-        
-        return campaign
+        return {**campaign, 'data': {field: message[field] for field in campaign['variables']}}
 
     except ValueError as e:
         logger.error(f"Error procesando variables de campaña '{campaign.get('id_campaign')}': {str(e)}")
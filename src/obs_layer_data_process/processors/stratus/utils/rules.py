@@ -0,0 +1,228 @@
+"""stratus/utils/rules.py"""
+
+from bisect import bisect_right
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from ....utils.log import logger
+
+
+# Campos de la condición de una regla, en el orden en que se recorre el árbol
+RULE_FIELDS = ('motivo_concepto', 'canal', 'codigo_trx')
+
+WILDCARD = '*'
+RANGE_SEPARATOR = '..'
+
+def _is_number(value: str) -> bool:
+    """
+    Indica si el valor solo tiene dígitos ASCII (str.isdigit también acepta, p. ej., '²',
+    que int no convierte).
+    """
+    return value.isascii() and value.isdigit()
+
+def parse_rule_pattern(value: Any) -> Optional[Tuple]:
+    """
+    Interpreta el valor de un campo de la condición de una regla.
+
+    Formatos soportados:
+        - "01": coincidencia exacta.
+        - "*": cualquier valor.
+        - "12*": prefijo (valores que comienzan por "12").
+        - "10..19": rango numérico inclusivo.
+
+    Args:
+        value (Any): Valor configurado en la regla.
+
+    Returns:
+        Optional[Tuple]: ('exact', valor), ('any',), ('prefix', prefijo) o ('range', desde, hasta).
+            None si el valor no es un patrón válido.
+    """
+    if not isinstance(value, str):
+        return None
+
+    if value == WILDCARD:
+        return ('any',)
+
+    if value.endswith(WILDCARD):
+        return ('prefix', value[:-1])
+
+    if RANGE_SEPARATOR in value:
+        low, _, high = value.partition(RANGE_SEPARATOR)
+
+        if not (_is_number(low) and _is_number(high)) or int(low) > int(high):
+            return None
+
+        return ('range', int(low), int(high))
+
+    return ('exact', value)
+
+class _RuleNode:
+    """
+    Nodo del árbol de decisión: agrupa los hijos por tipo de patrón de un campo.
+    """
+    __slots__ = ('exact', 'prefixes', 'ranges', 'wildcard', '_max_prefix', '_bounds', '_segments')
+
+    def __init__(self):
+        self.exact: Dict[str, Any] = {}
+        self.prefixes: Dict[str, Any] = {}
+        self.ranges: Dict[Tuple[int, int], Any] = {}
+        self.wildcard: Any = None
+        self._max_prefix = 0
+        self._bounds: List[int] = []
+        self._segments: List[List[Any]] = []
+
+    def child(self, pattern: Tuple, factory) -> Any:
+        """Obtiene (o crea) el hijo asociado a un patrón."""
+        kind = pattern[0]
+
+        if kind == 'any':
+            if self.wildcard is None:
+                self.wildcard = factory()
+            return self.wildcard
+
+        if kind == 'exact':
+            if pattern[1] not in self.exact:
+                self.exact[pattern[1]] = factory()
+            return self.exact[pattern[1]]
+
+        if kind == 'prefix':
+            if pattern[1] not in self.prefixes:
+                self.prefixes[pattern[1]] = factory()
+                self._max_prefix = max(self._max_prefix, len(pattern[1]))
+            return self.prefixes[pattern[1]]
+
+        key = (pattern[1], pattern[2])
+        if key not in self.ranges:
+            self.ranges[key] = factory()
+        return self.ranges[key]
+
+    def freeze(self) -> None:
+        """
+        Precalcula los segmentos elementales de los rangos para resolverlos con búsqueda binaria.
+        """
+        bounds = sorted({low for low, _ in self.ranges} | {high + 1 for _, high in self.ranges})
+
+        self._bounds = bounds
+        self._segments = [
+            [child for (low, high), child in self.ranges.items() if low <= bound <= high]
+            for bound in bounds
+        ]
+
+        for child in self.children():
+            if isinstance(child, _RuleNode):
+                child.freeze()
+
+    def children(self) -> Iterator[Any]:
+        """Recorre todos los hijos del nodo."""
+        yield from self.exact.values()
+        yield from self.prefixes.values()
+        yield from self.ranges.values()
+        if self.wildcard is not None:
+            yield self.wildcard
+
+    def candidates(self, value: Optional[str]) -> Iterator[Any]:
+        """
+        Recorre los hijos cuyos patrones aceptan el valor.
+
+        Args:
+            value: Valor del campo en la trama.
+        """
+        if value is not None:
+            child = self.exact.get(value)
+            if child is not None:
+                yield child
+
+            if self.prefixes:
+                for size in range(1, min(len(value), self._max_prefix) + 1):
+                    child = self.prefixes.get(value[:size])
+                    if child is not None:
+                        yield child
+
+            if self._bounds and _is_number(value):
+                position = bisect_right(self._bounds, int(value)) - 1
+                if 0 <= position < len(self._segments):
+                    yield from self._segments[position]
+
+        if self.wildcard is not None:
+            yield self.wildcard
+
+class CampaignRuleIndex:
+    """
+    Índice de reglas de campañas compilado desde el archivo de parametrización.
+
+    Las reglas se organizan en un árbol de decisión con un nivel por campo de la
+    condición (motivo_concepto, canal, codigo_trx). En cada nivel la coincidencia
+    exacta es una búsqueda en diccionario, los prefijos se resuelven como un trie
+    (una búsqueda por longitud de prefijo) y los rangos con búsqueda binaria, por
+    lo que el costo de una consulta no crece con el número de reglas.
+    """
+
+    def __init__(self, s3_file: Dict[str, Any]):
+        """
+        Args:
+            s3_file (dict): Archivo de parametrización con la lista 'campaign'.
+        """
+        self._root = _RuleNode()
+        self._size = 0
+
+        campaigns = s3_file.get('campaign') if isinstance(s3_file, dict) else None
+
+        for campaign in campaigns or []:
+            for rule in campaign.get('rules') or []:
+                self._add_rule(campaign, rule)
+
+        self._root.freeze()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _add_rule(self, campaign: Dict[str, Any], rule: Dict[str, Any]) -> None:
+        """Agrega una regla al árbol conservando su orden en la parametrización."""
+        config = rule.get('config') or {}
+        patterns = [parse_rule_pattern(config.get(field)) for field in RULE_FIELDS]
+
+        if None in patterns:
+            logger.warning(
+                f"Regla '{rule.get('id_rule')}' de la campaña '{campaign.get('id_campaign')}' "
+                f"omitida: condición inválida {config}."
+            )
+            return
+
+        node = self._root
+        for level, pattern in enumerate(patterns):
+            node = node.child(pattern, _RuleNode if level < len(RULE_FIELDS) - 1 else list)
+
+        node.append((self._size, MappingProxyType({
+            'id_campaign': campaign.get('id_campaign'),
+            'id_rule': rule.get('id_rule'),
+            'variables': rule.get('variables')
+        })))
+        self._size += 1
+
+    def match(self, motivo_concepto: Optional[str], canal: Optional[str], codigo_trx: Optional[str]) -> List[Mapping]:
+        """
+        Obtiene las campañas cuyas reglas aceptan la condición de la trama.
+
+        Args:
+            motivo_concepto (str): Motivo concepto.
+            canal (str): Canal.
+            codigo_trx (str): Código transacción.
+
+        Returns:
+            List[Mapping]: Campañas elegibles, de solo lectura y compartidas por el índice,
+                en el orden de la parametrización.
+        """
+        nodes = [self._root]
+
+        for value in (motivo_concepto, canal, codigo_trx):
+            nodes = [child for node in nodes for child in node.candidates(value)]
+            if not nodes:
+                return []
+
+        if len(nodes) == 1:
+            return [entry for _, entry in nodes[0]]
+
+        matches = sorted((item for leaf in nodes for item in leaf), key=itemgetter(0))
+
+        return [entry for _, entry in matches]
@@ -4,12 +4,15 @@ import jmespath
 import json
 
 from pydantic import ValidationError
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
 
-from ...core.interfaces.message_processor import MessageProcessor
+from ...core.interfaces.message_processor import MessageProcessor, MessageContext, ProcessingResult, BatchItemResult
 from ...utils.log import logger
-from .utils.models import WorkflowEntry
-from .utils.jmespath import extract_from_message_selected_fields
+from ...utils.services import build_service_index
+from ...utils.validation import ValidationMode, load_event
+from .utils.models import WorkflowEntry, MinimalWorkflowEntry
+from .utils.jmespath import compile_paths, extract_from_compiled_fields
 from .utils.exceptions import (
     NoMinimumDataError,
     NoTransactionDataFound,
@@ -25,78 +28,145 @@ class WorkflowProcessor(MessageProcessor):
     Procesador de mensajes artefacto workflow que transforma y extrae datos del mensaje as JSON.
     """
     
-    def __init__(self, s3_config: Dict[str, Any]):
+    def __init__(self, s3_config: Dict[str, Any], validation_mode: ValidationMode = ValidationMode.FULL):
         """
         Inicializa el procesador de servicios.
         
         Args:
             s3_config: Diccionario con la parametrización de servicios y variables.
+            validation_mode: Modo de validación del evento. En los modos MINIMAL y NONE el
+                procesador trabaja sobre el evento decodificado (sin model_dump).
             
         Attributes:
             _s3_config: Parametrización de servicios.
             _list_app_consumers: Lista de IDs de consumidores de aplicaciones.
             _event_data: Datos del evento procesado.
             _namespaces: Diccionario de namespaces XML.
+            _services: Paths compilados por app consumer e id_service.
+            _validation_mode: Modo de validación del evento.
         """
         self._s3_config = s3_config
         self._list_app_consumers = jmespath.search('[*].id', self._s3_config)
+        self._services: Dict[str, Dict[str, List[Tuple[str, Any]]]] = {
+            app_consumer_id: {id_service: compile_paths(paths) for id_service, paths in services.items()}
+            for app_consumer_id, services in build_service_index(self._s3_config).items()
+        }
+        self._app_consumer_id = None
         self._session_id = None
         self._id_service = None
         self._tidnid = None
+        self._entity = None
         self._event_data: Optional[Dict[str, Any]] = None
         self._transaction_data: Optional[Dict[str, Any]] = None
+        self._validation_mode = ValidationMode(validation_mode)
 
-    def _validate_and_extract_fields(self, event: Dict[str, Any]) -> None:
+    def _search_fields(self, event: Dict[str, Any]) -> Tuple[Any, Any, Any, Any, Any]:
         """
-        Valida y extrae los campos necesarios del evento.
+        Busca en el evento los campos de control del mensaje.
         
         Args:
             event: Evento a procesar.
             
+        Returns:
+            Tuple: (session_id, app_consumer_id, id_service, tidnid, entity).
+        """
+        return (
+            jmespath.search('jsonPayload.dataObject.consumer.appConsumer.sessionId', event),
+            jmespath.search('jsonPayload.dataObject.consumer.appConsumer.id', event),
+            jmespath.search('jsonPayload.dataObject.messages.idService', event),
+            jmespath.search("(jsonPayload.dataObject.documento || jsonPayload.dataObject.client.documentClient) | join('-', [tipo || type, numero || number])", event),
+            jmespath.search('jsonPayload.dataObject.messages.transaction.transactionName', event)
+        )
+
+    def _check_minimum_data(self, app_consumer_id: Any, id_service: Any, session_id: Any, entity: Any) -> None:
+        """
+        Valida que el evento tenga los datos mínimos para la extracción.
+        
         Raises:
-            AttributeError: Si faltan campos requeridos.
-            KeyError: Si no se encuentran claves necesarias.
+            NoMinimumDataError: Si faltan campos requeridos.
         """
         try:
-            self._session_id = jmespath.search('jsonPayload.dataObject.consumer.appConsumer.sessionId', event)
-            self._app_consumer_id = jmespath.search('jsonPayload.dataObject.consumer.appConsumer.id', event)
-            self._id_service = jmespath.search('jsonPayload.dataObject.messages.idService', event)
-            self._tidnid = jmespath.search("(jsonPayload.dataObject.documento || jsonPayload.dataObject.client.documentClient) | join('-', [tipo || type, numero || number])", event)
-            self._entity = jmespath.search('jsonPayload.dataObject.messages.transaction.transactionName', event)
-            
-            if not all([self._list_app_consumers, self._app_consumer_id, self._id_service, self._session_id, self._entity]):
+            if not all([self._list_app_consumers, app_consumer_id, id_service, session_id, entity]):
                 raise NoMinimumDataError(
                         self._list_app_consumers, 
-                        self._app_consumer_id, 
-                        self._id_service, 
-                        self._session_id,
-                        self._entity
+                        app_consumer_id, 
+                        id_service, 
+                        session_id,
+                        entity
                     )
                 
         except NoMinimumDataError as e:
             logger.error(f"Datos mínimos no encontrados: {str(e)}")
             raise
 
-    def _extract_transaction_data(self, event: Dict[str, Any]) -> None:
+    def _validate_and_extract_fields(self, event: Dict[str, Any]) -> None:
         """
-        Extrae los datos de homologación generados por el workflow.
+        Valida y extrae los campos necesarios del evento.
+        
+        Args:
+            event: Evento a procesar.
+            
+        Raises:
+            AttributeError: Si faltan campos requeridos.
+            KeyError: Si no se encuentran claves necesarias.
+        """
+        self._session_id, self._app_consumer_id, self._id_service, self._tidnid, self._entity = self._search_fields(event)
+        self._check_minimum_data(self._app_consumer_id, self._id_service, self._session_id, self._entity)
+
+    def _search_transaction_data(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Busca los datos de homologación generados por el workflow.
         
         Args:
             event: Evento que contiene los datos de homologación.
             
+        Returns:
+            Dict[str, Any]: Datos de homologación (transactionData).
+            
         Raises:
             NoTransactionDataFound: Si no se encuentran los datos de homologación.
         """
         try:
-            self._transaction_data = jmespath.search('jsonPayload.dataObject.messages.transaction.transactionData', event)
+            transaction_data = jmespath.search('jsonPayload.dataObject.messages.transaction.transactionData', event)
             
-            if not all([self._transaction_data]):
+            if not all([transaction_data]):
                 raise NoTransactionDataFound
             
+            return transaction_data
+            
         except NoTransactionDataFound as e:
             logger.error(f"Datos de 'transactionData' no encontrados: {str(e)}")
             raise
 
+    def _extract_transaction_data(self, event: Dict[str, Any]) -> None:
+        """
+        Extrae los datos de homologación generados por el workflow.
+        
+        Args:
+            event: Evento que contiene los datos de homologación.
+            
+        Raises:
+            NoTransactionDataFound: Si no se encuentran los datos de homologación.
+        """
+        self._transaction_data = self._search_transaction_data(event)
+
+    def _load_event(self, message: str) -> Dict[str, Any]:
+        """
+        Decodifica y valida el mensaje según el modo de validación.
+        
+        Raises:
+            ValidationError: Si el mensaje no cumple con el modelo del workflow.
+            json.JSONDecodeError: Si el mensaje no es un JSON válido.
+        """
+        try:
+            return load_event(message, WorkflowEntry, MinimalWorkflowEntry, self._validation_mode)
+        except ValidationError as e:
+            logger.error(f"Error de validación de estructura: {str(e)}")
+            raise
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decodificando JSON: {str(e)}")
+            raise
+
     def process(self, message: str) -> Dict[str, Any]:
         """
         Procesa un mensaje, validando su estructura y retornando los datos de homologación.
@@ -110,25 +180,54 @@ class WorkflowProcessor(MessageProcessor):
         Raises:
             ValidationError: Si el mensaje no cumple con el modelo del workflow.
         """
-        try:
-            # Validar estructura del mensaje
-            self._event_data = WorkflowEntry.model_validate(json.loads(message))
-            self._event_data = self._event_data.model_dump()
+        # Validar estructura del mensaje
+        self._event_data = self._load_event(message)
+        
+        # Extraer y validar campos
+        self._validate_and_extract_fields(self._event_data)
+        
+        # Extraer los datos de homologación
+        self._extract_transaction_data(self._event_data)
+        
+        return self._event_data
+
+    def _extract_data(
+        self,
+        event_data: Optional[Dict[str, Any]],
+        app_consumer_id: Any,
+        id_service: Any,
+        paths: Optional[List[Tuple[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Extrae las variables configuradas para el app consumer y servicio del evento.
+        
+        Args:
+            event_data: Datos de homologación para extraer variables.
+            app_consumer_id: App consumer del evento.
+            id_service: Servicio del evento.
+            paths: Paths compilados ya resueltos para el app consumer y servicio (extracción por lotes).
             
-            # Extraer y validar campos
-            self._validate_and_extract_fields(self._event_data)
+        Returns:
+            Dict[str, Any]: Datos extraídos según parametrización.
+        """
+        if not event_data:
+            raise InvalidEventDataError
+        
+        if paths is None:
+            services = self._services.get(app_consumer_id)
             
-            # Extraer los datos de homologación
-            self._extract_transaction_data(self._event_data)
+            if services is None:
+                raise AppConsumerNotFoundError(app_consumer_id=app_consumer_id)
             
-            return self._event_data
+            paths = services.get(id_service)
             
-        except ValidationError as e:
-            logger.error(f"Error de validación de estructura: {str(e)}")
-            raise
-        except json.JSONDecodeError as e:
-            logger.error(f"Error decodificando JSON: {str(e)}")
-            raise
+            if paths is None:
+                raise ServiceNotFoundError(id_service=id_service, app_consumer_id=app_consumer_id)
+        
+        if not paths:
+            raise NoVariablesConfiguredError(id_service=id_service, app_consumer_id=app_consumer_id)
+            
+        return dict(extract_from_compiled_fields(paths=paths, event=event_data))
 
     def extract(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -140,22 +239,90 @@ class WorkflowProcessor(MessageProcessor):
         Returns:
             Dict[str, Any]: Datos extraídos según parametrización.
         """
-        event_data = data or self._transaction_data
+        return self._extract_data(data or self._transaction_data, self._app_consumer_id, self._id_service)
+
+    def _process_context(self, message: str) -> MessageContext:
+        """
+        Procesa un mensaje sin guardar estado en el procesador.
         
-        if not event_data:
-            raise InvalidEventDataError
+        Args:
+            message: Mensaje a procesar en formato string.
             
-        if self._app_consumer_id not in self._list_app_consumers:
-            raise AppConsumerNotFoundError(app_consumer_id=self._app_consumer_id)
+        Returns:
+            MessageContext: Evento procesado y campos app_consumer_id, id_service, session_id,
+                tidnid, entity y transaction_data.
+        """
+        event_data = self._load_event(message)
         
-        services = jmespath.search(f"[?id=='{self._app_consumer_id}'].services[].id_service", self._s3_config)
+        session_id, app_consumer_id, id_service, tidnid, entity = self._search_fields(event_data)
+        self._check_minimum_data(app_consumer_id, id_service, session_id, entity)
         
-        if self._id_service not in services:
-            raise ServiceNotFoundError(id_service=self._id_service, app_consumer_id=self._app_consumer_id)
+        transaction_data = self._search_transaction_data(event_data)
+        
+        return MessageContext(event_data, MappingProxyType({
+            'app_consumer_id': app_consumer_id,
+            'id_service': id_service,
+            'session_id': session_id,
+            'tidnid': tidnid,
+            'entity': entity,
+            'transaction_data': transaction_data
+        }))
 
-        paths = jmespath.search(f"[?id=='{self._app_consumer_id}'][].services[?id_service=='{self._id_service}'][].paths[]", self._s3_config)
+    def process_and_extract(self, message: str) -> ProcessingResult:
+        """
+        Procesa un mensaje y extrae las variables configuradas sin guardar estado en el procesador.
         
-        if not paths:
-            raise NoVariablesConfiguredError(id_service=self._id_service, app_consumer_id=self._app_consumer_id)
+        Equivale a process seguido de extract, pero el estado del mensaje se retorna en un
+        contexto inmutable, por lo que una misma instancia se puede compartir entre hilos.
+        
+        Args:
+            message: Mensaje a procesar en formato string.
+            
+        Returns:
+            ProcessingResult: Contexto del mensaje (evento procesado y campos app_consumer_id,
+                id_service, session_id, tidnid, entity y transaction_data) y datos extraídos.
+        """
+        context = self._process_context(message)
+        fields = context.fields
+        
+        return ProcessingResult(context, self._extract_data(
+            fields['transaction_data'], fields['app_consumer_id'], fields['id_service']
+        ))
+
+    def process_batch(self, messages: Iterable[str]) -> List[BatchItemResult]:
+        """
+        Procesa y extrae un lote de mensajes sin guardar estado en el procesador.
+        
+        Los mensajes se agrupan por (app_consumer_id, id_service) para resolver los paths
+        compilados una sola vez por grupo. Un mensaje con error no interrumpe el lote.
+        
+        Args:
+            messages: Mensajes a procesar en formato string.
             
-        return dict(extract_from_message_selected_fields(paths=paths, event=event_data))
+        Returns:
+            List[BatchItemResult]: Resultado o error de cada mensaje, en el orden del lote.
+        """
+        return self._run_batch(messages, self._process_context)
+
+    def extract_batch(self, contexts: Sequence[MessageContext]) -> List[BatchItemResult]:
+        """
+        Extrae las variables configuradas de un lote de mensajes procesados, agrupados por
+        (app_consumer_id, id_service).
+        
+        Args:
+            contexts: Contextos de los mensajes (ProcessingResult.context).
+            
+        Returns:
+            List[BatchItemResult]: Resultado o error de cada contexto, en el orden recibido.
+        """
+        return self._extract_grouped(
+            contexts,
+            key=lambda context: (context.fields['app_consumer_id'], context.fields['id_service']),
+            resolve=lambda key: self._services.get(key[0], {}).get(key[1]),
+            extract=lambda context, paths: self._extract_data(
+                context.fields['transaction_data'],
+                context.fields['app_consumer_id'],
+                context.fields['id_service'],
+                paths
+            )
+        )
@@ -2,7 +2,7 @@
 
 import jmespath
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 
 def extract_from_message_selected_fields(paths: List[list], event: dict):
@@ -32,3 +32,52 @@ def extract_from_message_selected_fields(paths: List[list], event: dict):
         raise KeyError(f"No se encontró la clave en el evento: {e}")
     except Exception as e:
         raise RuntimeError(f"Error desconocido al intentar extraer las variables: {e}")
+
+def compile_paths(paths: List[list]) -> List[Tuple[str, Optional[jmespath.parser.ParsedResult]]]:
+    """
+    Precompila los query definidos en el archivo de parametrización.
+
+    Args:
+        paths (List[list]): Lista con los query y si están habilitados.
+
+    Returns:
+        List[Tuple[str, Optional[ParsedResult]]]: Query original y su expresión compilada,
+            o None si el query no es válido (el error se reporta al extraer).
+    """
+    compiled = []
+
+    for path, _ in paths:
+        try:
+            compiled.append((path, jmespath.compile(path)))
+        except jmespath.exceptions.ParseError:
+            compiled.append((path, None))
+
+    return compiled
+
+def extract_from_compiled_fields(paths: List[Tuple[str, Optional[jmespath.parser.ParsedResult]]], event: dict):
+    """
+    Extrae los campos de transactionData usando query precompilados con compile_paths.
+
+    Mantiene el contrato de extract_from_message_selected_fields.
+
+    Args:
+        paths (List[Tuple[str, Optional[ParsedResult]]]): Query y expresiones compiladas.
+        event (dict): transactionData.
+
+    Yields:
+        tuple: Tupla con el query y el valor extraido de la trama del Mbaas.
+    """
+    try:
+        for path, expression in paths:
+            tmp_var = expression.search(event) if expression is not None else jmespath.search(path, event)
+            
+            if tmp_var:
+                yield (path, tmp_var)
+    except jmespath.exceptions.JMESPathTypeError as e:
+        raise TypeError(f"Error de tipo en la búsqueda de JMESPath: {e}")
+    except jmespath.exceptions.ParseError as e:
+        raise ValueError(f"Error al analizar la expresión JMESPath: {e}")
+    except KeyError as e:
+        raise KeyError(f"No se encontró la clave en el evento: {e}")
+    except Exception as e:
+        raise RuntimeError(f"Error desconocido al intentar extraer las variables: {e}")
@@ -66,3 +66,25 @@ class WorkflowEntry(BaseModel):
     receiveTimestamp: str
     insertId: str
     timestamp: str
+
+class MinimalAppConsumer(BaseModel):
+    id: str
+    sessionId: str
+
+class MinimalConsumer(BaseModel):
+    appConsumer: MinimalAppConsumer
+
+class MinimalDataObject(BaseModel):
+    client: Client
+    messages: Messages
+    consumer: MinimalConsumer
+
+class MinimalJsonPayload(BaseModel):
+    dataObject: MinimalDataObject
+
+class MinimalWorkflowEntry(BaseModel):
+    """
+    Modelo de validación mínima del artefacto workflow: solo los campos que requiere el procesador
+    (cliente, app consumer, sesión, servicio y transacción).
+    """
+    jsonPayload: MinimalJsonPayload
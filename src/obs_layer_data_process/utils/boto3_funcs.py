@@ -1,14 +1,20 @@
 """utils/boto3_funcs.py"""
 
+import asyncio
 import boto3
 import json
+import time
 
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from typing import Dict, Any, Optional
-from .message import get_group_id, generate_deduplication_id
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from .message import get_group_id, generate_deduplication_id, build_deduplication_id, serialize_message
+from .log import logger
 from .settings import (
     BUCKET_NAME, 
-    OBJECT_NAME
+    OBJECT_NAME,
+    DEDUPLICATION_KEYS
 )
 
 
@@ -16,6 +22,9 @@ def from_s3_get_file(bucket_name: str = BUCKET_NAME, object_name: str = OBJECT_N
     """
     Obtiene el archivo de parametrización desde S3.
 
+    Descarga el archivo completo en cada llamada; SqsBatchHandler usa la versión con caché
+    (utils.s3_config.from_s3_get_file_cached).
+
     Args:
         bucket_name (str, optional): Nombre del bucket S3. Defaults to BUCKET_NAME.
         object_name (str, optional): Nombre del archivo. Defaults to OBJECT_NAME.
@@ -40,7 +49,39 @@ def from_s3_get_file(bucket_name: str = BUCKET_NAME, object_name: str = OBJECT_N
     except json.JSONDecodeError as e:
         raise ValueError(f"Error decodificando el archivo parametrización: {e}")
 
-def send_message_to_sqs(sqs_client, message: str, queue_url: str) -> Dict[str, Any]:
+def build_sqs_payload(message: dict, deduplication_keys: Sequence[str] = DEDUPLICATION_KEYS) -> Tuple[str, str, str]:
+    """
+    Construye el cuerpo, MessageGroupId y MessageDeduplicationId de un mensaje.
+
+    El mensaje se serializa una sola vez y el mismo cuerpo se usa para el token de
+    deduplicación, salvo que se indiquen llaves de deduplicación.
+
+    Args:
+        message (dict): Mensaje que será enviado a la cola SQS.
+        deduplication_keys (Sequence[str], optional): Llaves que identifican el mensaje para
+            la deduplicación. Defaults to DEDUPLICATION_KEYS (vacío: todo el mensaje).
+
+    Raises:
+        ValueError: Si el mensaje no tiene alguna de las llaves de deduplicación.
+
+    Returns:
+        Tuple[str, str, str]: Cuerpo, MessageGroupId y MessageDeduplicationId.
+    """
+    body = serialize_message(message)
+    
+    if deduplication_keys:
+        deduplication_id = generate_deduplication_id(message, deduplication_keys)
+    else:
+        deduplication_id = build_deduplication_id(body)
+    
+    return body, get_group_id(message), deduplication_id
+
+def send_message_to_sqs(
+    sqs_client,
+    message: str,
+    queue_url: str,
+    deduplication_keys: Sequence[str] = DEDUPLICATION_KEYS
+) -> Dict[str, Any]:
     """
     Envia mensajes a las colas SQS.
 
@@ -48,18 +89,45 @@ def send_message_to_sqs(sqs_client, message: str, queue_url: str) -> Dict[str, A
         sqs_client (_type_): Instancia de cliente SQS (boto3).
         message (str): Mensaje que será enviado a la cola SQS.
         queue_url (str): URL de la cola SQS.
+        deduplication_keys (Sequence[str], optional): Llaves que identifican el mensaje para
+            la deduplicación. Defaults to DEDUPLICATION_KEYS (vacío: todo el mensaje).
 
     Returns:
         _type_: _description_
     """
     try:
-        message_group_id = get_group_id(message)
-        
+        payload = build_sqs_payload(message, deduplication_keys)
+    except ValueError as ve:
+        return {
+            'status': 'error',
+            'queue_url': queue_url,
+            'error': f"Error de validacón: {str(ve)}"
+        }
+    
+    return send_payload_to_sqs(sqs_client, payload, queue_url)
+
+def send_payload_to_sqs(sqs_client, payload: Tuple[str, str, str], queue_url: str) -> Dict[str, Any]:
+    """
+    Envía a una cola SQS un mensaje ya construido con build_sqs_payload.
+
+    Permite enviar el mismo mensaje a varias colas serializándolo una sola vez.
+
+    Args:
+        sqs_client (_type_): Instancia de cliente SQS (boto3).
+        payload (Tuple[str, str, str]): Cuerpo, MessageGroupId y MessageDeduplicationId.
+        queue_url (str): URL de la cola SQS.
+
+    Returns:
+        Dict[str, Any]: Resultado del envío (misma estructura que send_message_to_sqs).
+    """
+    body, message_group_id, deduplication_id = payload
+    
+    try:
         response = sqs_client.send_message(
             QueueUrl=queue_url,
-            MessageBody=json.dumps(message),
+            MessageBody=body,
             MessageGroupId=message_group_id,
-            MessageDeduplicationId=generate_deduplication_id(message)
+            MessageDeduplicationId=deduplication_id
         )
 
         return {
@@ -68,15 +136,392 @@ def send_message_to_sqs(sqs_client, message: str, queue_url: str) -> Dict[str, A
             'message_id': response['MessageId'],
             'message_group_id': message_group_id
         }
-    except ValueError as ve:
-        return {
-            'status': 'error',
-            'queue_url': queue_url,
-            'error': f"Error de validacón: {str(ve)}"
-        }
     except ClientError as e:
         return {
             'status': 'error',
             'queue_url': queue_url,
             'error': str(e)
         }
+
+# Límites de SendMessageBatch
+SQS_BATCH_MAX_ENTRIES = 10
+SQS_BATCH_MAX_BYTES = 256 * 1024
+
+# Errores de SendMessageBatch que se reintentan cuando falla la llamada completa
+RETRYABLE_SQS_ERROR_CODES = frozenset({
+    'Throttling', 'ThrottlingException', 'RequestThrottled', 'RequestLimitExceeded',
+    'ServiceUnavailable', 'InternalError', 'InternalFailure'
+})
+
+class _BatchEntry(NamedTuple):
+    """
+    Mensaje pendiente de envío en send_messages_to_sqs_batch.
+    """
+    index: int
+    body: str
+    size: int
+    message_group_id: str
+    deduplication_id: str
+    attempts: int = 0
+
+def _next_sqs_batch(pending: List[_BatchEntry], fifo: bool):
+    """
+    Toma de los mensajes pendientes, en orden, el siguiente lote para SendMessageBatch.
+
+    SendMessageBatch conserva el orden de las entradas de un mismo MessageGroupId, por lo
+    que un lote puede llevar varios mensajes consecutivos de un grupo. En colas FIFO, si un
+    mensaje no cabe en el lote, los siguientes de su grupo tampoco se incluyen.
+
+    Returns:
+        Tuple[List[_BatchEntry], List[_BatchEntry]]: Lote y mensajes que quedan pendientes.
+    """
+    batch, rest = [], []
+    skipped = set()
+    size = 0
+    
+    for entry in pending:
+        if (
+            len(batch) < SQS_BATCH_MAX_ENTRIES
+            and size + entry.size <= SQS_BATCH_MAX_BYTES
+            and not (fifo and entry.message_group_id in skipped)
+        ):
+            batch.append(entry)
+            size += entry.size
+        else:
+            rest.append(entry)
+            skipped.add(entry.message_group_id)
+    
+    return batch, rest
+
+def _is_retryable_client_error(error: ClientError) -> bool:
+    """
+    Indica si el error de una llamada completa a SQS es transitorio (throttling o error del servicio).
+    """
+    response = error.response or {}
+    code = response.get('Error', {}).get('Code', '')
+    status = response.get('ResponseMetadata', {}).get('HTTPStatusCode') or 0
+    
+    return code in RETRYABLE_SQS_ERROR_CODES or status >= 500
+
+def send_messages_to_sqs_batch(
+    sqs_client,
+    messages: Iterable[dict],
+    queue_url: str,
+    max_retries: int = 3,
+    retry_delay: float = 0.1,
+    deduplication_keys: Sequence[str] = DEDUPLICATION_KEYS
+) -> List[Dict[str, Any]]:
+    """
+    Envia mensajes a una cola SQS agrupados en lotes de SendMessageBatch.
+
+    Cada lote tiene como máximo 10 mensajes y 256 KB. Se reintentan, hasta max_retries veces
+    y con espera exponencial, las entradas fallidas cuyo error no es del remitente
+    (SenderFault) y los lotes completos rechazados por un error transitorio (throttling o
+    error del servicio).
+
+    En colas FIFO se conserva el orden de cada MessageGroupId: después de una entrada
+    fallida, las siguientes del grupo se reenvían detrás de ella, y si la entrada falla de
+    forma definitiva los mensajes pendientes del grupo se reportan con error sin enviarse.
+
+    Args:
+        sqs_client (_type_): Instancia de cliente SQS (boto3).
+        messages (Iterable[dict]): Mensajes que serán enviados a la cola SQS.
+        queue_url (str): URL de la cola SQS.
+        max_retries (int, optional): Reintentos por mensaje. Defaults to 3.
+        retry_delay (float, optional): Espera base en segundos entre reintentos. Defaults to 0.1.
+        deduplication_keys (Sequence[str], optional): Llaves que identifican el mensaje para
+            la deduplicación. Defaults to DEDUPLICATION_KEYS (vacío: todo el mensaje).
+
+    Returns:
+        List[Dict[str, Any]]: Resultado de cada mensaje, en el orden recibido y con la misma
+            estructura que send_message_to_sqs.
+    """
+    results: List[Optional[Dict[str, Any]]] = []
+    payloads: List[Tuple[str, str, str]] = []
+    positions: List[int] = []
+    
+    for index, message in enumerate(messages):
+        try:
+            payloads.append(build_sqs_payload(message, deduplication_keys))
+            positions.append(index)
+            results.append(None)
+        except ValueError as ve:
+            results.append({'status': 'error', 'queue_url': queue_url, 'error': f"Error de validacón: {str(ve)}"})
+    
+    sent = send_payloads_to_sqs_batch(sqs_client, payloads, queue_url, max_retries, retry_delay)
+    
+    for index, result in zip(positions, sent):
+        results[index] = result
+    
+    return results
+
+def send_payloads_to_sqs_batch(
+    sqs_client,
+    payloads: Sequence[Tuple[str, str, str]],
+    queue_url: str,
+    max_retries: int = 3,
+    retry_delay: float = 0.1
+) -> List[Dict[str, Any]]:
+    """
+    Envía mensajes ya construidos con build_sqs_payload en lotes de SendMessageBatch
+    (ver send_messages_to_sqs_batch).
+
+    Permite enviar los mismos mensajes a varias colas serializándolos una sola vez.
+
+    Args:
+        sqs_client (_type_): Instancia de cliente SQS (boto3).
+        payloads (Sequence[Tuple[str, str, str]]): Cuerpo, MessageGroupId y
+            MessageDeduplicationId de cada mensaje.
+        queue_url (str): URL de la cola SQS.
+        max_retries (int, optional): Reintentos por mensaje. Defaults to 3.
+        retry_delay (float, optional): Espera base en segundos entre reintentos. Defaults to 0.1.
+
+    Returns:
+        List[Dict[str, Any]]: Resultado de cada mensaje, en el orden recibido y con la misma
+            estructura que send_message_to_sqs.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(payloads)
+    pending: List[_BatchEntry] = []
+    
+    for index, (body, message_group_id, deduplication_id) in enumerate(payloads):
+        entry = _BatchEntry(
+            index=index,
+            body=body,
+            size=len(body.encode('utf-8')),
+            message_group_id=message_group_id,
+            deduplication_id=deduplication_id
+        )
+        
+        if entry.size > SQS_BATCH_MAX_BYTES:
+            results[index] = {
+                'status': 'error',
+                'queue_url': queue_url,
+                'error': f"El mensaje supera el tamaño máximo de SQS ({entry.size} > {SQS_BATCH_MAX_BYTES} bytes)."
+            }
+            continue
+        
+        pending.append(entry)
+    
+    fifo = queue_url.endswith('.fifo')
+    
+    while pending:
+        batch, pending = _next_sqs_batch(pending, fifo)
+        entries = {str(entry.index): entry for entry in batch}
+        
+        attempts = max(entry.attempts for entry in batch)
+        if attempts:
+            time.sleep(retry_delay * 2 ** (attempts - 1))
+        
+        # Resultado por entrada: MessageId si se envió, (reintentable, error) si falló
+        try:
+            response = sqs_client.send_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {
+                        'Id': entry_id,
+                        'MessageBody': entry.body,
+                        'MessageGroupId': entry.message_group_id,
+                        'MessageDeduplicationId': entry.deduplication_id
+                    }
+                    for entry_id, entry in entries.items()
+                ]
+            )
+            successful = {success['Id']: success['MessageId'] for success in response.get('Successful', [])}
+            failed = {
+                failure['Id']: (not failure.get('SenderFault'), f"{failure.get('Code')}: {failure.get('Message', '')}")
+                for failure in response.get('Failed', [])
+            }
+        except ClientError as e:
+            successful = {}
+            failed = dict.fromkeys(entries, (_is_retryable_client_error(e), str(e)))
+        
+        retries = []
+        stalled, blocked = set(), set()
+        
+        for entry_id, entry in entries.items():
+            group_id = entry.message_group_id
+            
+            if entry_id in successful:
+                results[entry.index] = {
+                    'status': 'success',
+                    'queue_url': queue_url,
+                    'message_id': successful[entry_id],
+                    'message_group_id': group_id
+                }
+                continue
+            
+            retryable, error = failed.get(entry_id, (True, "SQS no retornó el resultado de la entrada."))
+            
+            if fifo and group_id in blocked:
+                results[entry.index] = {
+                    'status': 'error',
+                    'queue_url': queue_url,
+                    'error': f"Mensaje no enviado: falló un mensaje anterior del grupo '{group_id}'."
+                }
+            elif fifo and group_id in stalled:
+                # Se reenvía detrás de la entrada fallida de su grupo, sin consumir reintentos
+                retries.append(entry)
+            elif retryable and entry.attempts < max_retries:
+                logger.warning(f"Reintentando mensaje {entry.index} en {queue_url}: {error}")
+                retries.append(entry._replace(attempts=entry.attempts + 1))
+                stalled.add(group_id)
+            else:
+                results[entry.index] = {'status': 'error', 'queue_url': queue_url, 'error': error}
+                blocked.add(group_id)
+        
+        pending = sorted(pending + retries, key=lambda entry: entry.index)
+        
+        if fifo and blocked:
+            remaining = []
+            
+            for entry in pending:
+                if entry.message_group_id in blocked:
+                    results[entry.index] = {
+                        'status': 'error',
+                        'queue_url': queue_url,
+                        'error': f"Mensaje no enviado: falló un mensaje anterior del grupo '{entry.message_group_id}'."
+                    }
+                else:
+                    remaining.append(entry)
+            
+            pending = remaining
+    
+    return results
+
+def create_sqs_client(max_pool_connections: int = 10, **kwargs):
+    """
+    Crea un cliente SQS con un pool de conexiones HTTP del tamaño indicado.
+
+    El pool por defecto de botocore (10 conexiones) limita los envíos concurrentes
+    cuando el cliente se comparte entre hilos.
+
+    Args:
+        max_pool_connections (int, optional): Conexiones HTTP del cliente. Defaults to 10.
+        **kwargs: Argumentos adicionales de boto3.client (region_name, endpoint_url, ...).
+
+    Returns:
+        _type_: Cliente SQS (boto3).
+    """
+    return boto3.client('sqs', config=Config(max_pool_connections=max_pool_connections), **kwargs)
+
+async def send_message_to_sqs_async(
+    sqs_client,
+    message: dict,
+    queue_url: str,
+    executor: Optional[Executor] = None,
+    deduplication_keys: Sequence[str] = DEDUPLICATION_KEYS
+) -> Dict[str, Any]:
+    """
+    Versión asyncio de send_message_to_sqs: ejecuta el envío en un pool de hilos sin
+    bloquear el event loop.
+
+    Args:
+        sqs_client (_type_): Instancia de cliente SQS (boto3).
+        message (dict): Mensaje que será enviado a la cola SQS.
+        queue_url (str): URL de la cola SQS.
+        executor (Optional[Executor], optional): Pool donde se ejecuta el envío. Defaults to
+            el executor por defecto del event loop.
+        deduplication_keys (Sequence[str], optional): Llaves que identifican el mensaje para
+            la deduplicación. Defaults to DEDUPLICATION_KEYS (vacío: todo el mensaje).
+
+    Returns:
+        Dict[str, Any]: Resultado del envío (misma estructura que send_message_to_sqs).
+    """
+    loop = asyncio.get_running_loop()
+    
+    return await loop.run_in_executor(
+        executor, send_message_to_sqs, sqs_client, message, queue_url, deduplication_keys
+    )
+
+class AsyncSqsPublisher:
+    """
+    Publicador asyncio de mensajes SQS con un máximo de envíos en curso.
+
+    Los envíos usan un cliente boto3 compartido en un pool de hilos del mismo tamaño que
+    su pool de conexiones, por lo que un pipeline asyncio puede mantener cientos de
+    envíos en curso sin bloquear el event loop.
+
+    Ejemplo:
+        async with AsyncSqsPublisher(max_in_flight=200) as publisher:
+            results = await publisher.send_many(messages, queue_url)
+    """
+
+    def __init__(self, sqs_client=None, max_in_flight: int = 100, **client_kwargs):
+        """
+        Args:
+            sqs_client: Cliente SQS compartido. Si es None, se crea con create_sqs_client
+                y max_pool_connections=max_in_flight.
+            max_in_flight (int, optional): Envíos en curso permitidos. Defaults to 100.
+            **client_kwargs: Argumentos adicionales de create_sqs_client (region_name, endpoint_url, ...).
+        """
+        self._client = sqs_client or create_sqs_client(max_pool_connections=max_in_flight, **client_kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='sqs-async')
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def send(
+        self,
+        message: dict,
+        queue_url: str,
+        deduplication_keys: Sequence[str] = DEDUPLICATION_KEYS
+    ) -> Dict[str, Any]:
+        """
+        Envía un mensaje; espera si ya hay max_in_flight envíos en curso.
+
+        Args:
+            message (dict): Mensaje que será enviado a la cola SQS.
+            queue_url (str): URL de la cola SQS.
+            deduplication_keys (Sequence[str], optional): Llaves que identifican el mensaje para
+                la deduplicación. Defaults to DEDUPLICATION_KEYS (vacío: todo el mensaje).
+
+        Returns:
+            Dict[str, Any]: Resultado del envío (misma estructura que send_message_to_sqs).
+        """
+        async with self._semaphore:
+            return await send_message_to_sqs_async(
+                self._client, message, queue_url, self._executor, deduplication_keys
+            )
+
+    async def send_many(
+        self,
+        messages: Iterable[dict],
+        queue_url: str,
+        deduplication_keys: Sequence[str] = DEDUPLICATION_KEYS
+    ) -> List[Dict[str, Any]]:
+        """
+        Envía varios mensajes de forma concurrente.
+
+        A diferencia de send, un error inesperado de un mensaje no interrumpe los demás:
+        se retorna como resultado con status 'error'.
+
+        Args:
+            messages (Iterable[dict]): Mensajes que serán enviados a la cola SQS.
+            queue_url (str): URL de la cola SQS.
+            deduplication_keys (Sequence[str], optional): Llaves que identifican cada mensaje
+                para la deduplicación. Defaults to DEDUPLICATION_KEYS (vacío: todo el mensaje).
+
+        Returns:
+            List[Dict[str, Any]]: Resultado de cada mensaje, en el orden recibido.
+        """
+        results = await asyncio.gather(
+            *(self.send(message, queue_url, deduplication_keys) for message in messages),
+            return_exceptions=True
+        )
+        
+        return [
+            {'status': 'error', 'queue_url': queue_url, 'error': str(result)}
+            if isinstance(result, Exception) else result
+            for result in results
+        ]
+
+    def close(self) -> None:
+        """
+        Libera el pool de hilos.
+        """
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> 'AsyncSqsPublisher':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # close espera a los hilos del pool: se ejecuta fuera del event loop para no bloquearlo
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -0,0 +1,228 @@
+"""utils/fanout.py"""
+
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .boto3_funcs import build_sqs_payload, create_sqs_client, send_payload_to_sqs, send_payloads_to_sqs_batch
+from .log import logger
+from .settings import DEDUPLICATION_KEYS, QUEUE_URLS
+
+
+def send_payloads_to_sqs(sqs_client, payloads: Sequence[Tuple[str, str, str]], queue_url: str) -> List[Dict[str, Any]]:
+    """
+    Envía a una cola mensajes ya construidos con build_sqs_payload: SendMessage si es uno
+    solo y SendMessageBatch si son varios.
+
+    Args:
+        sqs_client (_type_): Instancia de cliente SQS (boto3).
+        payloads (Sequence[Tuple[str, str, str]]): Mensajes construidos.
+        queue_url (str): URL de la cola SQS.
+
+    Returns:
+        List[Dict[str, Any]]: Resultado de cada mensaje (estructura de send_message_to_sqs).
+    """
+    if len(payloads) == 1:
+        return [send_payload_to_sqs(sqs_client, payloads[0], queue_url)]
+    
+    return send_payloads_to_sqs_batch(sqs_client, payloads, queue_url)
+
+
+def aggregate_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Agrega los resultados de envío de un mensaje a varias colas.
+
+    Args:
+        results (List[Dict[str, Any]]): Resultado por cola (estructura de send_message_to_sqs).
+
+    Returns:
+        Dict[str, Any]: status ('success' si todas las colas recibieron el mensaje), número de
+            envíos exitosos y fallidos, y los resultados por cola.
+    """
+    failed = sum(1 for result in results if result.get('status') != 'success')
+    
+    return {
+        'status': 'error' if failed else 'success',
+        'sent': len(results) - failed,
+        'failed': failed,
+        'results': results
+    }
+
+def _completed(result: Any) -> Future:
+    """
+    Future ya resuelto con el resultado indicado.
+    """
+    future = Future()
+    future.set_result(result)
+    
+    return future
+
+class SqsFanout:
+    """
+    Envía cada mensaje a todas las colas configuradas en paralelo.
+
+    Cada mensaje se serializa una sola vez (build_sqs_payload) y el mismo cuerpo se envía
+    a todas las colas.
+
+    Los envíos se ejecutan en un pool de hilos acotado sobre un único cliente boto3
+    (los clientes de boto3 se pueden compartir entre hilos). Cada cola tiene un máximo
+    de envíos en curso: cuando una cola lenta lo alcanza, submit bloquea al llamador
+    en lugar de acumular envíos pendientes sin límite.
+
+    Ejemplo:
+        with SqsFanout() as fanout:
+            fanout.send(result.data)
+    """
+
+    def __init__(
+        self,
+        queue_urls: Sequence[str] = QUEUE_URLS,
+        sqs_client=None,
+        max_in_flight_per_queue: int = 4,
+        max_workers: Optional[int] = None,
+        send: Callable[[Any, List[Tuple[str, str, str]], str], List[Dict[str, Any]]] = send_payloads_to_sqs,
+        deduplication_keys: Sequence[str] = DEDUPLICATION_KEYS
+    ):
+        """
+        Args:
+            queue_urls: URLs de las colas destino. Defaults to QUEUE_URLS.
+            sqs_client: Cliente SQS compartido. Si es None, se crea uno con un pool de
+                conexiones del tamaño del pool de hilos.
+            max_in_flight_per_queue: Envíos en curso permitidos por cola.
+            max_workers: Hilos del pool. Defaults to len(queue_urls) * max_in_flight_per_queue.
+            send: Función que envía a una cola una lista de mensajes construidos con
+                build_sqs_payload y retorna el resultado de cada uno. La usan send y
+                send_batch. Defaults to send_payloads_to_sqs.
+            deduplication_keys: Llaves de deduplicación de los mensajes. Defaults to DEDUPLICATION_KEYS.
+        """
+        self._queue_urls = list(queue_urls)
+        self._max_workers = max_workers or max(1, len(self._queue_urls) * max_in_flight_per_queue)
+        self._client = sqs_client or create_sqs_client(max_pool_connections=self._max_workers)
+        self._send = send
+        self._deduplication_keys = deduplication_keys
+        self._semaphores = {
+            queue_url: threading.BoundedSemaphore(max_in_flight_per_queue) for queue_url in self._queue_urls
+        }
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='sqs-fanout')
+
+    @property
+    def queue_urls(self) -> List[str]:
+        """Colas destino del fan-out."""
+        return list(self._queue_urls)
+
+    def _run(self, queue_url: str, send: Callable[[], Any], error: Callable[[Exception], Any]) -> Future:
+        """
+        Programa un envío a la cola respetando su máximo de envíos en curso.
+        """
+        semaphore = self._semaphores[queue_url]
+        semaphore.acquire()
+        
+        def task():
+            try:
+                return send()
+            except Exception as e:
+                logger.error(f"Error enviando a {queue_url}: {e!r}")
+                return error(e)
+            finally:
+                semaphore.release()
+        
+        try:
+            return self._executor.submit(task)
+        except Exception:
+            semaphore.release()
+            raise
+
+    def submit(self, message: Any) -> List[Future]:
+        """
+        Programa el envío de un mensaje a todas las colas sin esperar los resultados.
+
+        Args:
+            message (Any): Mensaje a enviar.
+
+        Returns:
+            List[Future]: Resultado del envío por cola, en el orden de queue_urls.
+        """
+        try:
+            payloads = [build_sqs_payload(message, self._deduplication_keys)]
+        except ValueError as ve:
+            return [
+                _completed({'status': 'error', 'queue_url': queue_url, 'error': f"Error de validacón: {str(ve)}"})
+                for queue_url in self._queue_urls
+            ]
+        
+        return [
+            self._run(
+                queue_url,
+                lambda queue_url=queue_url: self._send(self._client, payloads, queue_url)[0],
+                lambda e, queue_url=queue_url: {'status': 'error', 'queue_url': queue_url, 'error': str(e)}
+            )
+            for queue_url in self._queue_urls
+        ]
+
+    def send(self, message: Any) -> Dict[str, Any]:
+        """
+        Envía un mensaje a todas las colas en paralelo y agrega los resultados.
+
+        Args:
+            message (Any): Mensaje a enviar.
+
+        Returns:
+            Dict[str, Any]: Resultado agregado (ver aggregate_results).
+        """
+        return aggregate_results([future.result() for future in self.submit(message)])
+
+    def send_batch(self, messages: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        Envía un lote de mensajes a todas las colas, una tarea por cola en paralelo (con la
+        función de envío por defecto, en lotes de SendMessageBatch).
+
+        Args:
+            messages (Iterable[Any]): Mensajes a enviar.
+
+        Returns:
+            List[Dict[str, Any]]: Resultado agregado de cada mensaje, en el orden recibido.
+        """
+        payloads: List[Tuple[str, str, str]] = []
+        positions: List[int] = []
+        errors: Dict[int, str] = {}
+        
+        for index, message in enumerate(messages):
+            try:
+                payloads.append(build_sqs_payload(message, self._deduplication_keys))
+                positions.append(index)
+            except ValueError as ve:
+                errors[index] = f"Error de validacón: {str(ve)}"
+        
+        futures = [
+            self._run(
+                queue_url,
+                lambda queue_url=queue_url: self._send(self._client, payloads, queue_url) if payloads else [],
+                lambda e, queue_url=queue_url: [{'status': 'error', 'queue_url': queue_url, 'error': str(e)}] * len(payloads)
+            )
+            for queue_url in self._queue_urls
+        ]
+        by_queue = []
+        
+        for queue_url, future in zip(self._queue_urls, futures):
+            # Resultado por posición del mensaje en la entrada
+            results = {index: {'status': 'error', 'queue_url': queue_url, 'error': error} for index, error in errors.items()}
+            results.update(zip(positions, future.result()))
+            by_queue.append(results)
+        
+        return [
+            aggregate_results([results[index] for results in by_queue])
+            for index in range(len(positions) + len(errors))
+        ]
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Libera el pool de hilos.
+        """
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> 'SqsFanout':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -4,6 +4,13 @@ import base64
 import hashlib
 import json
 
+from collections.abc import Mapping
+from typing import Any, Optional, Sequence
+
+
+# Longitud máxima de MessageDeduplicationId en SQS: blake2b de 64 bytes en hexadecimal
+DEDUPLICATION_DIGEST_SIZE = 64
+
 
 def encode_base64(message: str):
     """
@@ -47,19 +54,81 @@ def decode_base64(base64_message: str):
     except Exception as e:
         return f"Error al intentar decodificar el mensaje: {e}"
     
-def generate_deduplication_id(event: dict) -> str:
+def json_default(obj):
+    """
+    Serializador auxiliar para json.dumps de objetos tipo Mapping que no son dict
+    (por ejemplo, vistas perezosas de XML o campañas de solo lectura).
+
+    Args:
+        obj: Objeto no serializable por defecto.
+
+    Raises:
+        TypeError: Si el objeto no es un Mapping.
+
+    Returns:
+        dict: Objeto materializado como diccionario.
+    """
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def serialize_message(message: Any) -> str:
+    """
+    Serializa un mensaje como JSON canónico (llaves ordenadas, sin espacios), usado como
+    MessageBody y como base del token de deduplicación.
+
+    Siempre se usa json (no orjson): orjson escribe NaN e Infinity como null y usa otra
+    notación exponencial (1e16 frente a 1e+16), por lo que el cuerpo y el token
+    dependerían de que orjson esté instalado.
+
+    La salida es ASCII (ensure_ascii): los surrogates sueltos y caracteres como U+FFFF
+    quedan escapados, por lo que el cuerpo siempre se puede codificar y SQS lo acepta.
+
+    Args:
+        message (Any): Mensaje a serializar.
+
+    Returns:
+        str: Mensaje serializado.
+    """
+    return json.dumps(message, sort_keys=True, separators=(',', ':'), default=json_default)
+
+def build_deduplication_id(body: str) -> str:
+    """
+    Genera el token de deduplicación de un mensaje ya serializado.
+
+    Args:
+        body (str): Mensaje serializado con serialize_message.
+
+    Returns:
+        str: Hash blake2b del mensaje en hexadecimal (128 caracteres, el máximo de SQS).
+    """
+    return hashlib.blake2b(body.encode('utf-8'), digest_size=DEDUPLICATION_DIGEST_SIZE).hexdigest()
+
+def generate_deduplication_id(event: dict, keys: Optional[Sequence[str]] = None) -> str:
     """
     Genera el token usado para prevenir la duplicación en la entrega de mensajes en colas Amazon SQS FIFO.
 
     Args:
         event (dict): Evento que se utilizará para generar el hash.
+        keys (Optional[Sequence[str]], optional): Llaves del evento que identifican el mensaje. Si se
+            indican, el token se genera solo con sus valores y no con el evento completo. Defaults to None.
+
+    Raises:
+        ValueError: Si el evento no tiene alguna de las llaves indicadas.
 
     Returns:
         str: Token de deduplicación.
     """
-    event_str = json.dumps(event, sort_keys=True)
+    if keys:
+        missing = [key for key in keys if key not in event]
+        
+        if missing:
+            raise ValueError(f"El evento no tiene las llaves de deduplicación {missing}.")
+        
+        return build_deduplication_id(serialize_message([event[key] for key in keys]))
     
-    return hashlib.sha512(event_str.encode('utf-8')).hexdigest()
+    return build_deduplication_id(serialize_message(event))
 
 def get_group_id(event: dict) -> str:
     """
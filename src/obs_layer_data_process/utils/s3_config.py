@@ -0,0 +1,245 @@
+"""utils/s3_config.py"""
+
+import boto3
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from botocore.exceptions import ClientError
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from .log import logger
+from .settings import BUCKET_NAME, OBJECT_NAME, CONFIG_CACHE_TTL, CONFIG_CACHE_DIR
+
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+def get_s3_client():
+    """
+    Devuelve el cliente S3 del módulo, creado en el primer uso y reutilizado entre invocaciones.
+    """
+    global _s3_client
+    
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client('s3')
+    
+    return _s3_client
+
+class CachedConfig(NamedTuple):
+    """
+    Parametrización en caché.
+
+    Attributes:
+        params: Parametrización decodificada.
+        etag: ETag del objeto en S3.
+        loaded_at: Momento (reloj monotónico) de la última validación contra S3.
+    """
+    params: Any
+    etag: Optional[str]
+    loaded_at: float
+
+def _is_not_modified(error: ClientError) -> bool:
+    """
+    Indica si el error de get_object corresponde a un 304 Not Modified (IfNoneMatch).
+    """
+    response = error.response or {}
+    
+    return (
+        response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304
+        or response.get('Error', {}).get('Code') in ('304', 'NotModified')
+    )
+
+class S3ConfigLoader:
+    """
+    Cargador de la parametrización de S3 con caché en memoria y GET condicional.
+
+    Mientras la caché tiene menos de ttl segundos se retorna sin consultar S3; al vencer,
+    la parametrización se revalida con IfNoneMatch y solo se descarga y decodifica si el
+    ETag cambió. Opcionalmente se guarda en disco (p. ej. /tmp), de modo que un proceso
+    nuevo en el mismo entorno de ejecución parte del último ETag conocido.
+
+    La parametrización retornada se comparte entre llamadas y no se debe modificar.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str = BUCKET_NAME,
+        object_name: str = OBJECT_NAME,
+        ttl: float = CONFIG_CACHE_TTL,
+        cache_dir: Optional[str] = CONFIG_CACHE_DIR,
+        s3_client=None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            bucket_name: Nombre del bucket S3. Defaults to BUCKET_NAME.
+            object_name: Nombre del archivo. Defaults to OBJECT_NAME.
+            ttl: Segundos durante los que la caché se usa sin revalidar. Defaults to CONFIG_CACHE_TTL.
+            cache_dir: Directorio de la caché en disco; None la desactiva. Defaults to CONFIG_CACHE_DIR.
+            s3_client: Cliente S3. Defaults to el cliente del módulo (get_s3_client).
+            clock: Reloj monotónico usado para el TTL.
+        """
+        self._bucket_name = bucket_name
+        self._object_name = object_name
+        self._ttl = ttl
+        self._cache_dir = cache_dir
+        self._s3_client = s3_client
+        self._clock = clock
+        self._cached: Optional[CachedConfig] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        """Ruta del archivo de caché en disco, o None si está desactivada."""
+        if not self._cache_dir:
+            return None
+        
+        key = hashlib.sha256(f"{self._bucket_name}/{self._object_name}".encode('utf-8')).hexdigest()
+        
+        return os.path.join(self._cache_dir, f"s3_config_{key}.json")
+
+    def _read_disk_cache(self) -> Optional[CachedConfig]:
+        """
+        Lee la caché en disco; un archivo dentro del TTL se usa sin revalidar.
+        """
+        path = self.cache_path
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+            age = time.time() - os.path.getmtime(path)
+        except (OSError, ValueError, TypeError):
+            return None
+        
+        if not isinstance(content, dict):
+            return None
+        
+        loaded_at = self._clock() - age if age < self._ttl else float('-inf')
+        
+        return CachedConfig(content.get('params'), content.get('etag'), loaded_at)
+
+    def _write_disk_cache(self, cached: CachedConfig) -> None:
+        """
+        Guarda la caché en disco de forma atómica; un error de escritura solo se registra.
+        """
+        path = self.cache_path
+        tmp_path = None
+        
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({'etag': cached.etag, 'params': cached.params}, file)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"No se pudo guardar la caché de parametrización en {path}: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _touch_disk_cache(self) -> None:
+        """
+        Marca la caché en disco como revalidada.
+        """
+        try:
+            os.utime(self.cache_path)
+        except OSError:
+            pass
+
+    def load(self, force: bool = False) -> Any:
+        """
+        Obtiene la parametrización, desde la caché si sigue vigente.
+
+        Args:
+            force (bool, optional): Revalida contra S3 aunque la caché esté vigente. Defaults to False.
+
+        Raises:
+            ClientError: Si se genera un error al obtener el archivo.
+            ValueError: Si se genera un error intentando decodificar el archivo.
+
+        Returns:
+            Any: Parametrización decodificada.
+        """
+        with self._lock:
+            if self._cached is None and self.cache_path:
+                self._cached = self._read_disk_cache()
+            
+            cached = self._cached
+            now = self._clock()
+            
+            if cached is not None and not force and now - cached.loaded_at < self._ttl:
+                return cached.params
+            
+            request = {'Bucket': self._bucket_name, 'Key': self._object_name}
+            if cached is not None and cached.etag:
+                request['IfNoneMatch'] = cached.etag
+            
+            client = self._s3_client or get_s3_client()
+            
+            try:
+                response = client.get_object(**request)
+            except ClientError as e:
+                if cached is not None and _is_not_modified(e):
+                    self._cached = cached._replace(loaded_at=now)
+                    if self.cache_path:
+                        self._touch_disk_cache()
+                    return cached.params
+                
+                logger.error(f"Error al obtener el archivo de parametrización: {e}")
+                raise
+            
+            try:
+                params = json.loads(response['Body'].read().decode('utf-8'))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Error decodificando el archivo parametrización: {e}")
+            
+            self._cached = CachedConfig(params, response.get('ETag'), now)
+            if self.cache_path:
+                self._write_disk_cache(self._cached)
+            
+            return params
+
+    def invalidate(self) -> None:
+        """
+        Descarta la caché en memoria; la siguiente carga revalida contra S3.
+        """
+        with self._lock:
+            self._cached = None
+
+_loaders: Dict[Tuple[str, str], S3ConfigLoader] = {}
+_loaders_lock = threading.Lock()
+
+def from_s3_get_file_cached(bucket_name: str = BUCKET_NAME, object_name: str = OBJECT_NAME) -> Any:
+    """
+    Obtiene el archivo de parametrización desde S3 con caché (ver S3ConfigLoader).
+
+    Misma interfaz y errores que from_s3_get_file; la caché usa CONFIG_CACHE_TTL y
+    CONFIG_CACHE_DIR.
+
+    Args:
+        bucket_name (str, optional): Nombre del bucket S3. Defaults to BUCKET_NAME.
+        object_name (str, optional): Nombre del archivo. Defaults to OBJECT_NAME.
+
+    Raises:
+        ClientError: Si se genera un error al obtener el archivo.
+        ValueError: Si se genera un error intentando decodificar el archivo.
+
+    Returns:
+        Any: Parametrización decodificada.
+    """
+    key = (bucket_name, object_name)
+    
+    with _loaders_lock:
+        loader = _loaders.get(key)
+        if loader is None:
+            loader = _loaders[key] = S3ConfigLoader(bucket_name, object_name)
+    
+    return loader.load()
@@ -0,0 +1,41 @@
+"""utils/services.py"""
+
+from typing import Any, Dict, List
+
+
+def build_service_index(s3_config: Any) -> Dict[str, Dict[str, List[list]]]:
+    """
+    Construye el índice app consumer -> id_service -> paths de la parametrización de servicios.
+
+    Equivale a las consultas '[?id==...].services[].id_service' y
+    '[?id==...][].services[?id_service==...][].paths[]' sobre el archivo completo:
+    los app consumers y servicios duplicados se combinan concatenando sus paths
+    en el orden de la parametrización.
+
+    Args:
+        s3_config (Any): Parametrización de servicios (lista de app consumers).
+
+    Returns:
+        Dict[str, Dict[str, List[list]]]: Paths configurados por app consumer y servicio.
+    """
+    index: Dict[str, Dict[str, List[list]]] = {}
+
+    if not isinstance(s3_config, list):
+        return index
+
+    for app_consumer in s3_config:
+        if not isinstance(app_consumer, dict) or 'id' not in app_consumer:
+            continue
+
+        services = index.setdefault(app_consumer['id'], {})
+
+        for service in app_consumer.get('services') or []:
+            if not isinstance(service, dict) or 'id_service' not in service:
+                continue
+
+            paths = services.setdefault(service['id_service'], [])
+
+            if isinstance(service.get('paths'), list):
+                paths.extend(service['paths'])
+
+    return index
@@ -12,3 +12,6 @@ load_dotenv(dotenv_path=dotenv_path, override=True)
 BUCKET_NAME = os.environ.get('BUCKET_NAME')
 OBJECT_NAME = os.environ.get('OBJECT_NAME')
 QUEUE_URLS = os.environ.get('QUEUE_URLS').split(',') if os.environ.get('QUEUE_URLS') is not None else []
+DEDUPLICATION_KEYS = os.environ.get('DEDUPLICATION_KEYS').split(',') if os.environ.get('DEDUPLICATION_KEYS') else []
+CONFIG_CACHE_TTL = float(os.environ.get('CONFIG_CACHE_TTL', '300'))
+CONFIG_CACHE_DIR = os.environ.get('CONFIG_CACHE_DIR')
@@ -0,0 +1,110 @@
+"""utils/validation.py"""
+
+import json
+import re
+
+from enum import Enum
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, Type, Union
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa json de la librería estándar
+    orjson = None
+
+
+# Mensajes JSON aceptados: texto o bytes UTF-8
+JsonInput = Union[str, bytes, bytearray]
+
+# 19 dígitos seguidos: posible entero fuera de 64 bits, que orjson convertiría a float
+_LONG_NUMBER = re.compile('[0-9]{19}')
+_LONG_NUMBER_BYTES = re.compile(b'[0-9]{19}')
+
+class ValidationMode(str, Enum):
+    """
+    Modos de validación de los eventos JSON (Pub/Sub) de los procesadores.
+    """
+    # Valida el evento completo con el modelo pydantic y usa su model_dump
+    FULL = "full"
+    # Valida solo los campos mínimos que requiere el procesador y usa el evento decodificado
+    MINIMAL = "minimal"
+    # Usa el evento decodificado sin validarlo (eventos de confianza, p. ej. del sink de logging propio)
+    NONE = "none"
+
+def decode_json(message: JsonInput) -> Any:
+    """
+    Decodifica un mensaje JSON con orjson si está instalado, o con json en caso contrario.
+    
+    Los mensajes que orjson rechaza (p. ej. con NaN o Infinity) se decodifican con json.
+    orjson retorna como float los enteros de más de 64 bits, por lo que los mensajes con
+    números de 19 dígitos o más también se decodifican con json y conservan el entero.
+    
+    Args:
+        message (str | bytes): Mensaje JSON.
+    Returns:
+        Any: Mensaje decodificado.
+    Raises:
+        json.JSONDecodeError: Si el mensaje no es un JSON válido (orjson.JSONDecodeError es subclase).
+    """
+    long_number = _LONG_NUMBER if isinstance(message, str) else _LONG_NUMBER_BYTES
+    
+    if orjson is not None and not long_number.search(message):
+        try:
+            return orjson.loads(message)
+        except orjson.JSONDecodeError:
+            pass
+    
+    return json.loads(message)
+
+def validate_json(model: Type[BaseModel], message: JsonInput) -> BaseModel:
+    """
+    Decodifica y valida un mensaje JSON en una sola pasada con model_validate_json (pydantic-core).
+    
+    Args:
+        model (Type[BaseModel]): Modelo pydantic del evento.
+        message (str | bytes): Mensaje JSON.
+    Returns:
+        BaseModel: Instancia validada del modelo.
+    Raises:
+        json.JSONDecodeError: Si el mensaje no es un JSON válido, como con json.loads.
+        ValidationError: Si el mensaje no cumple con el modelo.
+    """
+    try:
+        return model.model_validate_json(message)
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        
+        if errors and errors[0]['type'] == 'json_invalid':
+            document = message if isinstance(message, str) else bytes(message).decode('utf-8', errors='replace')
+            raise json.JSONDecodeError(errors[0]['msg'], document, 0) from e
+        raise
+
+def load_event(
+    message: JsonInput,
+    model: Type[BaseModel],
+    minimal_model: Type[BaseModel],
+    mode: ValidationMode
+) -> Dict[str, Any]:
+    """
+    Decodifica un evento JSON según el modo de validación.
+    
+    Args:
+        message (str | bytes): Mensaje JSON.
+        model (Type[BaseModel]): Modelo completo del evento (modo FULL).
+        minimal_model (Type[BaseModel]): Modelo con los campos mínimos (modo MINIMAL).
+        mode (ValidationMode): Modo de validación.
+    Returns:
+        Dict[str, Any]: model_dump del modelo completo (FULL) o el evento decodificado (MINIMAL, NONE).
+    Raises:
+        json.JSONDecodeError: Si el mensaje no es un JSON válido.
+        ValidationError: Si el mensaje no cumple con el modelo del modo.
+    """
+    if mode == ValidationMode.FULL:
+        return validate_json(model, message).model_dump()
+    
+    event = decode_json(message)
+    
+    if mode == ValidationMode.MINIMAL:
+        minimal_model.model_validate(event)
+    
+    return event
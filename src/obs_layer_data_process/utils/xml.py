@@ -1,24 +1,90 @@
 """utils/xml.py"""
 
+import sys
+import threading
+
 from .log import logger
 
+from collections.abc import Mapping
 from lxml import etree
+from lxml.etree import XMLParser
+from typing import Union
 from xml.etree.ElementTree import ParseError
 
 
-def is_valid_xml(xml_string: str, type_service: str):
+# Tipos de entrada aceptados por el parser: texto o bytes UTF-8 (sin copia intermedia)
+XmlInput = Union[str, bytes, bytearray, memoryview]
+
+# Opciones del parser usado para los mensajes XML
+XML_PARSER_OPTIONS = {'recover': True, 'resolve_entities': False, 'ns_clean': True}
+
+# Tamaño de los bloques con que se alimenta el parser desde un buffer
+FEED_CHUNK_SIZE = 64 * 1024
+
+_ASCII_WHITESPACE = b' \t\n\r\x0b\x0c'
+
+# Máximo de tags distintos en el caché de nombres locales
+LOCAL_NAME_CACHE_SIZE = 4096
+
+_parsers = threading.local()
+
+_local_names = {}
+
+def get_xml_parser(**options) -> XMLParser:
+    """
+    Obtiene el parser lxml del hilo actual para las opciones indicadas.
+    
+    Los parsers de lxml no son seguros entre hilos, por lo que se mantiene una
+    instancia por hilo y por combinación de opciones, en lugar de crear una por mensaje.
+    
+    Args:
+        **options: Opciones de etree.XMLParser. Por defecto XML_PARSER_OPTIONS.
+    Returns:
+        XMLParser: Parser reutilizable del hilo actual.
+    """
+    options = options or XML_PARSER_OPTIONS
+    key = tuple(sorted(options.items()))
+    
+    pool = getattr(_parsers, 'pool', None)
+    if pool is None:
+        pool = _parsers.pool = {}
+    
+    parser = pool.get(key)
+    if parser is None:
+        parser = pool[key] = XMLParser(**options)
+    
+    return parser
+
+def _has_xml_edges(data) -> bool:
+    """Verifica, sin copiar el buffer, que los bytes comiencen con '<' y terminen con '>'."""
+    view = memoryview(data).cast('B')
+    start, end = 0, len(view)
+    
+    while start < end and view[start] in _ASCII_WHITESPACE:
+        start += 1
+    while end > start and view[end - 1] in _ASCII_WHITESPACE:
+        end -= 1
+    
+    return end > start and view[start] == ord('<') and view[end - 1] == ord('>')
+
+def is_valid_xml(xml_string: XmlInput, type_service: str):
     """
     Verifica si un string está correctamente formado como XML.
     
     Args:
-        xml_string (str): El string que se quiere validar como XML.
+        xml_string (str | bytes | memoryview): El string (o los bytes) que se quiere validar como XML.
         type_service (str): Si es request_service o response_service.
     Returns:
         bool: True si el XML es válido, False en caso contrario.
     """
     # Verificar que comience con '<' y termine con '>'
-    xml_string = xml_string.strip()
-    if not (xml_string.startswith('<') and xml_string.endswith('>')):
+    if isinstance(xml_string, (bytes, bytearray, memoryview)):
+        is_valid = _has_xml_edges(xml_string)
+    else:
+        xml_string = xml_string.strip()
+        is_valid = xml_string.startswith('<') and xml_string.endswith('>')
+    
+    if not is_valid:
         logger.info(f"XML {type_service} no es válido.")
         
         return False
@@ -46,52 +112,126 @@ def get_local_name(tag):
     # Sin namespace o prefijo
     return tag_str
 
+def get_interned_local_name(tag) -> str:
+    """
+    Nombre local de un tag o atributo (como get_local_name), internado y cacheado por tag.
+    
+    Los mensajes repiten los mismos tags, por lo que el nombre local se calcula una sola
+    vez; el caché se vacía al superar LOCAL_NAME_CACHE_SIZE para acotar su memoria.
+    """
+    name = _local_names.get(tag)
+    
+    if name is None:
+        if len(_local_names) >= LOCAL_NAME_CACHE_SIZE:
+            _local_names.clear()
+        name = _local_names[tag] = sys.intern(get_local_name(tag))
+    
+    return name
+
 def lxml_element_to_dict(element):
     """
-    Convierte elemento lxml a diccionario recursivamente.
+    Convierte elemento lxml a diccionario.
+    
+    Recorre el árbol con una pila explícita (sin límite de recursión) y agrupa en lista
+    los hijos con el mismo nombre. Cada nivel registra las listas que creó, por lo que
+    no es necesario verificar el tipo del valor existente en cada hijo repetido.
     """
+    lookup = _local_names.get
     result = {}
     
     # Procesar atributos con nombres limpios
-    if element.attrib:
-        for attr_name, attr_value in element.attrib.items():
-            clean_attr_name = get_local_name(attr_name)  # Aplicar limpieza también aquí
-            result[clean_attr_name] = attr_value
+    for attr_name, attr_value in element.items():
+        result[lookup(attr_name) or get_interned_local_name(attr_name)] = attr_value
     
     # Agregar texto del elemento
-    if element.text and element.text.strip():
-        if len(element) == 0:  # Elemento hoja con solo texto
-            return element.text.strip()
-        result['#text'] = element.text.strip()
+    text = element.text
+    if text:
+        text = text.strip()
+        if text:
+            if len(element) == 0:  # Elemento hoja con solo texto
+                return text
+            result['#text'] = text
     
-    # Procesar elementos hijos
-    for child in element:
-        # Obtener nombre local del tag (manejo seguro de prefijos)
-        child_tag = get_local_name(child.tag)
-        child_data = lxml_element_to_dict(child)
+    # Por cada nivel pendiente: (iterador de hijos, diccionario, listas de hijos repetidos)
+    stack = [(iter(element), result, {})]
+    
+    while stack:
+        children, container, lists = stack.pop()
         
-        # Manejar múltiples elementos con el mismo nombre
-        if child_tag in result:
-            if not isinstance(result[child_tag], list):
-                result[child_tag] = [result[child_tag]]
-            result[child_tag].append(child_data)
-        else:
-            result[child_tag] = child_data
+        for child in children:
+            tag = child.tag
+            name = lookup(tag) or get_interned_local_name(tag)
+            
+            value = {}
+            for attr_name, attr_value in child.items():
+                value[lookup(attr_name) or get_interned_local_name(attr_name)] = attr_value
+            
+            size = len(child)
+            text = child.text
+            if text:
+                text = text.strip()
+                if text:
+                    if size:
+                        value['#text'] = text
+                    else:
+                        value = text
+            
+            # Manejar múltiples elementos con el mismo nombre
+            if name in container:
+                group = lists.get(name)
+                if group is None:
+                    group = lists[name] = container[name] = [container[name]]
+                group.append(value)
+            else:
+                container[name] = value
+            
+            # Descender al hijo y retomar este nivel al terminarlo
+            if size and value.__class__ is dict:
+                stack.append((children, container, lists))
+                stack.append((iter(child), value, {}))
+                break
     
     return result
 
-def xml_to_dict_lxml(xml_string: str, type_service: str) -> dict:
+def parse_xml_root(xml_string: XmlInput):
+    """
+    Parsea un XML con lxml tolerando prefijos sin declarar y XML mal formado.
+    
+    Los bytes se parsean directamente; un bytearray o memoryview se entrega al
+    parser por bloques, sin copiar el buffer completo.
+    
+    Args:
+        xml_string (str | bytes | memoryview): XML a parsear; los bytes deben estar en UTF-8
+            (o declarar su codificación).
+    Returns:
+        Elemento raíz del XML.
+    """
+    parser = get_xml_parser()
+    
+    if isinstance(xml_string, str):
+        return etree.fromstring(xml_string.encode('utf-8'), parser)
+    
+    if isinstance(xml_string, bytes):
+        return etree.fromstring(xml_string, parser)
+    
+    view = memoryview(xml_string).cast('B')
+    try:
+        for offset in range(0, len(view), FEED_CHUNK_SIZE):
+            parser.feed(view[offset:offset + FEED_CHUNK_SIZE].tobytes())
+    finally:
+        root = parser.close()
+    
+    return root
+
+def xml_to_dict_lxml(xml_string: XmlInput, type_service: str) -> dict:
     """
     Convierte XML a diccionario usando lxml con tolerancia a prefijos.
+    
+    Acepta el XML como str o directamente como bytes/memoryview UTF-8.
     """
     try:
         if is_valid_xml(xml_string, type_service):
-            parser = etree.XMLParser(
-                        recover=True, 
-                        resolve_entities=False, 
-                        ns_clean=True
-                    )
-            root = etree.fromstring(xml_string.encode('utf-8'), parser)
+            root = parse_xml_root(xml_string)
             
             # Crear diccionario con el elemento raíz (manejo seguro de prefijos)
             root_tag = get_local_name(root.tag)
@@ -99,3 +239,278 @@ def xml_to_dict_lxml(xml_string: str, type_service: str) -> dict:
     except Exception as e:
         logger.error(f"Error al intentar parsear XML: {str(e)}")
         raise
+
+class XmlElementView(Mapping):
+    """
+    Vista de solo lectura, tipo diccionario, de un elemento lxml con hijos.
+    
+    Expone las mismas claves y valores que lxml_element_to_dict (atributos, '#text' e
+    hijos agrupados por nombre local), pero el índice de claves se construye al primer
+    acceso y cada hijo se convierte solo cuando se consulta. Los hijos con elementos
+    propios son a su vez vistas, por lo que una consulta JMESPath solo materializa los
+    niveles que recorre.
+    """
+    __slots__ = ('_element', '_raw', '_values')
+    
+    def __init__(self, element):
+        self._element = element
+        self._raw = None
+        self._values = {}
+    
+    def _index(self) -> dict:
+        """Claves del elemento con sus valores sin convertir (texto, elemento o lista)."""
+        raw = self._raw
+        
+        if raw is None:
+            element = self._element
+            lookup = _local_names.get
+            raw = {}
+            
+            for attr_name, attr_value in element.items():
+                raw[lookup(attr_name) or get_interned_local_name(attr_name)] = attr_value
+            
+            text = element.text
+            if text:
+                text = text.strip()
+                if text:
+                    raw['#text'] = text
+            
+            lists = {}
+            for child in element:
+                tag = child.tag
+                name = lookup(tag) or get_interned_local_name(tag)
+                
+                if name in raw:
+                    group = lists.get(name)
+                    if group is None:
+                        group = lists[name] = raw[name] = [raw[name]]
+                    group.append(child)
+                else:
+                    raw[name] = child
+            
+            self._raw = raw
+        
+        return raw
+    
+    def __getitem__(self, key: str):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        
+        raw = self._index()[key]
+        
+        if raw.__class__ is str:
+            value = raw
+        elif raw.__class__ is list:
+            value = [item if item.__class__ is str else lxml_element_view(item) for item in raw]
+        else:
+            value = lxml_element_view(raw)
+        
+        self._values[key] = value
+        return value
+    
+    def __contains__(self, key) -> bool:
+        return key in self._index()
+    
+    def __iter__(self):
+        return iter(self._index())
+    
+    def __len__(self) -> int:
+        return len(self._index())
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+    
+    def to_dict(self) -> dict:
+        """Convierte el elemento completo a diccionario (equivale a lxml_element_to_dict)."""
+        return lxml_element_to_dict(self._element)
+
+def lxml_element_view(element):
+    """
+    Valor de un elemento lxml con las reglas de lxml_element_to_dict, sin convertir sus hijos.
+    
+    Returns:
+        XmlElementView si el elemento tiene hijos; en caso contrario el texto del elemento
+        o el diccionario de sus atributos.
+    """
+    if len(element):
+        return XmlElementView(element)
+    
+    return lxml_element_to_dict(element)
+
+def materialize(value):
+    """
+    Reemplaza recursivamente las vistas XmlElementView por diccionarios.
+    
+    Args:
+        value: Valor extraído de un evento con mensajes XML perezosos.
+    Returns:
+        El mismo valor con diccionarios y listas nativos.
+    """
+    if isinstance(value, XmlElementView):
+        return value.to_dict()
+    
+    if isinstance(value, list):
+        return [materialize(item) for item in value]
+    
+    if isinstance(value, dict):
+        return {key: materialize(item) for key, item in value.items()}
+    
+    return value
+
+def xml_to_lazy_dict(xml_string: XmlInput, type_service: str) -> dict:
+    """
+    Convierte XML a un diccionario perezoso sobre el árbol lxml.
+    
+    Retorna el mismo contenido que xml_to_dict_lxml, pero los elementos con hijos
+    son vistas XmlElementView que se convierten solo al consultarse.
+    """
+    try:
+        if is_valid_xml(xml_string, type_service):
+            root = parse_xml_root(xml_string)
+            
+            return {get_local_name(root.tag): lxml_element_view(root)}
+    except Exception as e:
+        logger.error(f"Error al intentar parsear XML: {str(e)}")
+        raise
+
+class _BufferReader:
+    """Lector tipo archivo sobre un buffer, para iterparse sin copiar el buffer completo."""
+    
+    def __init__(self, data):
+        self._view = memoryview(data).cast('B')
+        self._offset = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._offset + size
+        chunk = self._view[self._offset:end].tobytes()
+        self._offset += len(chunk)
+        return chunk
+
+def iterparse_xml(xml_string: XmlInput, events=('start', 'end', 'comment', 'pi')):
+    """
+    Recorre un XML en streaming con lxml, con las mismas opciones de parser que parse_xml_root
+    (iterparse no soporta ns_clean, que solo depura declaraciones de namespace).
+    
+    Args:
+        xml_string (str | bytes | memoryview): XML a recorrer.
+        events: Eventos de iterparse a reportar.
+    Returns:
+        Iterador de tuplas (evento, elemento).
+    """
+    source = xml_string.encode('utf-8') if isinstance(xml_string, str) else xml_string
+    
+    return etree.iterparse(
+                _BufferReader(source),
+                events=events,
+                recover=True,
+                resolve_entities=False
+            )
+
+def is_malformed(context) -> bool:
+    """
+    Indica si iterparse reportó errores de sintaxis (los prefijos sin declarar se toleran).
+    """
+    return any(error.domain_name != 'NAMESPACE' for error in context.error_log)
+
+def _release(element) -> None:
+    """Libera un elemento ya consumido y los hermanos anteriores que siguen en el árbol."""
+    element.clear(keep_tail=False)
+    parent = element.getparent()
+    
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+def xml_to_dict_iterparse(xml_string: XmlInput, type_service: str) -> dict:
+    """
+    Convierte XML a diccionario en streaming con iterparse.
+    
+    Retorna el mismo diccionario que xml_to_dict_lxml, pero cada elemento se convierte
+    al cerrarse y se libera del árbol, por lo que el árbol completo y su copia en
+    diccionario no coexisten en memoria. Un XML mal formado se convierte con
+    xml_to_dict_lxml, cuya recuperación de errores difiere de la de iterparse.
+    """
+    try:
+        if not is_valid_xml(xml_string, type_service):
+            return None
+        
+        # Por cada elemento abierto: [elemento, diccionario de hijos, número de hijos]
+        stack = []
+        root_tag, root_value = None, None
+        context = iterparse_xml(xml_string)
+        
+        try:
+            for event, element in context:
+                if event == 'start':
+                    stack.append([element, {}, 0])
+                    continue
+                
+                if event == 'end':
+                    _, children, count = stack.pop()
+                    value = _element_value(element, children, count)
+                    tag = get_interned_local_name(element.tag)
+                    _release(element)
+                elif stack:
+                    # Comentarios e instrucciones de procesamiento dentro de un elemento
+                    value = lxml_element_to_dict(element)
+                    tag = get_interned_local_name(element.tag)
+                else:
+                    continue
+                
+                if not stack:
+                    root_tag, root_value = tag, value
+                    continue
+                
+                frame = stack[-1]
+                frame[2] += 1
+                _add_child(frame[1], tag, value)
+        except etree.XMLSyntaxError:
+            root_tag = None
+        
+        if root_tag is None or is_malformed(context):
+            return xml_to_dict_lxml(xml_string, type_service)
+        
+        return {root_tag: root_value}
+    except Exception as e:
+        logger.error(f"Error al intentar parsear XML: {str(e)}")
+        raise
+
+def _add_child(children: dict, tag: str, value) -> None:
+    """Agrega un hijo agrupando en lista los elementos con el mismo nombre."""
+    if tag in children:
+        if not isinstance(children[tag], list):
+            children[tag] = [children[tag]]
+        children[tag].append(value)
+    else:
+        children[tag] = value
+
+def _element_value(element, children: dict, count: int):
+    """
+    Valor de un elemento ya cerrado a partir de sus hijos convertidos,
+    con las mismas reglas que lxml_element_to_dict.
+    """
+    result = {}
+    
+    if element.attrib:
+        for attr_name, attr_value in element.attrib.items():
+            result[get_interned_local_name(attr_name)] = attr_value
+    
+    if element.text and element.text.strip():
+        if count == 0:
+            return element.text.strip()
+        result['#text'] = element.text.strip()
+    
+    for tag, value in children.items():
+        if tag in result:
+            if not isinstance(result[tag], list):
+                result[tag] = [result[tag]]
+            if isinstance(value, list):
+                result[tag].extend(value)
+            else:
+                result[tag].append(value)
+        else:
+            result[tag] = value
+    
+    return result
@@ -1,12 +1,23 @@
 """tests/test_boto3_funcst.py"""
 
+import asyncio
 import json
+import threading
 import unittest
 
 from unittest.mock import patch, MagicMock
 from botocore.exceptions import ClientError
 
-from src.obs_layer_data_process.utils.boto3_funcs import from_s3_get_file, send_message_to_sqs
+from src.obs_layer_data_process.utils.message import build_deduplication_id, generate_deduplication_id
+from src.obs_layer_data_process.utils.boto3_funcs import (
+    from_s3_get_file, send_message_to_sqs, send_messages_to_sqs_batch, SQS_BATCH_MAX_BYTES,
+    create_sqs_client, send_message_to_sqs_async, AsyncSqsPublisher
+)
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
 
 
 class TestBoto3Functions(unittest.TestCase):
@@ -80,6 +91,27 @@ class TestBoto3Functions(unittest.TestCase):
         self.assertEqual(result['queue_url'], queue_url)
         self.assertEqual(result['message_group_id'], "test-session-id")
     
+    def test_send_message_to_sqs_deduplication_id(self):
+        mock_sqs_client = MagicMock()
+        mock_sqs_client.send_message.return_value = {'MessageId': 'test-message-id'}
+        mensaje = {"jsonPayload.dataObject.consumer.appConsumer.sessionId": "s1", "valor": 1}
+        
+        send_message_to_sqs(mock_sqs_client, mensaje, "queue")
+        kwargs = mock_sqs_client.send_message.call_args.kwargs
+        
+        # El cuerpo se serializa una vez y se reutiliza para el token de deduplicación
+        self.assertEqual(json.loads(kwargs['MessageBody']), mensaje)
+        self.assertEqual(kwargs['MessageDeduplicationId'], build_deduplication_id(kwargs['MessageBody']))
+        
+        # Con llaves de deduplicación el token solo depende de sus valores
+        send_message_to_sqs(mock_sqs_client, mensaje, "queue", deduplication_keys=["valor"])
+        self.assertEqual(mock_sqs_client.send_message.call_args.kwargs['MessageDeduplicationId'],
+                         generate_deduplication_id(mensaje, ["valor"]))
+        
+        result = send_message_to_sqs(mock_sqs_client, mensaje, "queue", deduplication_keys=["otro"])
+        self.assertEqual(result['status'], 'error')
+        self.assertTrue("Error de validacón" in result['error'])
+    
     @patch('src.obs_layer_data_process.utils.message.get_group_id')
     def test_send_message_to_sqs_value_error(self, mock_group_id):
         mock_sqs_client = MagicMock()
@@ -111,6 +143,242 @@ class TestBoto3Functions(unittest.TestCase):
         
         self.assertEqual(result['status'], 'error')
         self.assertTrue("Error forzado" in result['error'])
+    
+    def test_send_message_to_sqs_invalid_characters(self):
+        # Como botocore, el cliente codifica el cuerpo en UTF-8 antes de enviarlo
+        def send_message(**kwargs):
+            kwargs['MessageBody'].encode('utf-8')
+            return {'MessageId': 'id'}
+        
+        def send_message_batch(QueueUrl, Entries):
+            for entry in Entries:
+                entry['MessageBody'].encode('utf-8')
+            return {'Successful': [{'Id': entry['Id'], 'MessageId': 'id'} for entry in Entries], 'Failed': []}
+        
+        client = MagicMock()
+        client.send_message.side_effect = send_message
+        client.send_message_batch.side_effect = send_message_batch
+        mensaje = {"jsonPayload.dataObject.consumer.appConsumer.sessionId": "s1", "a": "abc\ud83d", "b": "\uffff"}
+        
+        self.assertEqual(send_message_to_sqs(client, mensaje, "queue")['status'], 'success')
+        self.assertEqual(send_messages_to_sqs_batch(client, [mensaje], "queue")[0]['status'], 'success')
+        self.assertEqual(json.loads(client.send_message.call_args.kwargs['MessageBody']), mensaje)
+
+    
+    def _batch_client(self, fail=None):
+        # Cliente que falla las entradas indicadas en fail ({id_mensaje: [SenderFault, ...]})
+        fail = {key: list(value) for key, value in (fail or {}).items()}
+        sent = []
+        
+        def send_message_batch(QueueUrl, Entries):
+            sent.append([json.loads(entry['MessageBody'])['id'] for entry in Entries])
+            response = {'Successful': [], 'Failed': []}
+            for entry in Entries:
+                message_id = json.loads(entry['MessageBody'])['id']
+                if fail.get(message_id):
+                    response['Failed'].append({'Id': entry['Id'], 'SenderFault': fail[message_id].pop(0), 'Code': 'Error'})
+                else:
+                    response['Successful'].append({'Id': entry['Id'], 'MessageId': f"msg-{message_id}"})
+            return response
+        
+        client = MagicMock()
+        client.send_message_batch.side_effect = send_message_batch
+        return client, sent
+    
+    def _message(self, message_id, session_id="s1"):
+        return {"id": message_id, "jsonPayload.dataObject.consumer.appConsumer.sessionId": session_id}
+    
+    def test_send_messages_to_sqs_batch(self):
+        client, sent = self._batch_client()
+        messages = [self._message(i, "s1") for i in range(25)]
+        
+        results = send_messages_to_sqs_batch(client, messages, "https://sqs/queue.fifo")
+        
+        # Los mensajes de una misma sesión comparten lote
+        self.assertEqual(sent, [list(range(10)), list(range(10, 20)), list(range(20, 25))])
+        self.assertEqual([r['message_id'] for r in results], [f"msg-{i}" for i in range(25)])
+        self.assertEqual(results[3], {
+            'status': 'success', 'queue_url': "https://sqs/queue.fifo", 'message_id': "msg-3", 'message_group_id': "s1"
+        })
+    
+    def test_send_messages_to_sqs_batch_size_limit(self):
+        client, sent = self._batch_client()
+        padding = "x" * (SQS_BATCH_MAX_BYTES // 3)
+        messages = [dict(self._message(i, f"s{i}"), padding=padding) for i in range(4)]
+        messages.append(dict(self._message(4, "s4"), padding=padding * 4))
+        
+        results = send_messages_to_sqs_batch(client, messages, "queue")
+        
+        # Como máximo 256 KB por lote; un mensaje más grande no se envía
+        self.assertEqual(sent, [[0, 1], [2, 3]])
+        self.assertEqual(results[4]['status'], 'error')
+    
+    def test_send_messages_to_sqs_batch_fifo_order(self):
+        # Como en SQS FIFO, las entradas del grupo posteriores a una fallida también fallan
+        client, sent = self._batch_client(fail={0: [False], 2: [False], 3: [False]})
+        messages = [self._message(0, "a"), self._message(1, "b"), self._message(2, "a"), self._message(3, "a")]
+        
+        results = send_messages_to_sqs_batch(client, messages, "https://sqs/queue.fifo", max_retries=1, retry_delay=0)
+        
+        # El grupo se reenvía desde la entrada fallida, en orden
+        self.assertEqual(sent, [[0, 1, 2, 3], [0, 2, 3]])
+        self.assertTrue(all(r['status'] == 'success' for r in results))
+    
+    def test_send_messages_to_sqs_batch_fifo_size_limit(self):
+        client, sent = self._batch_client()
+        padding = "x" * (SQS_BATCH_MAX_BYTES // 3)
+        messages = [dict(self._message(i, "a" if i != 1 else "b"), padding=padding if i != 1 else "") for i in range(5)]
+        
+        send_messages_to_sqs_batch(client, messages, "https://sqs/queue.fifo")
+        
+        # Un mensaje que no cabe no deja pasar a los siguientes de su grupo
+        self.assertEqual(sent, [[0, 1, 2], [3, 4]])
+    
+    def test_send_messages_to_sqs_batch_throttling(self):
+        client, sent = self._batch_client()
+        send_message_batch = client.send_message_batch.side_effect
+        throttling = ClientError({'Error': {'Code': 'Throttling', 'Message': 'Rate exceeded'}}, 'SendMessageBatch')
+        errors = [throttling]
+        
+        def throttled(**kwargs):
+            if errors:
+                raise errors.pop()
+            return send_message_batch(**kwargs)
+        
+        client.send_message_batch.side_effect = throttled
+        messages = [self._message(i, "a") for i in range(3)]
+        
+        results = send_messages_to_sqs_batch(client, messages, "https://sqs/queue.fifo", retry_delay=0)
+        
+        # El lote rechazado por throttling se reintenta completo
+        self.assertEqual(client.send_message_batch.call_count, 2)
+        self.assertEqual([r['status'] for r in results], ['success'] * 3)
+    
+    def test_send_messages_to_sqs_batch_fifo_blocked_group(self):
+        client, sent = self._batch_client(fail={0: [True]})
+        messages = [self._message(i, "a") for i in range(12)] + [self._message(12, "b")]
+        
+        results = send_messages_to_sqs_batch(client, messages, "https://sqs/queue.fifo", retry_delay=0)
+        
+        # Después de un error definitivo los mensajes pendientes del grupo no se envían
+        self.assertEqual(sent, [list(range(10)), [12]])
+        self.assertEqual(results[0]['status'], 'error')
+        self.assertEqual([r['status'] for r in results[10:12]], ['error', 'error'])
+        self.assertTrue("grupo 'a'" in results[10]['error'])
+        self.assertEqual(results[12]['status'], 'success')
+        
+        # En colas estándar el error no afecta a los demás mensajes
+        client, sent = self._batch_client(fail={0: [True]})
+        results = send_messages_to_sqs_batch(client, messages, "https://sqs/queue", retry_delay=0)
+        self.assertEqual([r['status'] for r in results], ['error'] + ['success'] * 12)
+    
+    def test_send_messages_to_sqs_batch_retries(self):
+        client, sent = self._batch_client(fail={1: [False, False], 2: [True], 3: [False] * 4})
+        messages = [self._message(i, f"s{i}") for i in range(4)]
+        
+        results = send_messages_to_sqs_batch(client, messages, "queue", max_retries=3, retry_delay=0)
+        
+        # Solo se reintentan las entradas fallidas que no son SenderFault
+        self.assertEqual(sent, [[0, 1, 2, 3], [1, 3], [1, 3], [3]])
+        self.assertEqual([r['status'] for r in results], ['success', 'success', 'error', 'error'])
+        self.assertEqual(set(results[2]), {'status', 'queue_url', 'error'})
+    
+    def test_send_messages_to_sqs_batch_errors(self):
+        client = MagicMock()
+        client.send_message_batch.side_effect = ClientError({'Error': {'Code': 'AccessDenied', 'Message': 'Error forzado'}}, 'SendMessageBatch')
+        
+        results = send_messages_to_sqs_batch(client, [self._message(0), self._message(1, " ")], "queue")
+        
+        self.assertTrue("Error forzado" in results[0]['error'])
+        self.assertEqual(results[1]['status'], 'error')
+
+
+
+class TestAsyncSqsPublisher(unittest.IsolatedAsyncioTestCase):
+    
+    def _message(self, session_id):
+        return {"jsonPayload.dataObject.consumer.appConsumer.sessionId": session_id}
+    
+    async def test_send_message_to_sqs_async(self):
+        client = MagicMock()
+        client.send_message.return_value = {'MessageId': 'test-message-id'}
+        
+        result = await send_message_to_sqs_async(client, self._message("s1"), "queue")
+        
+        self.assertEqual(result, {'status': 'success', 'queue_url': "queue", 'message_id': 'test-message-id', 'message_group_id': "s1"})
+    
+    async def test_send_many_deduplication_keys(self):
+        client = MagicMock()
+        client.send_message.return_value = {'MessageId': 'id'}
+        messages = [dict(self._message("s1"), valor=1, extra=i) for i in range(2)]
+        
+        async with AsyncSqsPublisher(client, max_in_flight=2) as publisher:
+            await publisher.send_many(messages, "queue", deduplication_keys=["valor"])
+        
+        expected = generate_deduplication_id(messages[0], ["valor"])
+        self.assertEqual(
+            [call.kwargs['MessageDeduplicationId'] for call in client.send_message.call_args_list],
+            [expected, expected]
+        )
+    
+    async def test_exit_does_not_block_event_loop(self):
+        release = threading.Event()
+        publisher = AsyncSqsPublisher(MagicMock(), max_in_flight=1)
+        # El hilo solo termina a tiempo si el event loop sigue activo mientras se cierra el pool
+        pending = asyncio.get_running_loop().run_in_executor(publisher._executor, release.wait, 2)
+        
+        exit_task = asyncio.create_task(publisher.__aexit__(None, None, None))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.wait_for(exit_task, timeout=5)
+        
+        self.assertTrue(await pending)
+    
+    async def test_send_many_keeps_messages_in_flight(self):
+        # Los envíos solo terminan si los cinco están en curso al mismo tiempo
+        barrier = threading.Barrier(5, timeout=5)
+        
+        def send_message(**kwargs):
+            barrier.wait()
+            return {'MessageId': kwargs['MessageGroupId']}
+        
+        client = MagicMock()
+        client.send_message.side_effect = send_message
+        
+        async with AsyncSqsPublisher(client, max_in_flight=5) as publisher:
+            results = await publisher.send_many([self._message(f"s{i}") for i in range(5)], "queue")
+        
+        self.assertEqual([r['message_id'] for r in results], [f"s{i}" for i in range(5)])
+    
+    async def test_send_many_errors(self):
+        client = MagicMock()
+        client.send_message.return_value = {'MessageId': 'id'}
+        
+        async with AsyncSqsPublisher(client, max_in_flight=2) as publisher:
+            results = await publisher.send_many([self._message("s1"), {}], "queue")
+            
+            # send propaga los errores inesperados igual que send_message_to_sqs
+            with self.assertRaises(AttributeError):
+                await publisher.send({}, "queue")
+        
+        self.assertEqual(results[0]['status'], 'success')
+        self.assertEqual(results[1]['status'], 'error')
+    
+    @unittest.skipIf(mock_aws is None, "moto no está instalado")
+    async def test_send_many_moto(self):
+        with mock_aws():
+            client = create_sqs_client(max_pool_connections=20, region_name="us-east-1")
+            queue_url = client.create_queue(
+                QueueName="test.fifo", Attributes={"FifoQueue": "true"}
+            )["QueueUrl"]
+            
+            async with AsyncSqsPublisher(client, max_in_flight=20) as publisher:
+                results = await publisher.send_many([self._message(f"s{i}") for i in range(30)], queue_url)
+            
+            attributes = client.get_queue_attributes(QueueUrl=queue_url, AttributeNames=["ApproximateNumberOfMessages"])
+        
+        self.assertTrue(all(r['status'] == 'success' for r in results))
+        self.assertEqual(attributes["Attributes"]["ApproximateNumberOfMessages"], "30")
 
 
 if __name__ == '__main__':
@@ -5,7 +5,9 @@ import unittest
 from abc import ABC, abstractmethod
 
 from src.obs_layer_data_process.core.interfaces.data_store import DataStore
-from src.obs_layer_data_process.core.interfaces.message_processor import MessageProcessor
+from src.obs_layer_data_process.core.interfaces.message_processor import (
+    MessageProcessor, MessageContext, ProcessingResult, BatchItemResult
+)
 
 
 class TestInterfaces(unittest.TestCase):
@@ -30,6 +32,8 @@ class TestInterfaces(unittest.TestCase):
         # Verificar que tiene los métodos abstractos requeridos
         self.assertTrue(hasattr(MessageProcessor, 'process') and callable(getattr(MessageProcessor, 'process')))
         self.assertTrue(hasattr(MessageProcessor, 'extract') and callable(getattr(MessageProcessor, 'extract')))
+        self.assertIn('process_and_extract', MessageProcessor.__abstractmethods__)
+        self.assertIn('extract_batch', MessageProcessor.__abstractmethods__)
         
         # Verificar que no se puede instanciar directamente
         with self.assertRaises(TypeError):
@@ -64,6 +68,16 @@ class TestInterfaces(unittest.TestCase):
             
             def extract(self, data=None):
                 return {"extracted": data or "default"}
+            
+            def process_and_extract(self, message):
+                context = MessageContext(message, {})
+                return ProcessingResult(context, self.extract(self.process(message)))
+            
+            def extract_batch(self, contexts):
+                return [
+                    BatchItemResult(index, ProcessingResult(context, self.extract(self.process(context.event_data))))
+                    for index, context in enumerate(contexts)
+                ]
         
         # Verificar que se puede instanciar
         processor = ConcreteProcessor()
@@ -73,3 +87,51 @@ class TestInterfaces(unittest.TestCase):
         self.assertEqual(processor.process("test"), {"processed": "test"})
         self.assertEqual(processor.extract(), {"extracted": "default"})
         self.assertEqual(processor.extract("data"), {"extracted": "data"})
+        
+        self.assertEqual(processor.process_and_extract("test").data, {"extracted": {"processed": "test"}})
+        
+        self.assertEqual(processor.extract_batch([MessageContext("test", {})])[0].result.data,
+                         {"extracted": {"processed": "test"}})
+        
+        # process_and_extract y extract_batch son obligatorios para los procesadores
+        class PartialProcessor(MessageProcessor):
+            def process(self, message):
+                return message
+            
+            def extract(self, data=None):
+                return data
+        
+        with self.assertRaises(TypeError):
+            PartialProcessor()
+    
+    def test_default_process_batch(self):
+        class ConcreteProcessor(MessageProcessor):
+            def process(self, message):
+                return {"processed": message}
+            
+            def extract(self, data=None):
+                return data
+            
+            def process_and_extract(self, message):
+                if message is None:
+                    raise ValueError("mensaje vacío")
+                return ProcessingResult(MessageContext(message, {}), message.upper())
+            
+            def extract_batch(self, contexts):
+                return []
+        
+        results = ConcreteProcessor().process_batch(["a", None, "b"])
+        
+        # Un mensaje con error no interrumpe el lote
+        self.assertEqual([item.index for item in results], [0, 1, 2])
+        self.assertEqual([item.result.data for item in (results[0], results[2])], ["A", "B"])
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertIsNone(results[1].result)
+        self.assertEqual(BatchItemResult(0).error, None)
+    
+    def test_processing_result_is_immutable(self):
+        result = ProcessingResult(MessageContext({"event": 1}, {"id": "1"}), {"data": 1})
+        
+        self.assertEqual(result.context.event_data, {"event": 1})
+        with self.assertRaises(AttributeError):
+            result.data = {}
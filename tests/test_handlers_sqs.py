@@ -0,0 +1,132 @@
+"""tests/test_handlers_sqs.py"""
+
+import json
+import unittest
+
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+
+from src.obs_layer_data_process.handlers.sqs import SqsBatchHandler, is_poison_error
+from src.obs_layer_data_process.processors.mbaas.utils.exceptions import ServiceNotFoundError
+from src.obs_layer_data_process.processors.stratus.utils.exceptions import MessageLengthError, NoS3FileLoadedError
+from src.obs_layer_data_process.utils import s3_config
+
+
+def build_event(*bodies, group_ids=None) -> dict:
+    records = []
+    
+    for i, body in enumerate(bodies):
+        record = {"messageId": f"m{i}", "body": body, "attributes": {}}
+        if group_ids:
+            record["attributes"]["MessageGroupId"] = group_ids[i]
+        records.append(record)
+    
+    return {"Records": records}
+
+
+class TestSqsBatchHandler(unittest.TestCase):
+    
+    def setUp(self):
+        self.s3_config = [{"type": "ACF", "fields": {"CodigoCanal": "true"}}]
+        self.frame = "".join(chr(65 + i % 26) for i in range(940))
+    
+    def test_is_poison_error(self):
+        self.assertTrue(is_poison_error(MessageLengthError("corto")))
+        self.assertTrue(is_poison_error(ServiceNotFoundError("s", "a", "1")))
+        self.assertTrue(is_poison_error(json.JSONDecodeError("msg", "{", 0)))
+        self.assertFalse(is_poison_error(ClientError({"Error": {"Code": "Throttling"}}, "SendMessage")))
+        self.assertFalse(is_poison_error(RuntimeError("timeout")))
+        
+        # Los errores de parametrización o del entorno se reintentan
+        self.assertFalse(is_poison_error(NoS3FileLoadedError()))
+        self.assertFalse(is_poison_error(NotImplementedError()))
+    
+    def test_config_errors_fail_the_invocation(self):
+        config_loader = MagicMock(side_effect=[[], RuntimeError("S3 no disponible"), self.s3_config])
+        handler = SqsBatchHandler("stratus", config_loader=config_loader)
+        
+        # La invocación falla antes de procesar los mensajes y la carga se reintenta en la siguiente
+        with self.assertRaises(ValueError):
+            handler(build_event(self.frame))
+        with self.assertRaises(RuntimeError):
+            handler(build_event(self.frame))
+        self.assertEqual(handler(build_event(self.frame)), {"batchItemFailures": []})
+        self.assertEqual(config_loader.call_count, 3)
+    
+    def test_only_retryable_records_are_reported(self):
+        on_result = MagicMock(side_effect=[None, RuntimeError("timeout")])
+        handler = SqsBatchHandler("stratus", s3_config=self.s3_config, on_result=on_result)
+        
+        response = handler(build_event(self.frame, "corto", self.frame), None)
+        
+        # El mensaje con longitud inválida se descarta; solo se reintenta el error de publicación
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "m2"}]})
+        self.assertEqual(on_result.call_count, 2)
+        record, result = on_result.call_args_list[0].args
+        self.assertEqual(record["messageId"], "m0")
+        self.assertEqual(list(result.data), ["CodigoCanal"])
+    
+    def test_fifo_group_is_blocked_after_retryable_error(self):
+        on_result = MagicMock(side_effect=[RuntimeError("timeout"), None])
+        handler = SqsBatchHandler("stratus", s3_config=self.s3_config, on_result=on_result)
+        
+        response = handler(build_event(self.frame, self.frame, self.frame, group_ids=["g1", "g2", "g1"]))
+        
+        # El tercer registro pertenece al grupo bloqueado y no se publica
+        self.assertEqual(response["batchItemFailures"], [{"itemIdentifier": "m0"}, {"itemIdentifier": "m2"}])
+        self.assertEqual(on_result.call_count, 2)
+    
+    def test_processor_is_rebuilt_when_config_changes(self):
+        new_config = [{"type": "ACF", "fields": {"CodigoCanal": "true", "CodigoRespuesta": "true"}}]
+        config_loader = MagicMock(side_effect=[self.s3_config, self.s3_config, new_config, RuntimeError("S3 no disponible")])
+        handler = SqsBatchHandler("stratus", config_loader=config_loader, projection=True)
+        
+        # La misma parametrización (304 o dentro del TTL) reutiliza el procesador
+        processor = handler.processor
+        handler(build_event(self.frame))
+        self.assertIs(handler._processor, processor)
+        
+        # Otra parametrización (200 con un ETag nuevo) recrea el procesador
+        handler(build_event(self.frame))
+        self.assertIsNot(handler._processor, processor)
+        self.assertIs(handler._s3_config, new_config)
+        self.assertTrue(handler._processor._projection)
+        
+        # Si la recarga falla se sigue usando el procesador vigente
+        rebuilt = handler._processor
+        self.assertEqual(handler(build_event(self.frame)), {"batchItemFailures": []})
+        self.assertIs(handler._processor, rebuilt)
+        self.assertEqual(config_loader.call_count, 4)
+    
+    def test_static_config(self):
+        config_loader = MagicMock()
+        handler = SqsBatchHandler("stratus", s3_config=self.s3_config, config_loader=config_loader)
+        
+        self.assertIs(handler.processor, handler.processor)
+        config_loader.assert_not_called()
+    
+    def test_default_config_loader_is_cached(self):
+        body = MagicMock()
+        body.read.return_value = json.dumps(self.s3_config).encode('utf-8')
+        client = MagicMock()
+        client.get_object.return_value = {"Body": body, "ETag": '"v1"'}
+        
+        with patch.object(s3_config, '_loaders', {}), patch.object(s3_config, 'get_s3_client', return_value=client):
+            handler = SqsBatchHandler("stratus")
+            handler(build_event(self.frame))
+            processor = handler._processor
+            handler(build_event(self.frame))
+        
+        # La parametrización se obtiene con S3ConfigLoader: una sola descarga dentro del TTL
+        # y el procesador se reutiliza
+        client.get_object.assert_called_once()
+        self.assertIs(handler._processor, processor)
+    
+    def test_empty_event(self):
+        handler = SqsBatchHandler("stratus", s3_config=self.s3_config)
+        
+        self.assertEqual(handler({}), {"batchItemFailures": []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,15 +4,35 @@ import json
 import unittest
 import xml.parsers.expat
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 from pydantic import ValidationError
 from xml.etree.ElementTree import ParseError
 
+from src.obs_layer_data_process.processors.mbaas.config import XmlMode
 from src.obs_layer_data_process.processors.mbaas.processor import MbaasProcessor
 from src.obs_layer_data_process.processors.mbaas.utils.exceptions import (
     NoMinimumDataError, InvalidEventDataError, AppConsumerNotFoundError,
     ServiceNotFoundError, NoVariablesConfiguredError
 )
+from src.obs_layer_data_process.utils.validation import ValidationMode
+from src.obs_layer_data_process.utils.xml import XmlElementView
+
+
+def build_message(request_service: str, response_service: str) -> str:
+    return json.dumps({
+        "logName": "log", "resource": {"type": "global", "labels": {"project_id": "p"}},
+        "jsonPayload": {
+            "msm": "msm",
+            "dataObject": {
+                "documento": {"tipo": "CC", "numero": "123"},
+                "messages": {"requestService": request_service, "responseService": response_service, "idService": "service_1"},
+                "operation": {"operationDate": "2024-01-01", "statusResponse": {"status": "OK"}, "type": "t"},
+                "consumer": {"deviceConsumer": {}, "appConsumer": {"id": "app_id_1", "sessionId": "session_1", "canalId": "1"}}
+            }
+        },
+        "receiveTimestamp": "t", "insertId": "i", "timestamp": "t"
+    })
 
 
 class TestMbaasProcessor(unittest.TestCase):
@@ -88,8 +108,7 @@ class TestMbaasProcessor(unittest.TestCase):
             self.processor._extract_xml_messages({"test": "data"})
     
     @patch('src.obs_layer_data_process.processors.mbaas.processor.EventEntry')
-    @patch('json.loads')
-    def test_process_success(self, mock_loads, mock_event_entry):
+    def test_process_success(self, mock_event_entry):
         # Crear mock para pydantic modelo
         mock_event = MagicMock()
         mock_event.model_dump.return_value = {
@@ -102,8 +121,7 @@ class TestMbaasProcessor(unittest.TestCase):
                 }
             }
         }
-        mock_event_entry.return_value = mock_event
-        mock_loads.return_value = {"test": "data"}
+        mock_event_entry.model_validate_json.return_value = mock_event
         
         # Mock métodos internos
         with patch.object(MbaasProcessor, '_validate_and_extract_fields') as mock_validate, \
@@ -123,14 +141,14 @@ class TestMbaasProcessor(unittest.TestCase):
             self.assertEqual(result["jsonPayload"]["dataObject"]["messages"]["responseService"], {"response": "test"})
             mock_validate.assert_called_once()
             mock_extract_xml.assert_called_once()
+            # El mensaje se decodifica y valida en una sola pasada
+            mock_event_entry.model_validate_json.assert_called_once_with('{"test": "data"}')
     
     def test_process_validation_error(self):
         # Mock para simular ValidationError
-        with patch('json.loads') as mock_loads, \
-             patch('src.obs_layer_data_process.processors.mbaas.processor.EventEntry') as mock_entry:
+        with patch('src.obs_layer_data_process.processors.mbaas.processor.EventEntry') as mock_entry:
             
-            mock_loads.return_value = {"test": "data"}
-            mock_entry.side_effect = ValidationError.from_exception_data("error", [])
+            mock_entry.model_validate_json.side_effect = ValidationError.from_exception_data("error", [])
             
             # Verificar excepción
             with self.assertRaises(ValidationError):
@@ -167,21 +185,9 @@ class TestMbaasProcessor(unittest.TestCase):
                 # with self.assertRaises(xml.parsers.expat.ExpatError):
                 #    self.processor.process('{"test": "data"}')
     
-    @patch('src.obs_layer_data_process.processors.mbaas.utils.jmespath.extract_from_message_selected_fields')
-    @patch('jmespath.search')
-    def test_extract_success(self, mock_search, mock_extract):
-        # Configurar mocks
-        def mock_search_side_effect(query, data):
-            if '[*].id' in query:
-                return ["app_id_1"]
-            elif 'services[].id_service' in query:
-                return ["service_1"]
-            elif 'paths[]' in query:
-                return [["path1", "true"]]
-            return None
-        
-        mock_search.side_effect = mock_search_side_effect
-        mock_extract.return_value = [("path1", "value1")]
+    def test_extract_success(self):
+        self.s3_config[0]["services"][0]["paths"] = [["path1", "true"]]
+        self.processor = MbaasProcessor(self.s3_config)
         
         # Establecer datos
         self.processor._event_data = {"test": "data"}
@@ -196,6 +202,177 @@ class TestMbaasProcessor(unittest.TestCase):
         self.assertEqual(result, {"path1": None})
         # mock_extract.assert_called_once()
     
+    def test_extract_reuses_compiled_plan(self):
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "service_1", "paths": [["a.b", "true"]]}]}]
+        processor = MbaasProcessor(s3_config)
+        processor._app_consumer_id = "app_id_1"
+        processor._id_service = "service_1"
+        processor._session_id = "session_1"
+        
+        self.assertEqual(processor.extract({"a": {"b": 1}}), {"a.b": 1})
+        plan = processor._plans["app_id_1"]["service_1"]
+        
+        self.assertEqual(processor.extract({"a": [{"b": 2}]}), {"a.b": 2})
+        self.assertIs(processor._plans["app_id_1"]["service_1"], plan)
+    
+    def test_targeted_xml_mode(self):
+        prefix = "jsonPayload.dataObject.messages."
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "service_1", "paths": [
+            [prefix + "requestService.Envelope.Body.Consulta.numero", "true"],
+            [prefix + "responseService.Envelope.Body.Respuesta.Cliente.nombre", "true"],
+            [prefix + "responseService.Envelope.Body.Respuesta.codigo", "true"],
+            ["jsonPayload.dataObject.consumer.appConsumer.sessionId", "true"]
+        ]}]}]
+        message = build_message(
+            '<soapenv:Envelope><soapenv:Body><Consulta><numero>123</numero></Consulta></soapenv:Body></soapenv:Envelope>',
+            '<Envelope><Body><Respuesta codigo="00"><Cliente><nombre>Ana</nombre></Cliente>'
+            '<Movimientos><Mov>1</Mov><Mov>2</Mov></Movimientos></Respuesta></Body></Envelope>'
+        )
+        
+        full_processor = MbaasProcessor(s3_config)
+        full_processor.process(message)
+        
+        for xml_mode in (XmlMode.TARGETED, XmlMode.STREAMING):
+            targeted_processor = MbaasProcessor(s3_config, xml_mode=xml_mode)
+            event = targeted_processor.process(message)
+            
+            # Solo se convierten los elementos de los paths configurados
+            self.assertEqual(event["jsonPayload"]["dataObject"]["messages"]["responseService"],
+                             {"Envelope": {"Body": {"Respuesta": {"Cliente": {"nombre": "Ana"}, "codigo": "00"}}}})
+            self.assertEqual(targeted_processor.extract(), full_processor.extract())
+            self.assertEqual(targeted_processor.extract()[prefix + "requestService.Envelope.Body.Consulta.numero"], "123")
+    
+    def test_lazy_xml_mode(self):
+        prefix = "jsonPayload.dataObject.messages."
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "service_1", "paths": [
+            [prefix + "responseService.Envelope.Body.Respuesta", "true"],
+            [prefix + "responseService.Envelope.Body.Respuesta.Movimientos.Mov", "true"]
+        ]}]}]
+        message = build_message(
+            '<Envelope><Body><Consulta><numero>123</numero></Consulta></Body></Envelope>',
+            '<Envelope><Body><Respuesta codigo="00"><Cliente><nombre>Ana</nombre></Cliente>'
+            '<Movimientos><Mov>1</Mov><Mov>2</Mov></Movimientos></Respuesta></Body></Envelope>'
+        )
+        
+        full_processor = MbaasProcessor(s3_config)
+        full_event = full_processor.process(message)
+        lazy_processor = MbaasProcessor(s3_config, xml_mode=XmlMode.LAZY)
+        lazy_event = lazy_processor.process(message)
+        
+        self.assertIsInstance(lazy_event["jsonPayload"]["dataObject"]["messages"]["responseService"]["Envelope"], XmlElementView)
+        self.assertEqual(lazy_event, full_event)
+        
+        # La extracción retorna diccionarios nativos
+        result = lazy_processor.extract()
+        self.assertEqual(result, full_processor.extract())
+        self.assertIs(type(result[prefix + "responseService.Envelope.Body.Respuesta"]), dict)
+    
+    def test_validation_modes(self):
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "service_1", "paths": [
+            ["jsonPayload.dataObject.messages.responseService.Respuesta.codigo", "true"],
+            ["jsonPayload.dataObject.consumer.appConsumer.canalId", "true"]
+        ]}]}]
+        message = build_message('<Consulta>1</Consulta>', '<Respuesta><codigo>00</codigo></Respuesta>')
+        
+        full_processor = MbaasProcessor(s3_config)
+        full_processor.process(message)
+        
+        for validation_mode in (ValidationMode.MINIMAL, ValidationMode.NONE):
+            processor = MbaasProcessor(s3_config, validation_mode=validation_mode)
+            processor.process(message)
+            self.assertEqual(processor.extract(), full_processor.extract())
+        
+        # La validación mínima solo exige los campos que usa el procesador
+        event = json.loads(message)
+        del event["logName"], event["jsonPayload"]["dataObject"]["operation"]
+        MbaasProcessor(s3_config, validation_mode=ValidationMode.MINIMAL).process(json.dumps(event))
+        
+        with self.assertRaises(ValidationError):
+            MbaasProcessor(s3_config).process(json.dumps(event))
+        
+        del event["jsonPayload"]["dataObject"]["messages"]["requestService"]
+        with self.assertRaises(ValidationError):
+            MbaasProcessor(s3_config, validation_mode=ValidationMode.MINIMAL).process(json.dumps(event))
+    
+    def test_process_and_extract(self):
+        prefix = "jsonPayload.dataObject.messages."
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "service_1", "paths": [
+            [prefix + "requestService.Consulta.numero", "true"]
+        ]}]}]
+        processor = MbaasProcessor(s3_config)
+        messages = [build_message(f'<Consulta><numero>{i}</numero></Consulta>', '<Respuesta/>') for i in range(20)]
+        
+        result = processor.process_and_extract(messages[0])
+        
+        # Equivale a process + extract, sin guardar estado en el procesador
+        self.assertEqual(result.data, {prefix + "requestService.Consulta.numero": "0"})
+        self.assertEqual(result.context.event_data, MbaasProcessor(s3_config).process(messages[0]))
+        self.assertEqual(dict(result.context.fields), {
+            "app_consumer_id": "app_id_1", "id_service": "service_1", "session_id": "session_1", "tidnid": "CC-123"
+        })
+        self.assertIsNone(processor._event_data)
+        self.assertIsNone(processor._app_consumer_id)
+        with self.assertRaises(TypeError):
+            result.context.fields["id_service"] = "otro"
+        
+        # Una misma instancia se comparte entre hilos
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(processor.process_and_extract, messages))
+        self.assertEqual([r.data[prefix + "requestService.Consulta.numero"] for r in results], [str(i) for i in range(20)])
+    
+    def test_process_and_extract_errors(self):
+        processor = MbaasProcessor([{"id": "app_id_1", "services": []}])
+        
+        with self.assertRaises(ServiceNotFoundError):
+            processor.process_and_extract(build_message('<a>1</a>', '<b>2</b>'))
+        
+        with self.assertRaises(json.JSONDecodeError):
+            processor.process_and_extract('{invalid json}')
+    
+    def test_process_batch(self):
+        prefix = "jsonPayload.dataObject.messages."
+        s3_config = [{"id": "app_id_1", "services": [
+            {"id_service": "service_1", "paths": [[prefix + "requestService.Consulta.numero", "true"]]},
+            {"id_service": "service_2", "paths": [[prefix + "responseService.Respuesta.codigo", "true"]]}
+        ]}]
+        processor = MbaasProcessor(s3_config)
+        messages = [
+            build_message(f'<Consulta><numero>{i}</numero></Consulta>', f'<Respuesta><codigo>{i}</codigo></Respuesta>')
+            for i in range(4)
+        ]
+        messages[1] = messages[1].replace('"service_1"', '"service_2"')
+        messages[2] = messages[2].replace('"service_1"', '"service_3"')
+        messages.append('{invalid json}')
+        
+        results = processor.process_batch(messages)
+        
+        self.assertEqual([item.index for item in results], [0, 1, 2, 3, 4])
+        self.assertEqual(results[0].result, processor.process_and_extract(messages[0]))
+        self.assertEqual(results[1].result.data, {prefix + "responseService.Respuesta.codigo": "1"})
+        self.assertEqual(results[3].result.data, {prefix + "requestService.Consulta.numero": "3"})
+        self.assertIsInstance(results[2].error, ServiceNotFoundError)
+        self.assertIsInstance(results[4].error, json.JSONDecodeError)
+        self.assertIsNone(processor._event_data)
+    
+    def test_extract_batch_groups_by_service(self):
+        prefix = "jsonPayload.dataObject.messages."
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "service_1", "paths": [
+            [prefix + "requestService.Consulta.numero", "true"]
+        ]}]}]
+        processor = MbaasProcessor(s3_config)
+        contexts = [
+            processor._process_context(build_message(f'<Consulta><numero>{i}</numero></Consulta>', '<Respuesta/>'))
+            for i in range(10)
+        ]
+        
+        # El plan de extracción se resuelve una vez por (app_consumer_id, id_service)
+        with patch.object(processor, '_plans', wraps=processor._plans) as mock_plans:
+            results = processor.extract_batch(contexts)
+        
+        self.assertEqual(mock_plans.get.call_count, 1)
+        self.assertEqual([item.result.data[prefix + "requestService.Consulta.numero"] for item in results],
+                         [str(i) for i in range(10)])
+    
     def test_extract_no_data(self):
         # Sin datos
         self.processor._event_data = None
@@ -215,14 +392,11 @@ class TestMbaasProcessor(unittest.TestCase):
         with self.assertRaises(AppConsumerNotFoundError):
             self.processor.extract()
     
-    @patch('jmespath.search')
-    def test_extract_service_not_found(self, mock_search):
+    def test_extract_service_not_found(self):
         # Service no encontrado
-        mock_search.return_value = ["other_service"]
-        
         self.processor._event_data = {"test": "data"}
         self.processor._app_consumer_id = "app_id_1"
-        self.processor._id_service = "service_1"
+        self.processor._id_service = "other_service"
         self.processor._session_id = "session_1"
         self.processor._list_app_consumers = ["app_id_1"]
         
@@ -7,8 +7,10 @@ from unittest.mock import patch, MagicMock
 
 from src.obs_layer_data_process.processors.mbaas.utils.jmespath import (
     PathAnalyzer, QueryBuilder, get_type_at_each_level, construct_jmespath_query,
-    ManualIndexingNavigator, DataExtractor, extract_from_message_selected_fields
+    ManualIndexingNavigator, DataExtractor, extract_from_message_selected_fields,
+    ExtractionPlan, QueryRewriteCache, shape_fingerprint
 )
+from src.obs_layer_data_process.utils.xml import xml_to_dict_lxml, xml_to_lazy_dict, materialize
 
 
 class TestPathAnalyzer(unittest.TestCase):
@@ -213,3 +215,96 @@ class TestDataExtractor(unittest.TestCase):
             mock_navigate.side_effect = Exception("error")
             result = self.extractor._extract_with_manual_indexing("part1.part2", {})
             self.assertIsNone(result)
+
+
+class TestExtractionPlan(unittest.TestCase):
+    
+    def setUp(self):
+        self.paths = [["a.b", "true"], ["a.c.d", "true"], ["x.y", "false"], ["a.e", "true"]]
+        self.cache = QueryRewriteCache(maxsize=8)
+        self.plan = ExtractionPlan(self.paths, cache=self.cache)
+        self.events = [
+            {"a": {"b": 1, "c": [{"d": "v"}], "e": {}}},
+            {"a": [{"b": 2}, {"c": {"d": "w"}}]},
+            {"a": [{"z": 0}, {"b": 3, "c": [[], {"d": "k"}]}]},
+            {"a": {"b": None, "c": []}, "x": {"y": [1, 2]}}
+        ]
+    
+    def test_shape_fingerprint(self):
+        self.assertEqual(shape_fingerprint({"a": {"b": 1}}, "a.b"), "DD")
+        self.assertEqual(shape_fingerprint({"a": [{"b": 1}]}, "a.b"), "DF")
+        self.assertEqual(shape_fingerprint({"a": [{}, {"b": 1}]}, "a.b"), "DL")
+        self.assertEqual(shape_fingerprint({"a": []}, "a.b"), "De")
+        self.assertEqual(shape_fingerprint({"a": 1}, "a.b"), "Dx")
+        self.assertEqual(shape_fingerprint({}, "a.b"), "d")
+    
+    def test_extract_matches_cascade(self):
+        for event in self.events:
+            # Dos pasadas: la segunda reutiliza los queries memorizados por forma
+            for _ in range(2):
+                self.assertEqual(dict(self.plan.extract(event)),
+                                 dict(extract_from_message_selected_fields(paths=self.paths, event=event)))
+    
+    def test_rewrites_are_reused_per_shape(self):
+        self.plan.extract_single_field(self.plan.paths[0], {"a": [{"b": 1}]})
+        
+        with patch('src.obs_layer_data_process.processors.mbaas.utils.jmespath.get_type_at_each_level') as mock_get_type, \
+             patch.object(ManualIndexingNavigator, 'navigate_query_path') as mock_navigate:
+            result = self.plan.extract_single_field(self.plan.paths[0], {"a": [{"b": 5}, {"b": 6}]})
+            
+            self.assertEqual(result, 5)
+            mock_get_type.assert_not_called()
+            mock_navigate.assert_not_called()
+        
+        self.assertIn(("a.b", "DF"), self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+    
+    def test_extract_empty(self):
+        self.assertEqual(list(ExtractionPlan([]).extract(self.events[0])), [])
+        self.assertEqual(list(self.plan.extract({})), [])
+    
+    def test_extract_lazy_xml(self):
+        xml = '<r><a id="1"><b>x</b><b>y</b></a><a><c><d>z</d></c></a><e/></r>'
+        paths = [["m.r.a.b", "true"], ["m.r.a.c.d", "true"], ["m.r.a", "true"], ["m.r.e", "true"], ["m.r.f", "true"]]
+        eager_event = {"m": xml_to_dict_lxml(xml, "response_service")}
+        lazy_event = {"m": xml_to_lazy_dict(xml, "response_service")}
+        expected = dict(extract_from_message_selected_fields(paths=paths, event=eager_event))
+        
+        # Las vistas perezosas se recorren igual que los diccionarios en ambas cascadas
+        self.assertEqual({path: materialize(value) for path, value in ExtractionPlan(paths).extract(lazy_event)}, expected)
+        self.assertEqual({path: materialize(value) for path, value in
+                          extract_from_message_selected_fields(paths=paths, event=lazy_event)}, expected)
+    
+    def test_invalid_query(self):
+        plan = ExtractionPlan([["a..b", "true"]])
+        self.assertEqual(dict(plan.extract({"a": {"b": 1}})),
+                         dict(extract_from_message_selected_fields(paths=[["a..b", "true"]], event={"a": {"b": 1}})))
+
+
+class TestQueryRewriteCache(unittest.TestCase):
+    
+    def test_lru_eviction(self):
+        cache = QueryRewriteCache(maxsize=2)
+        cache.put(("a", "D"), (None, None))
+        cache.put(("b", "D"), (None, None))
+        
+        # "a" pasa a ser la entrada más reciente y se descarta "b"
+        self.assertEqual(cache.get(("a", "D")), (None, None))
+        cache.put(("c", "D"), (None, None))
+        
+        self.assertEqual(len(cache), 2)
+        self.assertIn(("a", "D"), cache)
+        self.assertNotIn(("b", "D"), cache)
+        self.assertIsNone(cache.get(("b", "D")))
+    
+    def test_clear(self):
+        cache = QueryRewriteCache()
+        cache.put(("a", "D"), (None, None))
+        cache.get(("a", "D"))
+        cache.clear()
+        
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+    
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            QueryRewriteCache(maxsize=0)
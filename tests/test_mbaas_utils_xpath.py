@@ -0,0 +1,148 @@
+"""tests/test_mbaas_utils_xpath.py"""
+
+import unittest
+
+from unittest.mock import patch
+
+from src.obs_layer_data_process.utils.xml import xml_to_dict_lxml
+from src.obs_layer_data_process.processors.mbaas.utils.jmespath import ExtractionPlan, QueryRewriteCache
+from src.obs_layer_data_process.processors.mbaas.utils.xpath import (
+    compile_xml_selections, select_xml_paths, xml_to_selected_dict, stream_selected_dict
+)
+from src.obs_layer_data_process.utils.xml import parse_xml_root
+
+
+PREFIX = "jsonPayload.dataObject.messages.responseService."
+
+RESPONSE = (
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+    '<soap:Body><ns:Consulta xmlns:ns="http://example.com/" codigo="00">'
+    '<ns:Cliente tipo="CC"><ns:Nombre> Ana </ns:Nombre><ns:Numero>123</ns:Numero></ns:Cliente>'
+    '<ns:Cuentas><ns:Cuenta>1</ns:Cuenta><ns:Cuenta>2</ns:Cuenta></ns:Cuentas>'
+    '<p:Estado>OK</p:Estado>'
+    '</ns:Consulta></soap:Body></soap:Envelope>'
+)
+
+
+def build_event(response):
+    return {"jsonPayload": {"dataObject": {"messages": {"responseService": response}}}}
+
+
+class TestCompileXmlSelections(unittest.TestCase):
+    
+    def test_simple_paths(self):
+        selections = compile_xml_selections([
+            [PREFIX + "Envelope.Body.Consulta.codigo", "true"],
+            ["jsonPayload.dataObject.consumer.appConsumer.id", "true"]
+        ])
+        
+        self.assertFalse(selections["responseService"].full)
+        self.assertEqual([path.steps for path in selections["responseService"].paths],
+                         [("Envelope", "Body", "Consulta", "codigo")])
+        self.assertEqual(selections["requestService"].paths, [])
+        self.assertFalse(selections["requestService"].full)
+    
+    def test_paths_requiring_full_conversion(self):
+        self.assertTrue(compile_xml_selections([[PREFIX + "Envelope.Body[0]", "true"]])["responseService"].full)
+        self.assertTrue(compile_xml_selections([[PREFIX.rstrip("."), "true"]])["responseService"].full)
+        
+        selections = compile_xml_selections([["jsonPayload.dataObject.messages", "true"]])
+        self.assertTrue(all(selection.full for selection in selections.values()))
+        
+        selections = compile_xml_selections([["jsonPayload.*.messages", "true"]])
+        self.assertTrue(all(selection.full for selection in selections.values()))
+
+
+class TestSelectXmlPaths(unittest.TestCase):
+    
+    def assert_same_extraction(self, queries):
+        paths = [[PREFIX + query, "true"] for query in queries]
+        selection = compile_xml_selections(paths)["responseService"]
+        
+        full = dict(ExtractionPlan(paths, cache=QueryRewriteCache()).extract(
+            build_event(xml_to_dict_lxml(RESPONSE, "response_service"))))
+        targeted = dict(ExtractionPlan(paths, cache=QueryRewriteCache()).extract(
+            build_event(xml_to_selected_dict(RESPONSE, "response_service", selection))))
+        streamed = dict(ExtractionPlan(paths, cache=QueryRewriteCache()).extract(
+            build_event(stream_selected_dict(RESPONSE, "response_service", selection))))
+        
+        self.assertEqual(targeted, full)
+        self.assertEqual(streamed, full)
+        return targeted
+    
+    def test_select_elements_and_attributes(self):
+        root = parse_xml_root(RESPONSE)
+        selection = compile_xml_selections([
+            [PREFIX + "Envelope.Body.Consulta.Cliente.Nombre", "true"],
+            [PREFIX + "Envelope.Body.Consulta.Cliente.tipo", "true"],
+            [PREFIX + "Envelope.Body.Consulta.Estado", "true"]
+        ])["responseService"]
+        
+        self.assertEqual(select_xml_paths(root, selection), {
+            "Envelope": {"Body": {"Consulta": {"Cliente": {"Nombre": "Ana", "tipo": "CC"}, "Estado": "OK"}}}
+        })
+    
+    def test_same_extraction_as_full_conversion(self):
+        result = self.assert_same_extraction([
+            "Envelope.Body.Consulta.Cliente.Numero",
+            "Envelope.Body.Consulta.codigo",
+            "Envelope.Body.Consulta.Cliente"
+        ])
+        self.assertEqual(result[PREFIX + "Envelope.Body.Consulta.codigo"], "00")
+    
+    def test_missing_path_returns_deepest_level(self):
+        # La extracción completa retorna el nivel más profundo que existe
+        self.assert_same_extraction(["Envelope.Body.Consulta.Cliente.Inexistente", "Envelope.Body.Consulta.Estado.Otro"])
+    
+    def test_repeated_elements_use_full_conversion(self):
+        root = parse_xml_root(RESPONSE)
+        selection = compile_xml_selections([[PREFIX + "Envelope.Body.Consulta.Cuentas.Cuenta", "true"]])["responseService"]
+        
+        self.assertIsNone(select_xml_paths(root, selection))
+        self.assertEqual(xml_to_selected_dict(RESPONSE, "response_service", selection),
+                         xml_to_dict_lxml(RESPONSE, "response_service"))
+        self.assert_same_extraction(["Envelope.Body.Consulta.Cuentas.Cuenta"])
+    
+    def test_without_selection(self):
+        with patch('src.obs_layer_data_process.processors.mbaas.utils.xpath.xml_to_dict_lxml') as mock_to_dict:
+            mock_to_dict.return_value = {"root": {}}
+            self.assertEqual(xml_to_selected_dict(RESPONSE, "response_service", None), {"root": {}})
+    
+    def test_invalid_xml(self):
+        selection = compile_xml_selections([[PREFIX + "Envelope.Body", "true"]])["responseService"]
+        self.assertIsNone(xml_to_selected_dict("no xml", "response_service", selection))
+
+
+class TestStreamSelectedDict(unittest.TestCase):
+    
+    def test_stream_elements_and_attributes(self):
+        selection = compile_xml_selections([
+            [PREFIX + "Envelope.Body.Consulta.Cliente.Nombre", "true"],
+            [PREFIX + "Envelope.Body.Consulta.codigo", "true"]
+        ])["responseService"]
+        
+        self.assertEqual(stream_selected_dict(RESPONSE, "response_service", selection),
+                         {"Envelope": {"Body": {"Consulta": {"Cliente": {"Nombre": "Ana"}, "codigo": "00"}}}})
+    
+    def test_fallback_to_full_conversion(self):
+        full = xml_to_dict_lxml(RESPONSE, "response_service")
+        
+        for query in ("Envelope.Body.Consulta.Cuentas.Cuenta", "Envelope.Body.Inexistente"):
+            selection = compile_xml_selections([[PREFIX + query, "true"]])["responseService"]
+            self.assertEqual(stream_selected_dict(RESPONSE, "response_service", selection), full)
+        
+        self.assertEqual(stream_selected_dict(RESPONSE, "response_service", None), full)
+    
+    def test_stop_early_uses_first_occurrence(self):
+        selection = compile_xml_selections([[PREFIX + "Envelope.Body.Consulta.Cuentas.Cuenta", "true"]])["responseService"]
+        
+        self.assertEqual(stream_selected_dict(RESPONSE, "response_service", selection, stop_early=True),
+                         {"Envelope": {"Body": {"Consulta": {"Cuentas": {"Cuenta": "1"}}}}})
+    
+    def test_invalid_xml(self):
+        selection = compile_xml_selections([[PREFIX + "Envelope.Body", "true"]])["responseService"]
+        self.assertIsNone(stream_selected_dict("no xml", "response_service", selection))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,11 @@ import unittest
 import json
 import base64
 
+from types import MappingProxyType
+
 from src.obs_layer_data_process.utils.message import (
-    encode_base64, decode_base64, generate_deduplication_id, get_group_id
+    encode_base64, decode_base64, generate_deduplication_id, get_group_id, json_default,
+    serialize_message, build_deduplication_id
 )
 
 
@@ -74,6 +77,65 @@ class TestMessageUtils(unittest.TestCase):
         evento2 = {"id": 2, "nombre": "test"}
         self.assertNotEqual(resultado, generate_deduplication_id(evento2))
     
+    def test_serialize_message(self):
+        mensaje = {"b": [1, 2.5, None], "a": MappingProxyType({"z": "ñ", "y": True})}
+        
+        self.assertEqual(serialize_message(mensaje), '{"a":{"y":true,"z":"\\u00f1"},"b":[1,2.5,null]}')
+        self.assertEqual(serialize_message({1: 2 ** 70}), '{"1":%d}' % 2 ** 70)
+    
+    def test_serialize_message_uses_json(self):
+        mensajes = [
+            {"x": float("nan"), "y": float("inf"), "z": -float("inf")},
+            {"a": 1e16, "b": 1e-7, "c": 1.5e300, "d": -0.0, "e": 0.1, "f": 123456.789},
+            {"l": [1, "dos", None, True, 2.5, (3, 4)], "m": MappingProxyType({"k": [0.0001]})},
+            {"s": "é😀\u2028\x01\x7f\"/"},
+        ]
+        
+        for mensaje in mensajes:
+            # Siempre json: el cuerpo y el token no dependen de que orjson esté instalado
+            esperado = json.dumps(mensaje, sort_keys=True, separators=(',', ':'), default=json_default)
+            self.assertEqual(serialize_message(mensaje), esperado)
+        
+        self.assertTrue('NaN' in serialize_message(mensajes[0]))
+        self.assertTrue('1e+16' in serialize_message(mensajes[1]))
+    
+    def test_serialize_message_escapes_invalid_characters(self):
+        # Un surrogate suelto y U+FFFF no se pueden enviar crudos a SQS
+        mensaje = {"a": "abc\ud83d", "b": "\uffff"}
+        body = serialize_message(mensaje)
+        
+        self.assertEqual(body, '{"a":"abc\\ud83d","b":"\\uffff"}')
+        self.assertTrue(body.isascii())
+        self.assertEqual(json.loads(body), mensaje)
+        self.assertEqual(len(generate_deduplication_id(mensaje)), 128)
+    
+    def test_build_deduplication_id(self):
+        body = serialize_message({"id": 1})
+        
+        self.assertEqual(build_deduplication_id(body), generate_deduplication_id({"id": 1}))
+        self.assertEqual(len(build_deduplication_id(body)), 128)
+        self.assertTrue(all(c in "0123456789abcdef" for c in build_deduplication_id(body)))
+    
+    def test_generate_deduplication_id_with_keys(self):
+        keys = ("id", "fecha")
+        evento = {"id": 1, "fecha": "2024-01-01", "datos": "a"}
+        
+        # Solo las llaves configuradas identifican el mensaje
+        resultado = generate_deduplication_id(evento, keys)
+        self.assertEqual(resultado, generate_deduplication_id(dict(evento, datos="b"), keys))
+        self.assertNotEqual(resultado, generate_deduplication_id(dict(evento, id=2), keys))
+        self.assertNotEqual(resultado, generate_deduplication_id(evento))
+        
+        with self.assertRaises(ValueError):
+            generate_deduplication_id({"id": 1}, keys)
+    
+    def test_json_default(self):
+        # Los Mapping que no son dict se serializan como objetos JSON
+        self.assertEqual(json.dumps({"data": MappingProxyType({"a": 1})}, default=json_default), '{"data": {"a": 1}}')
+        
+        with self.assertRaises(TypeError):
+            json.dumps({"data": object()}, default=json_default)
+    
     def test_get_group_id(self):
         # Caso normal
         evento = {'jsonPayload.dataObject.consumer.appConsumer.sessionId': '  abc123  '}
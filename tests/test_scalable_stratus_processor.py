@@ -5,11 +5,22 @@ import unittest
 from unittest.mock import patch, MagicMock
 
 from src.obs_layer_data_process.processors.stratus.scalabe_processor import ScalableStratusProcessor
+from src.obs_layer_data_process.processors.stratus.config import FieldSlice, FieldType, MessageType, StratusConfig
 from src.obs_layer_data_process.processors.stratus.utils.exceptions import (
     MessageLengthError, InvalidEventDataError, NoCampaignsFoundError
 )
 
 
+def build_message(**values) -> str:
+    message = [" "] * 940
+    
+    for field in StratusConfig.get_field_layout(MessageType.ACF):
+        if field.name in values:
+            message[field.start:field.end] = values[field.name].ljust(field.end - field.start)
+    
+    return "".join(message)
+
+
 class TestScalableStratusProcessor(unittest.TestCase):
     
     def setUp(self):
@@ -17,25 +28,22 @@ class TestScalableStratusProcessor(unittest.TestCase):
         self.processor = ScalableStratusProcessor(self.s3_config)
     
     @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.validate_message_length')
-    @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.extract_field')
-    @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.ACF_FIELDS')
-    def test_validate_and_extract_fields_success(self, mock_fields, mock_extract, mock_validate):
+    @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.get_field_layout')
+    def test_validate_and_extract_fields_success(self, mock_get_layout, mock_validate):
         # Configurar mocks
-        field1 = MagicMock()
-        field1.name = "Field1"
-        field2 = MagicMock()
-        field2.name = "Field2"
-        mock_fields.__iter__.return_value = [field1, field2]
+        mock_get_layout.return_value = (
+            FieldSlice("Field1", 0, 4, FieldType.ALPHANUMERIC),
+            FieldSlice("Field2", 4, 8, FieldType.ALPHANUMERIC),
+        )
         mock_validate.return_value = True
-        mock_extract.side_effect = lambda msg, field, *args: f"value_{field}"
         
         # Ejecutar método
-        self.processor._validate_and_extract_fields("test_message")
+        self.processor._validate_and_extract_fields("abc def ")
         
         # Verificar resultado
         self.assertEqual(self.processor._event_data, {
-            "Field1": "value_Field1",
-            "Field2": "value_Field2"
+            "Field1": "abc",
+            "Field2": "def"
         })
     
     @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.validate_message_length')
@@ -58,21 +66,37 @@ class TestScalableStratusProcessor(unittest.TestCase):
             self.assertEqual(result, {"field": "value"})
             mock_validate.assert_called_once_with("test")
     
-    @patch('jq.compile')
-    def test_get_campaigns(self, mock_compile):
-        # Configurar mock
-        mock_jq = MagicMock()
-        mock_compile.return_value = mock_jq
-        mock_input = MagicMock()
-        mock_jq.input.return_value = mock_input
-        mock_input.all.return_value = [{"id_campaign": "campaign1"}]
+    def test_get_campaigns(self):
+        # Parametrización con varias campañas y reglas
+        s3_config = {"campaign": [
+            {"id_campaign": "campaign1", "rules": [
+                {"id_rule": "r1", "config": {"motivo_concepto": "motivo1", "canal": "canal1", "codigo_trx": "trx1"},
+                 "variables": ["MotivoConcepto"]},
+                {"id_rule": "r2", "config": {"motivo_concepto": "motivo2", "canal": "canal1", "codigo_trx": "trx1"},
+                 "variables": ["CodigoCanal"]}
+            ]},
+            {"id_campaign": "campaign2", "rules": [
+                {"id_rule": "r3", "config": {"motivo_concepto": "motivo1", "canal": "canal1", "codigo_trx": "trx1"},
+                 "variables": []}
+            ]},
+            {"id_campaign": "campaign3"}
+        ]}
+        processor = ScalableStratusProcessor(s3_config)
         
         # Ejecutar método
-        result = self.processor._get_campaigns(self.s3_config, "motivo1", "canal1", "trx1")
+        result = processor._get_campaigns("motivo1", "canal1", "trx1")
         
-        # Verificar resultado
-        self.assertEqual(result, [{"id_campaign": "campaign1"}])
-        mock_compile.assert_called_once()
+        # Verificar resultado en el orden de la parametrización
+        self.assertEqual(result, [
+            {"id_campaign": "campaign1", "id_rule": "r1", "variables": ["MotivoConcepto"]},
+            {"id_campaign": "campaign2", "id_rule": "r3", "variables": []}
+        ])
+        self.assertEqual(processor._get_campaigns("motivo1", "canal2", "trx1"), [])
+        
+        # Las campañas retornadas son de solo lectura y se comparten entre mensajes
+        with self.assertRaises(TypeError):
+            result[0]["data"] = {}
+        self.assertIs(processor._get_campaigns("motivo1", "canal1", "trx1")[0], result[0])
     
     @patch('src.obs_layer_data_process.processors.stratus.scalabe_processor.ScalableStratusProcessor._get_campaigns')
     def test_extract_success(self, mock_get_campaigns):
@@ -107,6 +131,50 @@ class TestScalableStratusProcessor(unittest.TestCase):
         with self.assertRaises(NoCampaignsFoundError):
             self.processor.extract()
     
+    def test_process_and_extract(self):
+        s3_config = {"campaign": [{"id_campaign": "campaign1", "rules": [
+            {"id_rule": "r1", "config": {"motivo_concepto": "1*", "canal": "*", "codigo_trx": "*"},
+             "variables": ["MotivoConcepto"]}
+        ]}]}
+        processor = ScalableStratusProcessor(s3_config)
+        message = build_message(MotivoConcepto="1234", CodigoCanal="01", CodigoTransaccionB24="10")
+        
+        result = processor.process_and_extract(message)
+        
+        # Equivale a process + extract, sin guardar estado en el procesador
+        expected = ScalableStratusProcessor(s3_config)
+        self.assertEqual(result.context.event_data, expected.process(message))
+        self.assertEqual(result.data, expected.extract())
+        self.assertEqual(result.data[0]["id_rule"], "r1")
+        self.assertIsNone(processor._event_data)
+        
+        with self.assertRaises(NoCampaignsFoundError):
+            processor.process_and_extract(build_message(MotivoConcepto="9999"))
+    
+    def test_process_batch(self):
+        s3_config = {"campaign": [{"id_campaign": "campaign1", "rules": [
+            {"id_rule": "r1", "config": {"motivo_concepto": "1*", "canal": "*", "codigo_trx": "*"},
+             "variables": ["MotivoConcepto"]}
+        ]}]}
+        processor = ScalableStratusProcessor(s3_config)
+        messages = [
+            build_message(MotivoConcepto="1234", CodigoCanal="01", CodigoTransaccionB24="10"),
+            build_message(MotivoConcepto="9999"),
+            "corto",
+            build_message(MotivoConcepto="1234", CodigoCanal="01", CodigoTransaccionB24="10"),
+        ]
+        
+        with patch.object(processor, '_get_campaigns', wraps=processor._get_campaigns) as mock_campaigns:
+            results = processor.process_batch(messages)
+        
+        # Las campañas se buscan una vez por condición de las reglas
+        self.assertEqual(mock_campaigns.call_count, 2)
+        self.assertEqual([item.index for item in results], [0, 1, 2, 3])
+        self.assertEqual(results[0].result, processor.process_and_extract(messages[0]))
+        self.assertEqual(results[3].result.data[0]["data"], {"MotivoConcepto": "1234"})
+        self.assertIsInstance(results[1].error, NoCampaignsFoundError)
+        self.assertIsInstance(results[2].error, MessageLengthError)
+    
     def test_extract_no_data(self):
         # Configurar procesador sin datos
         self.processor._event_data = None
@@ -0,0 +1,85 @@
+"""tests/test_stratus_batch.py"""
+
+import numpy as np
+import unittest
+
+from unittest.mock import patch
+
+from src.obs_layer_data_process.processors.stratus.batch import StratusBatchDecoder, RECORD_DTYPES
+from src.obs_layer_data_process.processors.stratus.config import StratusConfig, MessageType
+from src.obs_layer_data_process.processors.stratus.utils.exceptions import MessageLengthError
+
+
+def build_frame(length: int, seed: int) -> str:
+    return "".join(" " if (i + seed) % 11 == 0 else str((i + seed) % 10) for i in range(length))
+
+
+class TestStratusBatchDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self.decoder = StratusBatchDecoder()
+        self.acf_frames = [build_frame(940, seed) for seed in range(3)]
+        self.afd_frames = [build_frame(1003, seed) for seed in range(2)]
+
+    def test_record_dtypes(self):
+        # Un registro del dtype ocupa exactamente la longitud de la trama
+        for message_type, length in StratusConfig.MESSAGE_LENGHTS.items():
+            self.assertEqual(RECORD_DTYPES[message_type].itemsize, length)
+
+    def test_decode_buffer_matches_record_extraction(self):
+        buffer = "".join(self.acf_frames).encode('latin-1')
+        store = self.decoder.decode_buffer(buffer, MessageType.ACF)
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.to_records(), [StratusConfig.extract_record(frame) for frame in self.acf_frames])
+
+    def test_decode_buffer_invalid_length(self):
+        with self.assertRaises(MessageLengthError):
+            self.decoder.decode_buffer(b"A" * 941, MessageType.ACF)
+
+    def test_decode_frames_groups_by_message_type(self):
+        frames = [self.acf_frames[0], self.afd_frames[0], "invalida", self.acf_frames[1]]
+
+        with patch('src.obs_layer_data_process.processors.stratus.batch.logger') as mock_logger:
+            stores = self.decoder.decode_frames(frames)
+            mock_logger.warning.assert_called_once()
+
+        self.assertEqual(set(stores), {MessageType.ACF, MessageType.AFD})
+        self.assertEqual(stores[MessageType.ACF].indices.tolist(), [0, 3])
+        self.assertEqual(stores[MessageType.AFD].indices.tolist(), [1])
+        self.assertEqual(stores[MessageType.AFD].to_records(),
+                         [StratusConfig.extract_record(self.afd_frames[0], MessageType.AFD)])
+
+    def test_decode_frames_unencodable_frame(self):
+        frames = [self.acf_frames[0], "€" * 940, self.acf_frames[1]]
+
+        with patch('src.obs_layer_data_process.processors.stratus.batch.logger') as mock_logger:
+            stores = self.decoder.decode_frames(frames)
+            mock_logger.warning.assert_called_once()
+
+        self.assertEqual(stores[MessageType.ACF].indices.tolist(), [0, 2])
+
+    def test_to_records_strips_like_record_extraction(self):
+        # Espacios no ASCII de latin-1 (\xa0, \x85) se recortan igual que str.strip
+        frame = "\xa0" + self.acf_frames[0][1:-2] + "\x85\xa0"
+        store = self.decoder.decode_frames([frame])[MessageType.ACF]
+
+        self.assertEqual(store.to_records(), [StratusConfig.extract_record(frame)])
+
+    def test_numeric_columns(self):
+        store = self.decoder.decode_buffer(b"".join(frame.encode() for frame in self.acf_frames), MessageType.ACF)
+
+        expected = []
+        for frame in self.acf_frames:
+            value = StratusConfig.extract_field(frame, "TipoMensaje")
+            expected.append(int(value) if value.isdigit() else -1)
+
+        np.testing.assert_array_equal(store.numeric("TipoMensaje"), expected)
+
+        columns = store.columns()
+        self.assertEqual(columns["TipoMensaje"].dtype, np.int64)
+        self.assertEqual(columns["ByteI"].dtype.kind, "S")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@
 import unittest
 
 from src.obs_layer_data_process.processors.stratus.config import (
-    StratusConfig, FieldType, FieldDefinition, MessageType
+    StratusConfig, FieldType, FieldDefinition, FieldSlice, MessageType
 )
 
 
@@ -78,6 +78,52 @@ class TestStratusConfig(unittest.TestCase):
         
         campos_afd = StratusConfig.get_fields_for_message_type(MessageType.AFD)
         self.assertEqual(campos_afd, StratusConfig.AFD_FIELDS)
+    
+    def test_compile_field_layout(self):
+        # Cada definición se traduce a un corte (inicio, fin) en base 0
+        campos = [
+            FieldDefinition(name="A", length=2, position=1, field_type=FieldType.NUMERIC),
+            FieldDefinition(name="B", length=3, position=3, field_type=FieldType.ALPHANUMERIC)
+        ]
+        layout = StratusConfig.compile_field_layout(campos)
+        
+        self.assertIsInstance(layout, tuple)
+        self.assertEqual(layout, (
+            FieldSlice("A", 0, 2, FieldType.NUMERIC),
+            FieldSlice("B", 2, 5, FieldType.ALPHANUMERIC)
+        ))
+    
+    def test_field_layouts_match_definitions(self):
+        # Las tablas precompiladas conservan el orden y los nombres de las definiciones
+        for message_type in (MessageType.ACF, MessageType.AFD):
+            campos = StratusConfig.get_fields_for_message_type(message_type)
+            layout = StratusConfig.get_field_layout(message_type)
+            self.assertEqual([s.name for s in layout], [f.name for f in campos])
+    
+    def test_extract_record(self):
+        # El registro completo coincide con la extracción campo a campo
+        for message_type, longitud in StratusConfig.MESSAGE_LENGHTS.items():
+            mensaje = "".join(chr(65 + i % 26) if i % 7 else " " for i in range(longitud))
+            registro = StratusConfig.extract_record(mensaje, message_type)
+            
+            esperado = {
+                campo.name: StratusConfig.extract_field(mensaje, campo.name, message_type)
+                for campo in StratusConfig.get_fields_for_message_type(message_type)
+            }
+            self.assertEqual(registro, esperado)
+
+    
+    def test_project_field_layout(self):
+        # La proyección conserva el orden de la trama y omite campos desconocidos
+        layout = StratusConfig.project_field_layout(MessageType.ACF, ["MotivoConcepto", "ByteI", "CampoInexistente"])
+        self.assertEqual([s.name for s in layout], ["ByteI", "MotivoConcepto"])
+        
+        mensaje = "".join(chr(65 + i % 26) for i in range(940))
+        registro = StratusConfig.extract_record(mensaje, MessageType.ACF, layout=layout)
+        self.assertEqual(registro, {
+            "ByteI": StratusConfig.extract_field(mensaje, "ByteI"),
+            "MotivoConcepto": StratusConfig.extract_field(mensaje, "MotivoConcepto")
+        })
 
 
 if __name__ == '__main__':
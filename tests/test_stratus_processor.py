@@ -4,11 +4,13 @@ import unittest
 
 from unittest.mock import patch, MagicMock
 
+from src.obs_layer_data_process.core.interfaces.message_processor import MessageContext
 from src.obs_layer_data_process.processors.stratus.processor import StratusProcessor
-from src.obs_layer_data_process.processors.stratus.config import MessageType
+from src.obs_layer_data_process.processors.stratus.config import MessageType, FieldSlice, FieldType
 from src.obs_layer_data_process.processors.stratus.utils.exceptions import (
-    MessageLengthError, InvalidEventDataError, UnsupportedMessageTypeError
+    MessageLengthError, InvalidEventDataError, UnsupportedMessageTypeError, NoS3FileLoadedError
 )
+from src.obs_layer_data_process.processors.stratus.utils.message import get_selected_fields
 
 
 class TestStratusProcessor(unittest.TestCase):
@@ -19,37 +21,25 @@ class TestStratusProcessor(unittest.TestCase):
         self.processor = StratusProcessor(self.s3_config)
     
     @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.validate_message_length')
-    @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.extract_field')
-    @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.get_fields_for_message_type')
-    def test_validate_and_extract_fields_success(self, mock_get_fields, mock_extract, mock_validate):
-        # Configurar mocks con objetos MagicMock más específicos
-        field1 = MagicMock()
-        field1.name = "Field1"
-        field2 = MagicMock()
-        field2.name = "Field2"
-        
+    @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.get_field_layout')
+    def test_validate_and_extract_fields_success(self, mock_get_layout, mock_validate):
+        # Configurar tabla de cortes controlada
         mock_validate.return_value = MessageType.ACF
-        mock_get_fields.return_value = [field1, field2]
-        
-        # Usar una función side_effect que use el nombre del campo
-        def extract_side_effect(msg, field_name, msg_type):
-            if field_name == "Field1":
-                return "value_Field1"
-            elif field_name == "Field2":
-                return "value_Field2"
-            return None
-        
-        mock_extract.side_effect = extract_side_effect
+        mock_get_layout.return_value = (
+            FieldSlice("Field1", 0, 5, FieldType.ALPHANUMERIC),
+            FieldSlice("Field2", 5, 10, FieldType.NUMERIC),
+        )
         
         # Ejecutar método
-        self.processor._validate_and_extract_fields("test_message")
+        self.processor._validate_and_extract_fields("val1 00042")
         
         # Verificar resultado
         self.assertEqual(self.processor._message_type, MessageType.ACF)
         self.assertEqual(self.processor._event_data, {
-            "Field1": "value_Field1",
-            "Field2": "value_Field2"
+            "Field1": "val1",
+            "Field2": "00042"
         })
+        mock_get_layout.assert_called_once_with(MessageType.ACF)
     
     @patch('src.obs_layer_data_process.processors.stratus.config.StratusConfig.validate_message_length')
     def test_validate_and_extract_fields_unsupported_message_type(self, mock_validate):
@@ -121,6 +111,78 @@ class TestStratusProcessor(unittest.TestCase):
                 self.processor.extract()
             mock_error_init.assert_called_once()
 
+    
+    def test_projection_extracts_only_selected_fields(self):
+        # Parametrización con dos campos seleccionados para ACF
+        s3_config = [{"type": "ACF", "fields": {"CodigoCanal": "true", "MotivoConcepto": "TRUE", "ByteI": "false"}},
+                     {"type": "AFD", "fields": {"ByteI": "true"}}]
+        processor = StratusProcessor(s3_config, projection=True)
+        mensaje = "".join(chr(65 + i % 26) for i in range(940))
+        
+        # Solo se cortan de la trama los campos seleccionados
+        result = processor.process(mensaje)
+        self.assertEqual(set(result), {"CodigoCanal", "MotivoConcepto"})
+        
+        # La extracción coincide con la del modo completo
+        full_processor = StratusProcessor(s3_config)
+        full_processor.process(mensaje)
+        self.assertEqual(processor.extract(), full_processor.extract())
+    
+    def test_process_and_extract(self):
+        s3_config = [{"type": "ACF", "fields": {"CodigoCanal": "true", "MotivoConcepto": "true"}},
+                     {"type": "AFD", "fields": {"ByteI": "true"}}]
+        mensaje = "".join(chr(65 + i % 26) for i in range(940))
+        
+        for projection in (False, True):
+            processor = StratusProcessor(s3_config, projection=projection)
+            result = processor.process_and_extract(mensaje)
+            
+            # Equivale a process + extract, sin guardar estado en el procesador
+            expected = StratusProcessor(s3_config, projection=projection)
+            self.assertEqual(result.context.event_data, expected.process(mensaje))
+            self.assertEqual(result.data, expected.extract())
+            self.assertEqual(result.context.fields["message_type"], MessageType.ACF)
+            self.assertIsNone(processor._event_data)
+            self.assertIsNone(processor._message_type)
+    
+    def test_process_batch(self):
+        s3_config = [{"type": "ACF", "fields": {"CodigoCanal": "true", "MotivoConcepto": "true"}},
+                     {"type": "AFD", "fields": {"ByteI": "true"}}]
+        mensajes = ["".join(chr(65 + (i + j) % 26) for i in range(940)) for j in range(3)]
+        
+        for projection in (False, True):
+            processor = StratusProcessor(s3_config, projection=projection)
+            
+            with patch('src.obs_layer_data_process.processors.stratus.processor.get_selected_fields',
+                       wraps=get_selected_fields) as mock_selected:
+                results = processor.process_batch([mensajes[0], "corto", mensajes[1], mensajes[2]])
+            
+            # Los campos seleccionados se resuelven una vez por tipo de trama
+            self.assertEqual(mock_selected.call_count, 0 if projection else 1)
+            self.assertEqual([item.index for item in results], [0, 1, 2, 3])
+            self.assertIsInstance(results[1].error, MessageLengthError)
+            self.assertIsNone(results[1].result)
+            
+            for item, mensaje in zip([results[0], results[2], results[3]], mensajes):
+                self.assertIsNone(item.error)
+                self.assertEqual(item.result, processor.process_and_extract(mensaje))
+    
+    def test_extract_batch_without_s3_config(self):
+        processor = StratusProcessor([])
+        context = processor._process_context("A" * 940)
+        
+        results = processor.extract_batch([context, MessageContext(None, {"message_type": MessageType.ACF})])
+        
+        self.assertIsInstance(results[0].error, NoS3FileLoadedError)
+        self.assertIsInstance(results[1].error, InvalidEventDataError)
+    
+    def test_projection_without_selected_fields(self):
+        # Sin campos seleccionados la extracción queda vacía
+        processor = StratusProcessor([{"type": "ACF", "fields": {"ByteI": "false"}}], projection=True)
+        
+        self.assertEqual(processor.process("A" * 940), {})
+        self.assertEqual(processor.extract(), {})
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""tests/test_stratus_reader.py"""
+
+import os
+import tempfile
+import unittest
+
+from src.obs_layer_data_process.processors.stratus.config import StratusConfig, MessageType
+from src.obs_layer_data_process.processors.stratus.reader import StratusFileReader, StratusRecordView
+from src.obs_layer_data_process.processors.stratus.utils.exceptions import MessageLengthError
+
+
+def build_frame(length: int, seed: int) -> str:
+    return "".join(" " if (i + seed) % 13 == 0 else chr(65 + (i + seed) % 26) for i in range(length))
+
+
+class TestStratusFileReader(unittest.TestCase):
+
+    def setUp(self):
+        self.acf = [build_frame(940, seed) for seed in range(3)]
+        self.afd = [build_frame(1003, seed) for seed in range(2)]
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_file(self, content: bytes) -> str:
+        path = os.path.join(self.tmp_dir.name, "tramas.txt")
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_newline_delimited_mixed_types(self):
+        frames = [self.acf[0], self.afd[0], self.acf[1]]
+        path = self.write_file(("\r\n".join(frames) + "\n\n").encode("latin-1"))
+
+        with StratusFileReader(path) as reader:
+            views = list(reader)
+
+            self.assertEqual([view.message_type for view in views], [MessageType.ACF, MessageType.AFD, MessageType.ACF])
+            for view, frame in zip(views, frames):
+                self.assertIsInstance(view, StratusRecordView)
+                self.assertEqual(view.to_dict(), StratusConfig.extract_record(frame, view.message_type))
+
+    def test_newline_delimited_invalid_lines(self):
+        path = self.write_file("\n".join([self.acf[0], "corta", self.acf[1]]).encode("latin-1"))
+
+        with StratusFileReader(path) as reader:
+            self.assertEqual(len(list(reader)), 2)
+
+        with StratusFileReader(path, skip_invalid=False) as reader:
+            with self.assertRaises(MessageLengthError):
+                list(reader)
+
+    def test_packed_fixed_length(self):
+        path = self.write_file("".join(self.afd).encode("latin-1"))
+
+        with StratusFileReader(path) as reader:
+            views = list(reader)
+
+            self.assertEqual(len(views), 2)
+            self.assertEqual(views[1]["MotivoConcepto"],
+                             StratusConfig.extract_field(self.afd[1], "MotivoConcepto", MessageType.AFD))
+
+    def test_packed_invalid_size(self):
+        path = self.write_file(b"A" * 1000)
+
+        with StratusFileReader(path) as reader:
+            with self.assertRaises(MessageLengthError):
+                list(reader)
+
+    def test_empty_file(self):
+        path = self.write_file(b"")
+
+        with StratusFileReader(path) as reader:
+            self.assertEqual(list(reader), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,12 @@
 """tests/stratus_utils_message.py"""
 
+import copy
 import jmespath
+import json
+import pickle
 import unittest
 
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
 
 from src.obs_layer_data_process.processors.stratus.utils.message import (
@@ -61,6 +65,24 @@ class TestStratusMessage(unittest.TestCase):
         result = extract_from_scalable_messages_selected_fields(campaign, message)
         self.assertEqual(result["id_campaign"], "campaign1")
         self.assertEqual(result["data"], {"field1": "value1", "field2": "value2"})
+        
+        # La campaña compartida no se modifica
+        self.assertNotIn("data", campaign)
+    
+    def test_extract_from_scalable_messages_selected_fields_plain_dict(self):
+        # Las campañas del índice son de solo lectura; el resultado es un dict independiente
+        campaign = MappingProxyType({"id_campaign": "campaign1", "variables": ["field1"]})
+        result = extract_from_scalable_messages_selected_fields(campaign, {"field1": "value1"})
+        expected = {"id_campaign": "campaign1", "variables": ["field1"], "data": {"field1": "value1"}}
+        
+        self.assertIs(type(result), dict)
+        self.assertEqual(copy.copy(result), expected)
+        self.assertEqual(copy.deepcopy(result), expected)
+        self.assertEqual(pickle.loads(pickle.dumps(result)), expected)
+        self.assertEqual(json.loads(json.dumps(result)), expected)
+        
+        result["data"]["field1"] = "otro"
+        self.assertEqual(dict(campaign), {"id_campaign": "campaign1", "variables": ["field1"]})
     
     def test_extract_from_scalable_messages_selected_fields_no_variables(self):
         # Caso sin variables
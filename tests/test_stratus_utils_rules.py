@@ -0,0 +1,86 @@
+"""tests/test_stratus_utils_rules.py"""
+
+import unittest
+
+from unittest.mock import patch
+
+from src.obs_layer_data_process.processors.stratus.utils.rules import CampaignRuleIndex, parse_rule_pattern
+
+
+def rule(id_rule: str, motivo_concepto, canal, codigo_trx) -> dict:
+    return {
+        "id_rule": id_rule,
+        "config": {"motivo_concepto": motivo_concepto, "canal": canal, "codigo_trx": codigo_trx},
+        "variables": ["MotivoConcepto"]
+    }
+
+
+class TestParseRulePattern(unittest.TestCase):
+
+    def test_patterns(self):
+        self.assertEqual(parse_rule_pattern("01"), ("exact", "01"))
+        self.assertEqual(parse_rule_pattern("*"), ("any",))
+        self.assertEqual(parse_rule_pattern("12*"), ("prefix", "12"))
+        self.assertEqual(parse_rule_pattern("10..19"), ("range", 10, 19))
+
+    def test_invalid_patterns(self):
+        self.assertIsNone(parse_rule_pattern(None))
+        self.assertIsNone(parse_rule_pattern(10))
+        self.assertIsNone(parse_rule_pattern("19..10"))
+        self.assertIsNone(parse_rule_pattern("a..b"))
+        self.assertIsNone(parse_rule_pattern("1..\u00b2"))
+
+
+class TestCampaignRuleIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.s3_config = {"campaign": [
+            {"id_campaign": "exacta", "rules": [rule("r1", "0012", "01", "10")]},
+            {"id_campaign": "cualquier_canal", "rules": [rule("r2", "0012", "*", "10")]},
+            {"id_campaign": "prefijo", "rules": [rule("r3", "00*", "01", "*")]},
+            {"id_campaign": "rango", "rules": [rule("r4", "0012", "01", "05..15"), rule("r5", "0012", "01", "12..20")]}
+        ]}
+        self.index = CampaignRuleIndex(self.s3_config)
+
+    def match_ids(self, *condition):
+        return [campaign["id_rule"] for campaign in self.index.match(*condition)]
+
+    def test_len(self):
+        self.assertEqual(len(self.index), 5)
+
+    def test_match_preserves_config_order(self):
+        self.assertEqual(self.match_ids("0012", "01", "10"), ["r1", "r2", "r3", "r4"])
+
+    def test_match_wildcard(self):
+        self.assertEqual(self.match_ids("0012", "99", "10"), ["r2"])
+
+    def test_match_prefix(self):
+        self.assertEqual(self.match_ids("0099", "01", "77"), ["r3"])
+        self.assertEqual(self.match_ids("0199", "01", "77"), [])
+
+    def test_match_overlapping_ranges(self):
+        self.assertEqual(self.match_ids("0012", "01", "13"), ["r3", "r4", "r5"])
+        self.assertEqual(self.match_ids("0012", "01", "20"), ["r3", "r5"])
+        self.assertEqual(self.match_ids("0012", "01", "21"), ["r3"])
+        self.assertEqual(self.match_ids("0012", "01", "04"), ["r3"])
+
+    def test_match_non_ascii_digits(self):
+        self.assertEqual(self.match_ids("0012", "01", "\u00b2"), ["r3"])
+
+    def test_invalid_rules_are_skipped(self):
+        s3_config = {"campaign": [{"id_campaign": "c1", "rules": [rule("r1", "0012", None, "10")]}]}
+
+        with patch('src.obs_layer_data_process.processors.stratus.utils.rules.logger') as mock_logger:
+            index = CampaignRuleIndex(s3_config)
+            mock_logger.warning.assert_called_once()
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.match("0012", "None", "10"), [])
+
+    def test_invalid_config(self):
+        self.assertEqual(len(CampaignRuleIndex({"test": "config"})), 0)
+        self.assertEqual(len(CampaignRuleIndex([])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
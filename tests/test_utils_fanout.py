@@ -0,0 +1,124 @@
+"""tests/test_utils_fanout.py"""
+
+import json
+import threading
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+from src.obs_layer_data_process.utils.boto3_funcs import build_sqs_payload
+from src.obs_layer_data_process.utils.fanout import SqsFanout, aggregate_results
+
+
+QUEUES = ["https://sqs/q1", "https://sqs/q2", "https://sqs/q3"]
+
+
+def message(message_id):
+    return {"id": message_id, "jsonPayload.dataObject.consumer.appConsumer.sessionId": "g"}
+
+
+def ok(client, payloads, queue_url):
+    return [
+        {'status': 'success', 'queue_url': queue_url, 'message_id': f"{queue_url}-{json.loads(body)['id']}", 'message_group_id': group_id}
+        for body, group_id, _ in payloads
+    ]
+
+
+class TestSqsFanout(unittest.TestCase):
+    
+    def test_aggregate_results(self):
+        results = [{'status': 'success'}, {'status': 'error', 'error': "x"}]
+        
+        self.assertEqual(aggregate_results(results), {'status': 'error', 'sent': 1, 'failed': 1, 'results': results})
+        self.assertEqual(aggregate_results(results[:1])['status'], 'success')
+    
+    def test_send_to_all_queues_in_parallel(self):
+        # Los tres envíos solo terminan si se ejecutan al mismo tiempo
+        barrier = threading.Barrier(len(QUEUES), timeout=5)
+        
+        def send(client, payloads, queue_url):
+            barrier.wait()
+            return ok(client, payloads, queue_url)
+        
+        with SqsFanout(QUEUES, sqs_client=MagicMock(), send=send) as fanout:
+            result = fanout.send(message("m1"))
+        
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['sent'], 3)
+        self.assertEqual([r['queue_url'] for r in result['results']], QUEUES)
+    
+    def test_errors_are_aggregated(self):
+        def send(client, payloads, queue_url):
+            if queue_url == QUEUES[1]:
+                raise RuntimeError("timeout")
+            return ok(client, payloads, queue_url)
+        
+        with SqsFanout(QUEUES, sqs_client=MagicMock(), send=send) as fanout:
+            result = fanout.send(message("m1"))
+        
+        self.assertEqual((result['status'], result['sent'], result['failed']), ('error', 2, 1))
+        self.assertEqual(result['results'][1], {'status': 'error', 'queue_url': QUEUES[1], 'error': "timeout"})
+    
+    def test_per_queue_backpressure(self):
+        release = threading.Event()
+        in_flight = []
+        
+        def send(client, payloads, queue_url):
+            in_flight.append(payloads)
+            release.wait(5)
+            return ok(client, payloads, queue_url)
+        
+        fanout = SqsFanout(QUEUES[:1], sqs_client=MagicMock(), max_in_flight_per_queue=2, max_workers=4, send=send)
+        futures = fanout.submit(message("m1")) + fanout.submit(message("m2"))
+        
+        # El tercer envío a la cola espera a que termine uno de los anteriores
+        blocked = threading.Thread(target=lambda: futures.extend(fanout.submit(message("m3"))))
+        blocked.start()
+        blocked.join(0.2)
+        self.assertTrue(blocked.is_alive())
+        
+        release.set()
+        blocked.join(5)
+        self.assertEqual([future.result()['message_id'] for future in futures],
+                         [f"{QUEUES[0]}-m{i}" for i in range(1, 4)])
+        fanout.close()
+    
+    def test_send_batch(self):
+        client = MagicMock()
+        client.send_message_batch.side_effect = lambda QueueUrl, Entries: {
+            'Successful': [{'Id': entry['Id'], 'MessageId': f"{QueueUrl}-{entry['Id']}"} for entry in Entries],
+            'Failed': []
+        } if QueueUrl != QUEUES[2] else {'Successful': [], 'Failed': [
+            {'Id': entry['Id'], 'SenderFault': True, 'Code': 'InvalidMessageContents'} for entry in Entries
+        ]}
+        messages = [{"jsonPayload.dataObject.consumer.appConsumer.sessionId": f"s{i}"} for i in range(3)]
+        
+        with SqsFanout(QUEUES, sqs_client=client) as fanout:
+            results = fanout.send_batch(messages)
+        
+        self.assertEqual(client.send_message_batch.call_count, 3)
+        self.assertEqual([(r['sent'], r['failed']) for r in results], [(2, 1)] * 3)
+        self.assertEqual(results[1]['results'][0]['message_id'], f"{QUEUES[0]}-1")
+    
+    def test_payload_is_built_once(self):
+        messages = [message(i) for i in range(3)] + [{"sin_sesion": True}]
+        send = MagicMock(side_effect=ok)
+        
+        with patch('src.obs_layer_data_process.utils.fanout.build_sqs_payload', wraps=build_sqs_payload) as build:
+            with SqsFanout(QUEUES, sqs_client=MagicMock(), send=send, deduplication_keys=["id"]) as fanout:
+                result = fanout.send(messages[0])
+                results = fanout.send_batch(messages)
+        
+        # Un mensaje se serializa una vez sin importar el número de colas
+        self.assertEqual(build.call_count, 1 + len(messages))
+        self.assertEqual(result['sent'], 3)
+        
+        # send_batch usa la misma función de envío, con todos los mensajes válidos por cola
+        self.assertEqual(send.call_count, 2 * len(QUEUES))
+        self.assertEqual([len(call.args[1]) for call in send.call_args_list[len(QUEUES):]], [3] * len(QUEUES))
+        self.assertEqual([r['status'] for r in results], ['success'] * 3 + ['error'])
+        self.assertTrue("Error de validacón" in results[3]['results'][0]['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
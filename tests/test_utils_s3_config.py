@@ -0,0 +1,141 @@
+"""tests/test_utils_s3_config.py"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
+
+from src.obs_layer_data_process.utils import s3_config
+from src.obs_layer_data_process.utils.s3_config import S3ConfigLoader, from_s3_get_file_cached
+
+
+NOT_MODIFIED = ClientError({'Error': {'Code': '304', 'Message': 'Not Modified'},
+                            'ResponseMetadata': {'HTTPStatusCode': 304}}, 'GetObject')
+
+
+def s3_response(params, etag='"v1"'):
+    body = MagicMock()
+    body.read.return_value = json.dumps(params).encode('utf-8')
+    return {'Body': body, 'ETag': etag}
+
+
+class FakeClock:
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestS3ConfigLoader(unittest.TestCase):
+    
+    def setUp(self):
+        self.client = MagicMock()
+        self.clock = FakeClock()
+    
+    def test_cache_within_ttl(self):
+        self.client.get_object.return_value = s3_response({"test": "data"})
+        loader = S3ConfigLoader("bucket", "object", ttl=60, cache_dir=None, s3_client=self.client, clock=self.clock)
+        
+        self.assertEqual(loader.load(), {"test": "data"})
+        self.clock.now += 59
+        self.assertEqual(loader.load(), {"test": "data"})
+        
+        self.client.get_object.assert_called_once_with(Bucket="bucket", Key="object")
+    
+    def test_conditional_get_after_ttl(self):
+        self.client.get_object.side_effect = [s3_response({"v": 1}), NOT_MODIFIED, s3_response({"v": 2}, '"v2"')]
+        loader = S3ConfigLoader("bucket", "object", ttl=60, cache_dir=None, s3_client=self.client, clock=self.clock)
+        
+        first = loader.load()
+        
+        # Sin cambios en S3 se reutiliza la parametrización decodificada
+        self.clock.now += 61
+        self.assertIs(loader.load(), first)
+        self.client.get_object.assert_called_with(Bucket="bucket", Key="object", IfNoneMatch='"v1"')
+        
+        # La revalidación reinicia el TTL
+        self.clock.now += 30
+        loader.load()
+        self.assertEqual(self.client.get_object.call_count, 2)
+        
+        self.assertEqual(loader.load(force=True), {"v": 2})
+    
+    def test_errors(self):
+        error = ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'No existe'}}, 'GetObject')
+        self.client.get_object.side_effect = error
+        loader = S3ConfigLoader("bucket", "object", cache_dir=None, s3_client=self.client, clock=self.clock)
+        
+        with self.assertRaises(ClientError):
+            loader.load()
+        
+        body = MagicMock()
+        body.read.return_value = b"{invalid json}"
+        self.client.get_object.side_effect = None
+        self.client.get_object.return_value = {'Body': body}
+        
+        with self.assertRaises(ValueError):
+            loader.load()
+    
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.client.get_object.return_value = s3_response({"v": 1})
+            S3ConfigLoader("bucket", "object", ttl=60, cache_dir=cache_dir, s3_client=self.client).load()
+            
+            # Otro proceso (nuevo cargador) usa la caché en disco vigente sin consultar S3
+            loader = S3ConfigLoader("bucket", "object", ttl=60, cache_dir=cache_dir, s3_client=self.client)
+            self.assertEqual(loader.load(), {"v": 1})
+            self.assertEqual(self.client.get_object.call_count, 1)
+            
+            # Con la caché en disco vencida se revalida con su ETag
+            os.utime(loader.cache_path, (0, 0))
+            self.client.get_object.side_effect = NOT_MODIFIED
+            loader = S3ConfigLoader("bucket", "object", ttl=60, cache_dir=cache_dir, s3_client=self.client)
+            self.assertEqual(loader.load(), {"v": 1})
+            self.client.get_object.assert_called_with(Bucket="bucket", Key="object", IfNoneMatch='"v1"')
+            self.assertGreater(os.path.getmtime(loader.cache_path), 0)
+    
+    def test_disk_cache_not_object(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            loader = S3ConfigLoader("bucket", "object", ttl=60, cache_dir=cache_dir, s3_client=self.client)
+            with open(loader.cache_path, 'w', encoding='utf-8') as file:
+                json.dump([1, 2], file)
+            
+            # Un JSON válido que no es un objeto se ignora y se descarga de S3
+            self.client.get_object.return_value = s3_response({"v": 1})
+            self.assertEqual(loader.load(), {"v": 1})
+            self.client.get_object.assert_called_once_with(Bucket="bucket", Key="object")
+    
+    def test_disk_cache_write_error_removes_temp_file(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.client.get_object.return_value = s3_response({"v": 1})
+            loader = S3ConfigLoader("bucket", "object", ttl=60, cache_dir=cache_dir, s3_client=self.client)
+            
+            with patch.object(s3_config.os, 'replace', side_effect=OSError("disco lleno")):
+                self.assertEqual(loader.load(), {"v": 1})
+            
+            self.assertEqual(os.listdir(cache_dir), [])
+    
+    def test_from_s3_get_file_cached(self):
+        self.client.get_object.return_value = s3_response({"test": "data"})
+        
+        with patch.object(s3_config, '_loaders', {}), patch.object(s3_config, 'get_s3_client', return_value=self.client):
+            self.assertEqual(from_s3_get_file_cached("bucket", "object"), {"test": "data"})
+            self.assertEqual(from_s3_get_file_cached("bucket", "object"), {"test": "data"})
+        
+        self.client.get_object.assert_called_once_with(Bucket="bucket", Key="object")
+    
+    @patch('boto3.client')
+    def test_module_client_is_reused(self, mock_client):
+        with patch.object(s3_config, '_s3_client', None):
+            self.assertIs(s3_config.get_s3_client(), s3_config.get_s3_client())
+        
+        mock_client.assert_called_once_with('s3')
+
+
+if __name__ == '__main__':
+    unittest.main()
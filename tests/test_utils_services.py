@@ -0,0 +1,48 @@
+"""tests/test_utils_services.py"""
+
+import jmespath
+import unittest
+
+from src.obs_layer_data_process.utils.services import build_service_index
+
+
+class TestBuildServiceIndex(unittest.TestCase):
+    
+    def setUp(self):
+        self.s3_config = [
+            {"id": "app_1", "services": [
+                {"id_service": "s1", "paths": [["a", "true"]]},
+                {"id_service": "s2"},
+                {"id_service": "s1", "paths": [["b", "true"]]}
+            ]},
+            {"id": "app_2", "services": [{"id_service": "s1", "paths": [["c", "false"]]}]},
+            {"id": "app_1", "services": [{"id_service": "s3", "paths": [["d", "true"]]}, {"paths": [["e", "true"]]}]},
+            {"services": []}
+        ]
+    
+    def test_index_matches_jmespath_queries(self):
+        index = build_service_index(self.s3_config)
+        
+        for app_consumer_id in ("app_1", "app_2"):
+            services = jmespath.search(f"[?id=='{app_consumer_id}'].services[].id_service", self.s3_config)
+            self.assertEqual(set(index[app_consumer_id]), set(services))
+            
+            for id_service in services:
+                paths = jmespath.search(f"[?id=='{app_consumer_id}'][].services[?id_service=='{id_service}'][].paths[]", self.s3_config)
+                self.assertEqual(index[app_consumer_id][id_service], paths or [])
+    
+    def test_duplicates_are_merged(self):
+        index = build_service_index(self.s3_config)
+        
+        self.assertEqual(index["app_1"]["s1"], [["a", "true"], ["b", "true"]])
+        self.assertEqual(set(index["app_1"]), {"s1", "s2", "s3"})
+        self.assertEqual(index["app_1"]["s2"], [])
+    
+    def test_invalid_config(self):
+        self.assertEqual(build_service_index({"test": "config"}), {})
+        self.assertEqual(build_service_index(None), {})
+        self.assertEqual(build_service_index(["invalid"]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""tests/test_utils_validation.py"""
+
+import json
+import unittest
+
+from pydantic import BaseModel, ValidationError
+from typing import Optional
+from unittest.mock import patch
+
+from src.obs_layer_data_process.utils.validation import ValidationMode, decode_json, validate_json, load_event
+
+
+class Minimal(BaseModel):
+    id: str
+
+class Event(BaseModel):
+    id: str
+    total: int
+    detalle: Optional[str] = None
+
+
+class TestValidation(unittest.TestCase):
+    
+    def test_decode_json(self):
+        message = '{"id": "1", "valores": [1, 2.5, null], "texto": "ñ"}'
+        
+        self.assertEqual(decode_json(message), json.loads(message))
+        self.assertEqual(decode_json(message.encode("utf-8")), json.loads(message))
+        
+        # Valores que solo acepta json.loads
+        self.assertEqual(decode_json('[Infinity]'), [float("inf")])
+        
+        # Los enteros fuera de 64 bits se conservan como int
+        for number in (2 ** 64 + 1, -2 ** 63 - 1, 10 ** 30):
+            message = '{"n": %d, "m": 1}' % number
+            self.assertEqual(decode_json(message), {"n": number, "m": 1})
+            self.assertIs(type(decode_json(message.encode("utf-8"))["n"]), int)
+        
+        with self.assertRaises(json.JSONDecodeError):
+            decode_json('{invalid json}')
+    
+    def test_decode_json_without_orjson(self):
+        with patch('src.obs_layer_data_process.utils.validation.orjson', None):
+            self.assertEqual(decode_json('{"id": "1"}'), {"id": "1"})
+            self.assertEqual(decode_json('{"n": 123456789012345678901234567890}'), {"n": 123456789012345678901234567890})
+            
+            with self.assertRaises(json.JSONDecodeError):
+                decode_json('{invalid json}')
+    
+    def test_validate_json(self):
+        message = '{"id": "1", "total": "10", "extra": true}'
+        
+        self.assertEqual(validate_json(Event, message), Event(**json.loads(message)))
+        
+        with self.assertRaises(json.JSONDecodeError):
+            validate_json(Event, '{invalid json}')
+        
+        with self.assertRaises(ValidationError):
+            validate_json(Event, '{"id": "1"}')
+    
+    def test_load_event(self):
+        message = '{"id": "1", "total": "10", "extra": true}'
+        
+        self.assertEqual(load_event(message, Event, Minimal, ValidationMode.FULL),
+                         {"id": "1", "total": 10, "detalle": None})
+        self.assertEqual(load_event(message, Event, Minimal, ValidationMode.MINIMAL),
+                         {"id": "1", "total": "10", "extra": True})
+        self.assertEqual(load_event('{"otro": 1}', Event, Minimal, ValidationMode.NONE), {"otro": 1})
+        
+        with self.assertRaises(ValidationError):
+            load_event('{"otro": 1}', Event, Minimal, ValidationMode.MINIMAL)
+
+
+if __name__ == '__main__':
+    unittest.main()
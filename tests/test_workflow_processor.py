@@ -4,6 +4,7 @@ import json
 import jmespath
 import unittest
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 from pydantic import ValidationError
 
@@ -12,6 +13,26 @@ from src.obs_layer_data_process.processors.workflow.utils.exceptions import (
     NoMinimumDataError, NoTransactionDataFound, InvalidEventDataError,
     AppConsumerNotFoundError, ServiceNotFoundError, NoVariablesConfiguredError
 )
+from src.obs_layer_data_process.utils.validation import ValidationMode
+
+
+def build_message(transaction_data: dict) -> str:
+    return json.dumps({
+        "logName": "log", "resource": {"type": "global", "labels": {"project_id": "p"}},
+        "jsonPayload": {
+            "msm": "msm",
+            "dataObject": {
+                "client": {"documentClient": {"number": "123", "type": "CC"}, "userId": "u"},
+                "messages": {"idService": "Observabilidad", "transaction": {
+                    "transactionName": "entity_1", "transactionData": transaction_data
+                }},
+                "moduleId": "m",
+                "operation": {"operationDate": "2024-01-01", "statusResponse": {"status": "OK"}, "type": "t"},
+                "consumer": {"ip": "0.0.0.0", "appConsumer": {"id": "app_id_1", "sessionId": "session_1", "channelId": "1"}}
+            }
+        },
+        "receiveTimestamp": "t", "insertId": "i", "timestamp": "t"
+    })
 
 
 class TestWorkflowProcessor(unittest.TestCase):
@@ -83,11 +104,9 @@ class TestWorkflowProcessor(unittest.TestCase):
             with self.assertRaises(NoTransactionDataFound):
                 self.processor._extract_transaction_data({"test": "data"})
     
-    @patch('json.loads')
-    @patch('src.obs_layer_data_process.processors.workflow.utils.models.WorkflowEntry.model_validate')
-    def test_process_success(self, mock_validate, mock_loads):
+    @patch('src.obs_layer_data_process.processors.workflow.utils.models.WorkflowEntry.model_validate_json')
+    def test_process_success(self, mock_validate):
         # Configurar mocks
-        mock_loads.return_value = {"test": "data"}
         mock_validate.return_value.model_dump.return_value = {"test": "data"}
         
         # Mock métodos internos
@@ -104,10 +123,8 @@ class TestWorkflowProcessor(unittest.TestCase):
     
     def test_process_validation_error(self):
         # Mock para ValidationError
-        with patch('json.loads') as mock_loads, \
-             patch('src.obs_layer_data_process.processors.workflow.utils.models.WorkflowEntry.model_validate') as mock_validate:
+        with patch('src.obs_layer_data_process.processors.workflow.utils.models.WorkflowEntry.model_validate_json') as mock_validate:
             
-            mock_loads.return_value = {"test": "data"}
             mock_validate.side_effect = ValidationError.from_exception_data("error", [])
             
             # Verificar excepción
@@ -119,19 +136,77 @@ class TestWorkflowProcessor(unittest.TestCase):
         with self.assertRaises(json.JSONDecodeError):
             self.processor.process('{invalid json}')
     
-    @patch('src.obs_layer_data_process.processors.workflow.utils.jmespath.extract_from_message_selected_fields')
-    @patch('jmespath.search')
-    def test_extract_success(self, mock_search, mock_extract):
-        # Configurar mocks
-        def mock_search_side_effect(query, data):
-            if 'services[].id_service' in query:
-                return ["service_1"]
-            elif 'paths[]' in query:
-                return [["path1", "true"]]
-            return None
+    def test_validation_modes(self):
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "Observabilidad", "paths": [
+            ["cliente.nombre", "true"], ["monto", "true"]
+        ]}]}]
+        message = build_message({"cliente": {"nombre": "Ana"}, "monto": 10})
         
-        mock_search.side_effect = mock_search_side_effect
-        mock_extract.return_value = [("path1", "value1")]
+        full_processor = WorkflowProcessor(s3_config)
+        full_processor.process(message)
+        
+        for validation_mode in (ValidationMode.MINIMAL, ValidationMode.NONE):
+            processor = WorkflowProcessor(s3_config, validation_mode=validation_mode)
+            processor.process(message)
+            self.assertEqual(processor.extract(), full_processor.extract())
+        
+        # La validación mínima solo exige los campos que usa el procesador
+        event = json.loads(message)
+        del event["logName"], event["jsonPayload"]["dataObject"]["operation"]
+        WorkflowProcessor(s3_config, validation_mode=ValidationMode.MINIMAL).process(json.dumps(event))
+        
+        event["jsonPayload"]["dataObject"]["messages"]["idService"] = "Otro"
+        with self.assertRaises(ValidationError):
+            WorkflowProcessor(s3_config, validation_mode=ValidationMode.MINIMAL).process(json.dumps(event))
+        
+        # Sin validación el evento decodificado se usa tal cual
+        processor = WorkflowProcessor(s3_config, validation_mode=ValidationMode.NONE)
+        self.assertIs(processor.process(json.dumps(event)), processor._event_data)
+    
+    def test_process_and_extract(self):
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "Observabilidad", "paths": [["monto", "true"]]}]}]
+        processor = WorkflowProcessor(s3_config)
+        messages = [build_message({"monto": i}) for i in range(1, 21)]
+        
+        result = processor.process_and_extract(messages[0])
+        
+        # Equivale a process + extract, sin guardar estado en el procesador
+        self.assertEqual(result.data, {"monto": 1})
+        self.assertEqual(result.context.event_data, WorkflowProcessor(s3_config).process(messages[0]))
+        self.assertEqual(result.context.fields["entity"], "entity_1")
+        self.assertEqual(result.context.fields["tidnid"], "CC-123")
+        self.assertEqual(result.context.fields["transaction_data"], {"monto": 1})
+        self.assertIsNone(processor._event_data)
+        self.assertIsNone(processor._transaction_data)
+        
+        # Una misma instancia se comparte entre hilos
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(processor.process_and_extract, messages))
+        self.assertEqual([r.data["monto"] for r in results], list(range(1, 21)))
+    
+    def test_process_batch(self):
+        s3_config = [{"id": "app_id_1", "services": [{"id_service": "Observabilidad", "paths": [["monto", "true"]]}]}]
+        processor = WorkflowProcessor(s3_config)
+        messages = [build_message({"monto": i}) for i in range(1, 6)]
+        messages[2] = messages[2].replace('"app_id_1"', '"app_id_2"')
+        messages.insert(1, '{invalid json}')
+        
+        with patch.object(processor, '_services', wraps=processor._services) as mock_services:
+            results = processor.process_batch(messages)
+        
+        # Los paths se resuelven una vez por (app_consumer_id, id_service); el grupo sin
+        # parametrización se vuelve a consultar para construir el error del mensaje
+        self.assertEqual(mock_services.get.call_count, 3)
+        self.assertEqual([item.index for item in results], list(range(6)))
+        self.assertIsInstance(results[1].error, json.JSONDecodeError)
+        self.assertIsInstance(results[3].error, AppConsumerNotFoundError)
+        self.assertEqual([results[i].result.data["monto"] for i in (0, 2, 4, 5)], [1, 2, 4, 5])
+        self.assertEqual(results[0].result, processor.process_and_extract(messages[0]))
+        self.assertIsNone(processor._transaction_data)
+    
+    def test_extract_success(self):
+        self.s3_config[0]["services"][0]["paths"] = [["path1", "true"]]
+        self.processor = WorkflowProcessor(self.s3_config)
         
         # Establecer datos
         self.processor._transaction_data = {"field1": "value1"}
@@ -164,14 +239,11 @@ class TestWorkflowProcessor(unittest.TestCase):
         with self.assertRaises(AppConsumerNotFoundError):
             self.processor.extract()
     
-    @patch('jmespath.search')
-    def test_extract_service_not_found(self, mock_search):
+    def test_extract_service_not_found(self):
         # Service no encontrado
-        mock_search.return_value = ["other_service"]
-        
         self.processor._transaction_data = {"field1": "value1"}
         self.processor._app_consumer_id = "app_id_1"
-        self.processor._id_service = "service_1"
+        self.processor._id_service = "other_service"
         self.processor._list_app_consumers = ["app_id_1"]
         
         # Verificar excepción
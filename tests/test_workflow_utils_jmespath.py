@@ -5,7 +5,9 @@ import unittest
 
 from unittest.mock import patch, MagicMock
 
-from src.obs_layer_data_process.processors.workflow.utils.jmespath import extract_from_message_selected_fields
+from src.obs_layer_data_process.processors.workflow.utils.jmespath import (
+    extract_from_message_selected_fields, compile_paths, extract_from_compiled_fields
+)
 
 
 class TestWorkflowJmespath(unittest.TestCase):
@@ -58,3 +60,18 @@ class TestWorkflowJmespath(unittest.TestCase):
         
         with self.assertRaises(RuntimeError):
             list(extract_from_message_selected_fields([["path1", "true"]], {"test": "data"}))
+    
+    def test_extract_from_compiled_fields(self):
+        paths = [["a.b", "true"], ["a.c", "true"], ["length(a.b)", "false"]]
+        event = {"a": {"b": "valor", "c": ""}}
+        
+        self.assertEqual(list(extract_from_compiled_fields(compile_paths(paths), event)),
+                         list(extract_from_message_selected_fields(paths, event)))
+    
+    def test_extract_from_compiled_fields_errors(self):
+        # El query inválido se reporta al extraer, igual que sin compilar
+        with self.assertRaises(ValueError):
+            list(extract_from_compiled_fields(compile_paths([["a..b", "true"]]), {"a": {}}))
+        
+        with self.assertRaises(TypeError):
+            list(extract_from_compiled_fields(compile_paths([["length(a)", "true"]]), {"a": 1}))
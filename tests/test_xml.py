@@ -1,12 +1,14 @@
 """tests/test_xml.py"""
 
+import threading
 import unittest
 
 from lxml import etree
 from unittest.mock import patch, MagicMock
 
 from src.obs_layer_data_process.utils.xml import (
-    is_valid_xml, get_local_name, lxml_element_to_dict, xml_to_dict_lxml
+    is_valid_xml, get_local_name, lxml_element_to_dict, xml_to_dict_lxml, xml_to_dict_iterparse,
+    get_xml_parser, get_interned_local_name, XmlElementView, xml_to_lazy_dict, materialize
 )
 
 
@@ -64,6 +66,72 @@ class TestXmlUtils(unittest.TestCase):
         result = lxml_element_to_dict(parent)
         self.assertEqual(result, {"child": ["value1", "value2"]})
     
+    def test_lxml_element_to_dict_nested(self):
+        xml = (
+            '<a:root xmlns:a="urn:a" id="1">texto<a:item id="2"><b:code>01</b:code></a:item>'
+            '<item>02</item><!-- nota --><id>3</id><a:item><code>03</code>cola</a:item></a:root>'
+        )
+        result = lxml_element_to_dict(etree.fromstring(xml.encode(), get_xml_parser()))
+        
+        self.assertEqual(result, {
+            "id": ["1", "3"],
+            "#text": "texto",
+            "item": [{"id": "2", "code": "01"}, "02", {"code": "03"}],
+            get_local_name(etree.Comment): "nota"
+        })
+    
+    def test_lxml_element_to_dict_deep_nesting(self):
+        # Más niveles que el límite de recursión de Python
+        depth = 5000
+        root = element = etree.Element("n")
+        for _ in range(depth - 1):
+            element = etree.SubElement(element, "n")
+        element.text = "hoja"
+        
+        result = lxml_element_to_dict(root)
+        
+        for _ in range(depth - 2):
+            result = result["n"]
+        self.assertEqual(result, {"n": "hoja"})
+    
+    def test_get_interned_local_name(self):
+        name = get_interned_local_name("{urn:test}Interned")
+        
+        self.assertEqual(name, "Interned")
+        self.assertIs(get_interned_local_name("{urn:test}Interned"), name)
+        self.assertEqual(get_interned_local_name("p:Interned"), "Interned")
+    
+    def test_xml_to_lazy_dict(self):
+        xml = (
+            '<s:Envelope xmlns:s="urn:s"><s:Body id="b1">texto<Item n="1">a</Item><Item><Sub>b</Sub></Item>'
+            '<id>2</id><Empty/><!-- nota --></s:Body></s:Envelope>'
+        )
+        expected = xml_to_dict_lxml(xml, "response_service")
+        result = xml_to_lazy_dict(xml, "response_service")
+        
+        body = result["Envelope"]["Body"]
+        self.assertIsInstance(body, XmlElementView)
+        self.assertEqual(list(body), list(expected["Envelope"]["Body"]))
+        self.assertEqual(body["id"], ["b1", "2"])
+        self.assertEqual(body["Item"][0], "a")
+        self.assertIsInstance(body["Item"][1], XmlElementView)
+        self.assertEqual(body["Empty"], {})
+        self.assertNotIn("Missing", body)
+        self.assertIsNone(body.get("Missing"))
+        self.assertEqual(result, expected)
+        self.assertEqual(materialize(result), expected)
+        self.assertIs(type(materialize(result)["Envelope"]), dict)
+        
+        self.assertIsNone(xml_to_lazy_dict("no es xml", "request_service"))
+    
+    def test_xml_element_view_is_lazy(self):
+        view = xml_to_lazy_dict('<r><a><b>1</b></a><c><d>2</d></c></r>', "request_service")["r"]
+        
+        self.assertEqual(view["a"]["b"], "1")
+        # Solo se convierten los hijos consultados
+        self.assertEqual(list(view._values), ["a"])
+        self.assertIs(view["a"], view["a"])
+    
     @patch('src.obs_layer_data_process.utils.xml.is_valid_xml')
     @patch('src.obs_layer_data_process.utils.xml.etree')
     def test_xml_to_dict_lxml(self, mock_etree, mock_is_valid):
@@ -90,3 +158,47 @@ class TestXmlUtils(unittest.TestCase):
             mock_etree.fromstring.side_effect = Exception("error")
             with self.assertRaises(Exception):
                 xml_to_dict_lxml("<root></root>", "request")
+    
+    def test_xml_to_dict_iterparse(self):
+        xml_string = (
+            '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+            '<ns:Resp xmlns:ns="http://example.com/" ns:codigo="00"> texto <ns:item>1</ns:item>'
+            '<!-- comentario --><ns:item id="2"/><p:item>3</p:item><codigo>x</codigo></ns:Resp>'
+            '<vacio/></soap:Body></soap:Envelope>'
+        )
+        
+        # Mismo resultado que la conversión completa
+        self.assertEqual(xml_to_dict_iterparse(xml_string, "response"), xml_to_dict_lxml(xml_string, "response"))
+        
+        # XML mal formado: se usa la recuperación de xml_to_dict_lxml
+        self.assertEqual(xml_to_dict_iterparse("<a><b>x</b><c>", "response"), xml_to_dict_lxml("<a><b>x</b><c>", "response"))
+        
+        # XML inválido
+        self.assertIsNone(xml_to_dict_iterparse("invalid", "response"))
+    
+    def test_get_xml_parser(self):
+        parser = get_xml_parser()
+        
+        # Misma instancia en el mismo hilo, distinta por opciones y por hilo
+        self.assertIs(get_xml_parser(), parser)
+        self.assertIs(get_xml_parser(recover=True, resolve_entities=False, ns_clean=True), parser)
+        self.assertIsNot(get_xml_parser(recover=False), parser)
+        
+        parsers = []
+        thread = threading.Thread(target=lambda: parsers.append(get_xml_parser()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(parsers[0], parser)
+    
+    def test_xml_bytes_input(self):
+        xml_string = '  <soap:Envelope><soap:Body><dato id="1">ñandú</dato></soap:Body></soap:Envelope>\n'
+        expected = xml_to_dict_lxml(xml_string, "response")
+        data = xml_string.encode("utf-8")
+        
+        for xml_input in (data, bytearray(data), memoryview(data)):
+            self.assertTrue(is_valid_xml(xml_input, "response"))
+            self.assertEqual(xml_to_dict_lxml(xml_input, "response"), expected)
+            self.assertEqual(xml_to_dict_iterparse(xml_input, "response"), expected)
+        
+        self.assertFalse(is_valid_xml(b"  invalid ", "response"))
+        self.assertFalse(is_valid_xml(memoryview(b"   "), "response"))